@@ -0,0 +1,94 @@
+"""
+Single-writer commit queue.
+
+SQLite allows one writer at a time. When every request opens its own write
+transaction, concurrent requests queue on the database lock (or give up with
+"database is locked") and each pays for its own commit. A CommitQueue instead
+hands writes to one thread, which applies whatever has arrived in a single
+transaction: a group closes after settings.COMMIT_QUEUE_MAX_BATCH items or
+COMMIT_QUEUE_MAX_WAIT seconds, whichever comes first.
+
+    queue = CommitQueue(save_games)   # save_games(items) -> one result per item
+    game = queue.submit(item)         # blocks until the group is committed
+
+If the grouped call raises, the items are retried one transaction each, so a
+bad item only fails its own caller; handlers must therefore not mutate
+items. Callers already inside a transaction, or any caller with
+settings.COMMIT_QUEUE = False, write inline instead.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import connection, transaction
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT = 0.002  # seconds a group stays open for more items
+
+
+class CommitQueue:
+    def __init__(self, handler, name="commit-queue"):
+        self.handler = handler
+        self.name = name
+        self._items = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.committed = 0
+
+    def submit(self, item):
+        """Write one item and return the handler's result for it"""
+        if not getattr(settings, "COMMIT_QUEUE", True) or connection.in_atomic_block:
+            # queueing would commit outside the caller's transaction (or wait on its lock)
+            with transaction.atomic():
+                return self.handler([item])[0]
+        self._start()
+        future = Future()
+        self._items.put((item, future))
+        return future.result()
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        """Block for the first item, then take more until the group is full or its time is up"""
+        group = [self._items.get()]
+        max_batch = getattr(settings, "COMMIT_QUEUE_MAX_BATCH", DEFAULT_MAX_BATCH)
+        deadline = time.monotonic() + getattr(settings, "COMMIT_QUEUE_MAX_WAIT", DEFAULT_MAX_WAIT)
+        while len(group) < max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                group.append(self._items.get(timeout=timeout) if timeout > 0 else self._items.get_nowait())
+            except queue.Empty:
+                break
+        return group
+
+    def _run(self):
+        # the writer keeps one connection open; it is only replaced after a failed group
+        while True:
+            if not self._write(self._collect()):
+                connection.close()
+
+    def _write(self, group):
+        """Commit a group and resolve its futures; returns False if anything failed"""
+        items = [item for item, _ in group]
+        try:
+            with transaction.atomic():
+                results = self.handler(items)
+        except Exception as exc:
+            if len(group) == 1:
+                group[0][1].set_exception(exc)
+                return False
+            return all([self._write([single]) for single in group])
+        self.batches += 1
+        self.committed += len(group)
+        for (_, future), result in zip(group, results):
+            future.set_result(result)
+        return True
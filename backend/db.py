@@ -0,0 +1,69 @@
+"""
+Database helpers shared by the apps.
+"""
+from django.db import connection, transaction
+
+
+def update_rows(model, fields, rows, bump=()):
+    """
+    UPDATE many rows of `model` with one executemany().
+
+    fields are concrete column names (use "winner_id" for foreign keys) and
+    each row is a tuple of those values followed by the primary key.
+    Columns in `bump` (version counters) are incremented by one in the same
+    statement.
+    QuerySet.bulk_update() builds a CASE expression per row, which costs far
+    more than the write itself once there are thousands of rows.
+    """
+    qn = connection.ops.quote_name
+    sql = "UPDATE {} SET {} WHERE {} = %s".format(
+        qn(model._meta.db_table),
+        ", ".join(
+            [f"{qn(field)} = %s" for field in fields] + [f"{qn(col)} = {qn(col)} + 1" for col in bump]
+        ),
+        qn(model._meta.pk.column),
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, list(rows))
+
+
+def insert_rows(model, columns, rows):
+    """
+    INSERT many plain rows with one executemany().
+    For append-only tables with simple column types, where bulk_create()'s
+    per-field value preparation costs several times the insert itself.
+    """
+    qn = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        qn(model._meta.db_table),
+        ", ".join(qn(col) for col in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, list(rows))
+
+
+def increment_rows(model, key_columns, columns, rows):
+    """
+    Add to counters in place (SET col = col + %s) for many rows with one
+    executemany(), so concurrent writers never lose each other's increments.
+    Each row is a tuple of increments for `columns` followed by the values of
+    `key_columns` identifying the row.
+    """
+    qn = connection.ops.quote_name
+    sql = "UPDATE {} SET {} WHERE {}".format(
+        qn(model._meta.db_table),
+        ", ".join(f"{qn(col)} = {qn(col)} + %s" for col in columns),
+        " AND ".join(f"{qn(col)} = %s" for col in key_columns),
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, list(rows))
+
+
+def delete_rows(queryset):
+    """
+    DELETE the rows matching `queryset` in one statement and return the count.
+    Skips Django's deletion collector, which loads every cascaded row into
+    Python, along with delete signals; callers delete dependent rows first.
+    """
+    return queryset._raw_delete(queryset.db)
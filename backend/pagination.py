@@ -0,0 +1,11 @@
+"""
+Page-number pagination shared by the apps' list endpoints.
+"""
+from rest_framework.pagination import PageNumberPagination
+
+
+class PageSizePagination(PageNumberPagination):
+    """?page=N, with the page size up to the client (?page_size=)"""
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
@@ -40,10 +40,12 @@ INSTALLED_APPS = [
     'rest_framework',
     'players',
     'league',
+    'jobs',
 ]
 
 
 MIDDLEWARE = [
+    'backend.timing.ServerTimingMiddleware',  # inactive unless SERVER_TIMING
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,6 +83,21 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # WAL lets readers run alongside the writer; NORMAL syncs at checkpoints
+            # instead of every commit (still crash-safe in WAL mode)
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA cache_size=-65536;'  # KiB
+                'PRAGMA mmap_size=268435456;'
+            ),
+            # take the write lock at BEGIN, so a busy database waits for `timeout`
+            # instead of failing a read transaction that later tries to write
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -127,3 +144,31 @@ STATIC_URL = '/static/'
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Background jobs (jobs app)
+# Worker threads started in each web process on the first enqueue. Set to 0
+# and run `manage.py run_jobs --workers N` for separate worker processes.
+JOBS_LOCAL_WORKERS = 1
+JOBS_POLL_INTERVAL = 1.0  # seconds an idle worker waits before polling again
+
+
+# Per-request Server-Timing header (db, sim, ser, render, total); see backend.timing
+SERVER_TIMING = False
+SERVER_TIMING_LOG = False  # also log one JSON line per request to "backend.timing"
+
+
+# Ad-hoc simulated games are written by one thread per process, in groups of up
+# to COMMIT_QUEUE_MAX_BATCH collected for at most COMMIT_QUEUE_MAX_WAIT seconds;
+# see backend.commitqueue
+COMMIT_QUEUE = True
+COMMIT_QUEUE_MAX_BATCH = 64
+COMMIT_QUEUE_MAX_WAIT = 0.002
+
+
+# Seeded single-game results kept per process for repeat requests; see league.simcache
+SIMULATION_CACHE_SIZE = 512
+
+# Memory-mapped league rosters read by the simulation code; see league.snapshot.
+# Defaults to <system temp dir>/league-snapshots when unset.
+LEAGUE_SNAPSHOT_DIR = None
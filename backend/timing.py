@@ -0,0 +1,132 @@
+"""
+Per-request timing breakdown, exposed as a Server-Timing header and
+optionally as one structured log line per request.
+
+    db      SQL time and query count (connection.execute_wrapper)
+    sim     simulation math, wherever the code is wrapped in timed("sim")
+    ser     serializer .data (top-level serializers only)
+    render  DRF response rendering
+    total   the whole request
+
+Enable with settings.SERVER_TIMING (and SERVER_TIMING_LOG for the log line).
+When disabled the middleware removes itself at startup and timed() returns
+a shared no-op context manager, so the only cost left is one ContextVar
+lookup per hook.
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("backend.timing")
+
+_current = ContextVar("request_timings", default=None)
+_NOOP = nullcontext()
+
+METRICS = ("db", "sim", "ser", "render")
+
+
+class RequestTimings:
+    """Accumulated seconds per metric for one request"""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(METRICS, 0.0)
+        self.queries = 0
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add("db", time.perf_counter() - started)
+
+    def header(self, total):
+        parts = [
+            f'{name};dur={self.seconds[name] * 1000:.2f}' + (f';desc="{self.queries} queries"' if name == "db" else "")
+            for name in METRICS
+        ]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+    def as_dict(self):
+        return {
+            **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in self.seconds.items()},
+            "queries": self.queries,
+        }
+
+
+class _Timer:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+def timed(name):
+    """Context manager adding the enclosed time to metric `name` of the current request"""
+    timings = _current.get()
+    if timings is None:
+        return _NOOP
+    return _Timer(timings, name)
+
+
+class ServerTimingMiddleware:
+    """Put it first in MIDDLEWARE so `total` covers the whole stack"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SERVER_TIMING", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.log = getattr(settings, "SERVER_TIMING_LOG", False)
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        response["Server-Timing"] = timings.header(total)
+        if self.log:
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(total * 1000, 2),
+                **timings.as_dict(),
+            }))
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns
+        timings = _current.get()
+        started = time.perf_counter()
+
+        def rendered(response):
+            timings.add("render", time.perf_counter() - started)
+
+        response.add_post_render_callback(rendered)
+        return response
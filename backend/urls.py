@@ -19,5 +19,6 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
      path("players/", include("players.urls")), 
-     path('league/', include('league.urls'))
+     path('league/', include('league.urls')),
+     path('jobs/', include('jobs.urls')),
 ]
@@ -0,0 +1,361 @@
+"""
+Benchmark cases.
+
+Each case times run(state) for a fixed amount of work (`items` units) and is
+reported as seconds per run and items per second. setup() runs before every
+repetition, untimed; shared fixtures are built once per process.
+Sizes are fixed so results stay comparable with the stored baseline.
+"""
+import atexit
+import os
+import random
+from collections import namedtuple
+from functools import lru_cache
+from types import SimpleNamespace
+
+from django.db.models import Prefetch
+from django.test import Client
+
+Case = namedtuple("Case", "name items unit setup run")
+
+CASES = []
+
+
+def case(name, items, unit, setup=None):
+    def decorator(fn):
+        CASES.append(Case(name, items, unit, setup or (lambda: None), fn))
+        return fn
+    return decorator
+
+
+# -----------------------------
+# Fixtures (built once)
+# -----------------------------
+
+ROSTER_SIZE = 15
+LEAGUE_TEAMS = 64
+
+
+@lru_cache(maxsize=None)
+def league_fixture():
+    from league.models import League
+    from league.season import create_schedule
+    from league.services import populate_league
+
+    league = League.objects.create(name="Benchmark League")
+    populate_league(league, num_teams=LEAGUE_TEAMS, roster_size=ROSTER_SIZE, conferences=4, rng=1)
+    create_schedule(league, non_conference_games=4, rng=random.Random(1))
+    return league
+
+
+@lru_cache(maxsize=None)
+def player_fixture():
+    from players.services import create_recruiting_class
+
+    recruiting_class, _ = create_recruiting_class(2026, 20_000, rng=2)
+    return recruiting_class
+
+
+@lru_cache(maxsize=None)
+def rosters():
+    from league.engine import team_ratings
+    from players.utils import generate_players
+
+    def roster(seed):
+        players = generate_players(ROSTER_SIZE, rng=seed)
+        return team_ratings(SimpleNamespace(id=seed * 100 + i, **p) for i, p in enumerate(players))
+
+    return roster(1), roster(2)
+
+
+# -----------------------------
+# Generation
+# -----------------------------
+
+@case("generate_player", items=2000, unit="players")
+def generate_player(state):
+    from players.utils import generate_player
+    for _ in range(2000):
+        generate_player()
+
+
+@case("generate_players_vectorized", items=100_000, unit="players")
+def generate_players_vectorized(state):
+    from players.utils import generate_player_columns
+    generate_player_columns(100_000, rng=3)
+
+
+# -----------------------------
+# Simulation
+# -----------------------------
+
+@case("simulate_game", items=1000, unit="games")
+def simulate_game(state):
+    from league.engine import simulate_game
+    home, away = rosters()
+    rng = random.Random(4)
+    for _ in range(1000):
+        simulate_game(home, away, rng)
+
+
+@case("simulate_game_possession", items=1000, unit="games")
+def simulate_game_possession(state):
+    from league.possession import simulate_possessions
+    home, away = rosters()
+    rng = random.Random(4)
+    for _ in range(1000):
+        simulate_possessions(home, away, rng)
+
+
+@case("simulate_batch", items=100_000, unit="games")
+def simulate_batch(state):
+    from league.engine import simulate_batch
+    home, away = rosters()
+    simulate_batch(home, away, 100_000, rng=5)
+
+
+@lru_cache(maxsize=None)
+def matchup_fixture():
+    """Two teams in a league of their own, so ad-hoc games stay out of the season fixture"""
+    from league.models import League
+    from league.services import populate_league
+
+    home, away = populate_league(League.objects.create(name="Matchup League"), num_teams=2, rng=9)
+    return {"home_team_id": home.id, "away_team_id": away.id}
+
+
+@case("simulate_endpoint", items=100, unit="requests", setup=matchup_fixture)
+def simulate_endpoint(payload):
+    """Whole POST league/games/simulate/ path: load rosters, simulate, save game and box score"""
+    http = Client()
+    for _ in range(100):
+        response = http.post("/league/games/simulate/", payload, content_type="application/json")
+        assert response.status_code == 201, response.content
+
+
+@case("simulate_endpoint_concurrent", items=200, unit="requests", setup=matchup_fixture)
+def simulate_endpoint_concurrent(payload):
+    """The same path from 8 threads at once, so saves go through the commit queue in groups"""
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connections
+
+    def post(_):
+        http = Client()
+        for _ in range(25):
+            response = http.post("/league/games/simulate/", payload, content_type="application/json")
+            assert response.status_code == 201, response.content
+        connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(post, range(8)))
+
+
+def _league_team_ids():
+    return list(league_fixture().teams.values_list("id", flat=True))
+
+
+@case("load_ratings", items=LEAGUE_TEAMS, unit="teams", setup=_league_team_ids)
+def load_ratings(team_ids):
+    """Rosters of a whole league as TeamRatings, from its (current) snapshot"""
+    from league.season import load_ratings
+    for _ in range(10):
+        load_ratings(team_ids)
+
+
+def _season_setup():
+    from league.models import Game, PlayerGameStat, PlayerSeasonStat, TeamStanding
+
+    league = league_fixture()
+    # reset the schedule to unplayed
+    PlayerGameStat.objects.filter(game__league=league).delete()
+    PlayerSeasonStat.objects.filter(league=league).delete()
+    TeamStanding.objects.filter(league=league).delete()
+    Game.objects.filter(league=league).update(winner=None, home_score=0, away_score=0)
+    return league
+
+
+@case("play_season", items=1, unit="seasons", setup=_season_setup)
+def play_season(league):
+    """Every game of a 64-team season, with box scores, season totals and standings"""
+    from league.season import play_games, unplayed_games
+    play_games(unplayed_games(league), seed=6)
+
+
+# -----------------------------
+# Serialization
+# -----------------------------
+
+def _players_setup():
+    from players.models import Player
+    return list(Player.objects.filter(recruiting_class=player_fixture()).order_by("id")[:1000])
+
+
+@case("serialize_players", items=1000, unit="players", setup=_players_setup)
+def serialize_players(players):
+    from players.serializers import PlayerSerializer
+    PlayerSerializer(players, many=True).data
+
+
+def _teams_setup():
+    from league.models import Team
+    return list(Team.objects.filter(league=league_fixture()).prefetch_related("players"))
+
+
+@case("serialize_teams", items=LEAGUE_TEAMS, unit="teams", setup=_teams_setup)
+def serialize_teams(teams):
+    from league.serializers import TeamSerializer
+    TeamSerializer(teams, many=True).data
+
+
+def _league_setup():
+    from league.models import League
+    return League.objects.prefetch_related(
+        "conferences", Prefetch("teams", queryset=league_fixture().teams.prefetch_related("players"))
+    ).get(id=league_fixture().id)
+
+
+@case("serialize_league", items=1, unit="leagues", setup=_league_setup)
+def serialize_league(league):
+    from league.serializers import LeagueSerializer
+    LeagueSerializer(league).data
+
+
+# -----------------------------
+# Bulk inserts
+# -----------------------------
+
+def _purge_classes():
+    from league.purge import delete_recruiting_class
+    from players.models import RecruitingClass
+
+    keep = player_fixture().id
+    for class_id in RecruitingClass.objects.exclude(id=keep).values_list("id", flat=True):
+        delete_recruiting_class(class_id)
+
+
+@case("insert_recruiting_class", items=50_000, unit="players", setup=_purge_classes)
+def insert_recruiting_class(state):
+    from players.services import create_recruiting_class
+    create_recruiting_class(2027, 50_000, chunk_size=5000, rng=7)
+
+
+def _empty_league():
+    from league.models import League
+    return League.objects.create(name="Insert League")
+
+
+@case("populate_league", items=200 * ROSTER_SIZE, unit="players", setup=_empty_league)
+def populate_league(league):
+    from league.services import populate_league
+    populate_league(league, num_teams=200, roster_size=ROSTER_SIZE, conferences=8, rng=8)
+
+
+@lru_cache(maxsize=None)
+def _development_league():
+    from league.models import League
+    from league.services import populate_league
+
+    league = League.objects.create(name="Development League")
+    populate_league(league, num_teams=3334, roster_size=ROSTER_SIZE, rng=9)
+    return league
+
+
+@case("offseason_progression", items=3334 * ROSTER_SIZE, unit="players", setup=_development_league)
+def offseason_progression(league):
+    """Each repetition develops the same ~50k players one more season"""
+    from league.services import progress_league
+    progress_league(league, rng=10)
+
+
+@lru_cache(maxsize=None)
+def _recruiting_fixture():
+    from league.models import League
+    from league.services import populate_league
+    from players.services import create_recruiting_class
+
+    league = League.objects.create(name="Recruiting League")
+    populate_league(league, num_teams=300, roster_size=10, conferences=10, rng=11)
+    recruiting_class, _ = create_recruiting_class(2028, 5000, rng=12)
+    return league, recruiting_class
+
+
+def _unsigned_class():
+    from backend.db import delete_rows
+    from league.models import Team
+    from league.ratings import recompute_team_ratings
+
+    league, recruiting_class = _recruiting_fixture()
+    delete_rows(Team.players.through.objects.filter(player__recruiting_class=recruiting_class))
+    recompute_team_ratings(league.teams.values_list("id", flat=True))
+    return league, recruiting_class
+
+
+@case("recruit_class", items=5000, unit="recruits", setup=_unsigned_class)
+def recruit_class(state):
+    """5,000 recruits for the open spots of 300 teams (10 of 15 rostered)"""
+    from league.recruiting import recruit_class
+    recruit_class(*state, roster_size=15, rng=13)
+
+
+
+# -----------------------------
+# Queries
+# -----------------------------
+
+def _deep_cursor():
+    """Cursor for the 100th page of the player listing"""
+    player_fixture()
+    http = Client()
+    response = http.get("/players/all/", {"page_size": 100, "fields": "id"})
+    for _ in range(99):
+        response = http.get(response.json()["next"])
+    return response.json()["next"]
+
+
+@case("player_listing_deep_page", items=50, unit="requests", setup=_deep_cursor)
+def player_listing_deep_page(url):
+    http = Client()
+    for _ in range(50):
+        http.get(url)
+
+
+@case("game_listing", items=50, unit="requests", setup=league_fixture)
+def game_listing(league):
+    http = Client()
+    for _ in range(50):
+        http.get("/league/games/", {"league": league.id, "page_size": 100})
+
+
+def _played_league():
+    from league.season import play_games, unplayed_games
+
+    league = league_fixture()
+    if unplayed_games(league).exists():
+        play_games(unplayed_games(league), seed=6)
+    return league
+
+
+@lru_cache(maxsize=None)
+def _league_export():
+    import tempfile
+    from league.universe import export_league
+
+    handle, path = tempfile.mkstemp(prefix="benchmark-league-", suffix=".npz")
+    os.close(handle)
+    atexit.register(os.remove, path)
+    export_league(_played_league(), path)
+    return path
+
+
+@case("import_league", items=1, unit="leagues", setup=_league_export)
+def import_league(path):
+    """A played 64-team season: teams, players, games, box scores, season totals and standings"""
+    from league.universe import import_league
+    import_league(path)
+
+
+@case("standings", items=50, unit="requests", setup=_played_league)
+def standings(league):
+    http = Client()
+    for _ in range(50):
+        http.get(f"/league/leagues/{league.id}/standings/")
@@ -0,0 +1,165 @@
+"""
+Benchmark runner.
+
+    python -m benchmarks.run                       # run everything, compare with baseline.json
+    python -m benchmarks.run --only simulate       # cases whose name contains "simulate"
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --save-baseline       # record the current numbers as the baseline
+
+Runs against a throwaway SQLite database (migrated from scratch, deleted
+afterwards). Each case is repeated and the median time is kept. Against a
+baseline, a case more than --tolerance slower is reported as a regression and
+the exit status is 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.5  # shared CI machines swing by a third between runs
+
+
+def setup_django(db_path):
+    os.environ["BENCHMARK_DB"] = db_path
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+
+def measure(case, repeat):
+    timings = []
+    for _ in range(repeat):
+        state = case.setup()
+        gc.collect()
+        started = time.perf_counter()
+        case.run(state)
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        "items": case.items,
+        "unit": case.unit,
+        "repeat": repeat,
+        "median_s": round(median, 6),
+        "min_s": round(min(timings), 6),
+        "per_item_ms": round(1000 * median / case.items, 4),
+        "items_per_s": round(case.items / median, 1) if median > 0 else None,
+    }
+
+
+def metadata():
+    import django
+    import numpy
+    import rest_framework
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "djangorestframework": rest_framework.VERSION,
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Rows of (name, baseline median, current median, ratio, status)"""
+    rows = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            rows.append((name, None, result["median_s"], None, "new"))
+            continue
+        ratio = result["median_s"] / before["median_s"] if before["median_s"] else None
+        if ratio is None:
+            status = "ok"
+        elif ratio > 1 + tolerance:
+            status = "REGRESSION"
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, before["median_s"], result["median_s"], ratio, status))
+    return rows
+
+
+def print_table(results, rows):
+    def fmt(value, width, spec):
+        return format(value, f">{width}{spec}") if value is not None else format("-", f">{width}")
+
+    print(f"{'case':<28} {'median s':>10} {'per item ms':>12} {'items/s':>12} {'baseline s':>11} {'ratio':>7}  status")
+    by_name = {row[0]: row for row in rows}
+    for name, result in results.items():
+        _, before, _, ratio, status = by_name.get(name, (name, None, None, None, ""))
+        print(
+            f"{name:<28} {result['median_s']:>10.4f} {result['per_item_ms']:>12.4f} "
+            f"{fmt(result['items_per_s'], 12, ',.0f')} {fmt(before, 11, '.4f')} {fmt(ratio, 7, '.2f')}  {status}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Run cases whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", default=str(BASELINE), help="Baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a case counts as a regression (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    handle, db_path = tempfile.mkstemp(prefix="benchmark-", suffix=".sqlite3")
+    os.close(handle)
+    try:
+        setup_django(db_path)
+        from .cases import CASES
+
+        cases = [c for c in CASES if not args.only or any(part in c.name for part in args.only)]
+        results = {}
+        for case in cases:
+            print(f"running {case.name} ...", file=sys.stderr, flush=True)
+            results[case.name] = measure(case, args.repeat)
+    finally:
+        from django.db import connections
+        connections.close_all()
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        baseline_path = Path(args.baseline)
+        previous = json.loads(baseline_path.read_text()) if baseline_path.exists() else {"results": {}}
+        previous["meta"] = report["meta"]
+        previous["results"].update(results)
+        baseline_path.write_text(json.dumps(previous, indent=2) + "\n")
+        print_table(results, [])
+        print(f"\nbaseline written to {baseline_path}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    rows = compare(results, baseline, args.tolerance)
+    print_table(results, rows)
+    regressions = [row[0] for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
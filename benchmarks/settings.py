@@ -0,0 +1,16 @@
+"""
+Settings for the benchmark runner: the project settings pointed at a
+throwaway SQLite file (BENCHMARK_DB, created and deleted by benchmarks.run).
+"""
+import os
+
+from backend.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+
+DATABASES = {
+    "default": {**DATABASES["default"], "NAME": os.environ["BENCHMARK_DB"]},  # noqa: F405
+}
+
+JOBS_LOCAL_WORKERS = 0
@@ -0,0 +1,54 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.runner import Worker, fail_orphaned_jobs
+
+
+def _work(burst, poll_interval):
+    import django
+    django.setup()
+    Worker(poll_interval).run(burst=burst)
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs in local worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes (default 1)")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+        parser.add_argument("--poll-interval", type=float, default=None, help="Seconds between polls when idle")
+
+    def handle(self, *args, **options):
+        orphaned = fail_orphaned_jobs()
+        if orphaned:
+            self.stdout.write(self.style.WARNING(f"Marked {orphaned} orphaned jobs as failed"))
+
+        workers = max(1, options["workers"])
+        if workers == 1:
+            worker = Worker(options["poll_interval"])
+            signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+            try:
+                ran = worker.run(burst=options["burst"])
+            except KeyboardInterrupt:
+                ran = None
+            if ran is not None:
+                self.stdout.write(self.style.SUCCESS(f"Ran {ran} jobs"))
+            return
+
+        connections.close_all()  # children open their own
+        processes = [
+            multiprocessing.Process(target=_work, args=(options["burst"], options["poll_interval"]), daemon=False)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+        self.stdout.write(self.style.SUCCESS(f"{workers} workers stopped"))
@@ -0,0 +1,30 @@
+"""
+Job handlers by kind.
+
+A handler is called as handler(params, progress) in a worker and returns a
+JSON-serializable result. progress(done, total) records how far it got and
+raises JobCancelled once a cancel has been requested, so handlers should call
+it between units of work, after committing what is done so far.
+"""
+_handlers = {}
+
+
+def register(kind):
+    """Decorator registering a handler for `kind`"""
+    def decorator(fn):
+        if kind in _handlers:
+            raise ValueError(f"Job kind {kind!r} is already registered")
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+def get_handler(kind):
+    try:
+        return _handlers[kind]
+    except KeyError:
+        raise ValueError(f"Unknown job kind {kind!r}")
+
+
+def registered_kinds():
+    return sorted(_handlers)
@@ -0,0 +1,189 @@
+"""
+Queueing and running jobs with nothing but the database.
+
+Workers claim the oldest queued job with a conditional UPDATE, so any number
+of them (threads in the web process, `manage.py run_jobs` processes, or both)
+can poll the same table without a broker and without running a job twice.
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+DEFAULT_POLL_INTERVAL = 1.0
+PROGRESS_INTERVAL = 0.25  # seconds between progress writes
+
+_wakeup = threading.Event()
+_local_workers = []
+_local_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised from progress() when the job's cancel was requested"""
+
+
+def enqueue(kind, params=None):
+    """Queue a job and nudge the local workers once the transaction commits"""
+    get_handler(kind)  # fail fast on typos
+    job = Job.objects.create(kind=kind, params=params or {})
+    start_local_workers()
+    transaction.on_commit(_wakeup.set)
+    return job
+
+
+def request_cancel(job):
+    """
+    Cancel a queued job outright; ask a running one to stop at its next
+    progress report. Returns the refreshed job.
+    """
+    now = timezone.now()
+    Job.objects.filter(id=job.id, status=Job.Status.QUEUED).update(
+        status=Job.Status.CANCELLED, cancel_requested=True, finished_at=now
+    )
+    Job.objects.filter(id=job.id, status=Job.Status.RUNNING).update(cancel_requested=True)
+    job.refresh_from_db()
+    return job
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def claim_next(name):
+    """Atomically take the oldest queued job, or return None"""
+    while True:
+        job_id = Job.objects.filter(status=Job.Status.QUEUED).order_by("id").values_list("id", flat=True).first()
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = Job.objects.filter(id=job_id, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING, worker=name, started_at=now, updated_at=now
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+        # another worker got there first
+
+
+class Progress:
+    """The progress(done, total) callable handed to handlers"""
+
+    def __init__(self, job):
+        self.job = job
+        self.last_write = None
+
+    def __call__(self, done, total=None):
+        now = time.monotonic()
+        if self.last_write is not None and now - self.last_write < PROGRESS_INTERVAL:
+            return
+        self.last_write = now
+        fields = {"progress_done": done, "updated_at": timezone.now()}
+        if total is not None:
+            fields["progress_total"] = total
+        # one statement both records progress and notices a cancel
+        if not Job.objects.filter(id=self.job.id, cancel_requested=False).update(**fields):
+            raise JobCancelled()
+
+
+def run_job(job):
+    """Run a claimed job to completion and store its outcome"""
+    fields = {}
+    try:
+        result = get_handler(job.kind)(job.params, Progress(job))
+    except JobCancelled:
+        fields["status"] = Job.Status.CANCELLED
+    except Exception:
+        fields["status"] = Job.Status.FAILED
+        fields["error"] = traceback.format_exc()
+    else:
+        fields["status"] = Job.Status.SUCCEEDED
+        fields["result"] = result
+        fields["progress_done"] = Coalesce("progress_total", "progress_done")  # throttling may skip the last report
+    Job.objects.filter(id=job.id).update(finished_at=timezone.now(), **fields)
+    job.refresh_from_db()
+    return job
+
+
+def fail_orphaned_jobs():
+    """
+    Mark running jobs whose worker process on this host has exited as failed.
+    Returns how many were found.
+    """
+    host = socket.gethostname()
+    orphaned = []
+    for job_id, worker in Job.objects.filter(status=Job.Status.RUNNING).values_list("id", "worker"):
+        worker_host, _, rest = worker.partition(":")
+        pid = rest.partition(":")[0]
+        if worker_host != host or not pid.isdigit():
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            orphaned.append(job_id)
+        except PermissionError:
+            pass  # alive, owned by someone else
+    Job.objects.filter(id__in=orphaned, status=Job.Status.RUNNING).update(
+        status=Job.Status.FAILED, error="Worker exited before the job finished", finished_at=timezone.now()
+    )
+    return len(orphaned)
+
+
+class Worker:
+    """Claims and runs jobs until stopped (or, in burst mode, until the queue is empty)"""
+
+    def __init__(self, poll_interval=None):
+        self.poll_interval = poll_interval or getattr(settings, "JOBS_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)
+        self.stopping = threading.Event()
+
+    def run(self, burst=False):
+        name = worker_name()
+        ran = 0
+        while not self.stopping.is_set():
+            close_old_connections()
+            job = claim_next(name)
+            if job is None:
+                if burst:
+                    break
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
+                continue
+            run_job(job)
+            ran += 1
+        close_old_connections()
+        return ran
+
+    def stop(self):
+        self.stopping.set()
+        _wakeup.set()
+
+
+def run_pending():
+    """Run queued jobs in the calling thread until none are left; returns how many ran"""
+    return Worker().run(burst=True)
+
+
+def start_local_workers():
+    """
+    Start settings.JOBS_LOCAL_WORKERS daemon threads in this process, once.
+    With 0 jobs wait for `manage.py run_jobs`.
+    """
+    count = getattr(settings, "JOBS_LOCAL_WORKERS", 0)
+    if count <= 0 or _local_workers:
+        return
+    with _local_lock:
+        if _local_workers:
+            return
+        fail_orphaned_jobs()
+        for i in range(count):
+            worker = Worker()
+            thread = threading.Thread(target=worker.run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            _local_workers.append(worker)
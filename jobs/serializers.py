@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    percent = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            "id", "kind", "params", "status", "progress_done", "progress_total", "percent",
+            "error", "cancel_requested", "worker", "created_at", "started_at", "updated_at", "finished_at",
+        ]
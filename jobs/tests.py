@@ -0,0 +1,110 @@
+import socket
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from league.models import Game, League, TeamStanding
+from league.season import create_schedule
+from league.services import populate_league
+from players.models import Player, RecruitingClass
+from . import registry, runner
+from .models import Job
+from .runner import claim_next, enqueue, fail_orphaned_jobs, run_job, run_pending
+
+
+@override_settings(JOBS_LOCAL_WORKERS=0)
+class JobRunnerTests(TestCase):
+    def test_claim_is_exclusive(self):
+        job = enqueue("players.recruiting_class", {"year": 2026, "count": 5, "chunk_size": 5})
+        self.assertEqual(claim_next("a").id, job.id)
+        self.assertIsNone(claim_next("b"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (Job.Status.RUNNING, "a"))
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            enqueue("nope")
+
+    def test_failure_is_recorded(self):
+        def boom(params, progress):
+            raise RuntimeError("kaput")
+
+        with mock.patch.dict(registry._handlers, {"tests.boom": boom}):
+            job = enqueue("tests.boom")
+            self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("kaput", job.error)
+
+    def test_cancel_running_job_rolls_back_partial_class(self):
+        job = enqueue("players.recruiting_class", {"year": 2026, "count": 50, "chunk_size": 10})
+        claim_next("a")
+        Job.objects.filter(id=job.id).update(cancel_requested=True)
+        with mock.patch.object(runner, "PROGRESS_INTERVAL", 0):
+            job = run_job(job)
+        self.assertEqual(job.status, Job.Status.CANCELLED)
+        self.assertFalse(RecruitingClass.objects.exists())
+        self.assertFalse(Player.objects.exists())
+
+    def test_orphaned_jobs_fail(self):
+        job = enqueue("players.recruiting_class", {"year": 2026, "count": 5, "chunk_size": 5})
+        claim_next(f"{socket.gethostname()}:999999999:job-worker-0")
+        self.assertEqual(fail_orphaned_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+
+@override_settings(JOBS_LOCAL_WORKERS=0)
+class AsyncEndpointTests(TestCase):
+    def test_recruiting_class_job(self):
+        response = self.client.post(
+            "/players/recruiting-class/", {"count": 30, "year": 2026, "chunk_size": 10, "async": True},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "queued")
+        self.assertFalse(Player.objects.exists())
+
+        self.assertEqual(self.client.get(response.data["result_url"]).status_code, 409)
+        run_pending()
+
+        status = self.client.get(response["Location"]).data
+        self.assertEqual((status["status"], status["percent"]), ("succeeded", 100.0))
+        self.assertEqual(status["progress_done"], 30)
+        result = self.client.get(response.data["result_url"]).data["result"]
+        self.assertEqual(result["created"], 30)
+        self.assertEqual(RecruitingClass.objects.get(id=result["id"]).players.count(), 30)
+
+    def test_create_teams_and_simulate_season_jobs(self):
+        league = League.objects.create(name="Async")
+        response = self.client.post(
+            f"/league/leagues/{league.id}/create_teams/", {"num_teams": 4, "roster_size": 5, "async": True},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 202)
+        run_pending()
+        self.assertEqual(league.teams.count(), 4)
+
+        create_schedule(league)
+        response = self.client.post(f"/league/leagues/{league.id}/simulate_season/?async=1", {"seed": 3})
+        self.assertEqual(response.status_code, 202)
+        run_pending()
+        result = self.client.get(response.data["result_url"]).data["result"]
+        self.assertEqual(result["games_played"], 6)
+        self.assertEqual(result["seed"], 3)
+        self.assertFalse(Game.objects.filter(league=league, winner__isnull=True).exists())
+        self.assertEqual(TeamStanding.objects.filter(league=league).count(), 4)
+
+    def test_cancel_endpoint(self):
+        league = League.objects.create(name="Async")
+        populate_league(league, num_teams=2, roster_size=5)
+        create_schedule(league)
+        job_id = self.client.post(
+            f"/league/leagues/{league.id}/simulate_week/", {"async": True}, content_type="application/json"
+        ).data["id"]
+
+        response = self.client.post(f"/jobs/{job_id}/cancel/")
+        self.assertEqual(response.data["status"], "cancelled")
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(self.client.post(f"/jobs/{job_id}/cancel/").status_code, 409)
+        self.assertEqual(self.client.get("/jobs/", {"status": "cancelled"}).data["count"], 1)
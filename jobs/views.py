@@ -0,0 +1,69 @@
+from django.urls import reverse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from backend.pagination import PageSizePagination
+from .models import Job
+from .runner import request_cancel
+from .serializers import JobSerializer
+
+TRUTHY = ("1", "true", "yes", "on")
+
+
+def request_flag(request, name):
+    """Boolean option from the body or the query string: { "name": true } or ?name=1"""
+    value = request.data.get(name, request.query_params.get(name, False))
+    if isinstance(value, str):
+        return value.lower() in TRUTHY
+    return bool(value)
+
+
+def wants_async(request):
+    """Whether the client asked for a job instead of waiting"""
+    return request_flag(request, "async")
+
+
+def accepted(job):
+    """202 response for a freshly queued job, pointing at its status endpoint"""
+    url = reverse("job-detail", args=[job.id])
+    data = {**JobSerializer(job).data, "status_url": url, "result_url": reverse("job-result", args=[job.id])}
+    return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": url})
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Job status (retrieve), listing with ?status= and ?kind=, result and cancel"""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    pagination_class = PageSizePagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            # progress polling never needs the (possibly large) result
+            queryset = queryset.defer("result")
+            params = self.request.query_params
+            if "status" in params:
+                queryset = queryset.filter(status=params["status"])
+            if "kind" in params:
+                queryset = queryset.filter(kind=params["kind"])
+            return queryset.order_by("-id")
+        return queryset
+
+    @action(detail=True, methods=["get"])
+    def result(self, request, pk=None):
+        """The handler's return value; 409 until the job has succeeded"""
+        job = self.get_object()
+        if job.status != Job.Status.SUCCEEDED:
+            return Response(
+                {"error": f"Job is {job.status}", "status": job.status, "detail": job.error or None},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({"id": job.id, "kind": job.kind, "result": job.result})
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if job.finished:
+            return Response({"error": f"Job already {job.status}"}, status=status.HTTP_409_CONFLICT)
+        return Response(JobSerializer(request_cancel(job)).data)
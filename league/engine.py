@@ -0,0 +1,250 @@
+"""
+Game simulation engine.
+
+Works on compact per-team rating arrays (one row per rostered player) so it
+can run without the ORM or a request. Build a TeamRatings with team_ratings()
+and pass two of them to simulate_game().
+"""
+import random
+from collections import namedtuple
+
+import numpy as np
+
+# bump when a change makes the same seed produce different games (invalidates cached results)
+ENGINE_VERSION = 1
+
+# Columns of TeamRatings.ratings
+RATING_FIELDS = (
+    "overall",
+    "close_shot",
+    "driving_layup",
+    "driving_dunk",
+    "mid_range_shot",
+    "three_point_shot",
+    "free_throw",
+    "pass_accuracy",
+    "ball_handle",
+    "interior_defense",
+    "perimeter_defense",
+    "steal",
+    "block",
+    "offensive_rebounding",
+    "defensive_rebounding",
+    # only used by the possession engine (league.possession)
+    "post_moves",
+    "standing_dunk",
+    "speed_with_ball",
+    "speed",
+    "strength",
+    "vertical",
+)
+COL = {field: i for i, field in enumerate(RATING_FIELDS)}
+
+OFFENSE_FIELDS = ("three_point_shot", "mid_range_shot", "close_shot", "driving_layup", "driving_dunk")
+DEFENSE_FIELDS = ("perimeter_defense", "interior_defense", "steal", "block", "defensive_rebounding")
+
+TOTAL_MINUTES = 200.0
+STARTER_SHARE = 0.85
+HOT_HAND_CHANCE = 0.05
+
+BOX_STATS = ("minutes", "points", "rebounds", "assists", "steals", "blocks", "turnovers")
+
+# offense/defense may carry the team's stored aggregates; None means compute them
+TeamRatings = namedtuple(
+    "TeamRatings", ["player_ids", "names", "positions", "ratings", "offense", "defense"], defaults=(None, None)
+)
+
+
+def team_ratings(players, offense=None, defense=None):
+    """Pack an iterable of Player-like objects into a TeamRatings"""
+    players = list(players)
+    return TeamRatings(
+        offense=offense,
+        defense=defense,
+        player_ids=np.array([p.id for p in players], dtype=np.int64),
+        names=[p.name for p in players],
+        positions=[p.position for p in players],
+        ratings=np.array(
+            [[getattr(p, f) for f in RATING_FIELDS] for p in players], dtype=np.int16
+        ).reshape(len(players), len(RATING_FIELDS)),
+    )
+
+
+def team_off_def(team):
+    """Summed offensive and defensive ratings of the whole roster"""
+    if team.offense is not None and team.defense is not None:
+        return team.offense, team.defense
+    offense = int(team.ratings[:, [COL[f] for f in OFFENSE_FIELDS]].sum(dtype=np.int64))
+    defense = int(team.ratings[:, [COL[f] for f in DEFENSE_FIELDS]].sum(dtype=np.int64))
+    return offense, defense
+
+
+def rotation(team, bench_size):
+    """
+    Row indexes of the players who see the floor and their minutes.
+    Top 5 by overall start and share 85% of the minutes by overall; the next
+    bench_size players split the rest, then everything is scaled to 200.
+    """
+    overall = team.ratings[:, COL["overall"]].astype(np.float64)  # ratings may be uint8 (league.snapshot)
+    order = np.argsort(-overall, kind="stable")
+    starters = order[:5]
+    bench = order[5:10][:bench_size]
+
+    starter_minutes = TOTAL_MINUTES * (overall[starters] / sum(overall[starters].tolist())) * STARTER_SHARE
+    remaining = TOTAL_MINUTES - sum(starter_minutes.tolist())
+    bench_sum = sum(overall[bench].tolist()) if len(bench) else 1
+    bench_minutes = remaining * (overall[bench] / bench_sum)
+
+    minutes = np.concatenate([starter_minutes, bench_minutes])
+    minutes = minutes * (TOTAL_MINUTES / sum(minutes.tolist()))
+    return np.concatenate([starters, bench]), minutes
+
+
+def player_stats(r, minutes, performance, boost, team_off_factor, opp_def_factor):
+    """
+    Stat lines for rating rows r (players x RATING_FIELDS), all as float arrays.
+    performance is the per-player random form factor and boost the hot-hand
+    multiplier on points (1.0 when the player is not hot).
+    """
+    r = np.asarray(r, dtype=np.float64)
+
+    def c(field):
+        return r[..., COL[field]]
+
+    share = minutes / 40
+    productivity = (
+        c("close_shot") * 0.25 +
+        c("driving_layup") * 0.15 +
+        c("driving_dunk") * 0.10 +
+        c("mid_range_shot") * 0.20 +
+        c("three_point_shot") * 0.20 +
+        c("free_throw") * 0.10
+    ) * performance * team_off_factor / (opp_def_factor + 1)
+
+    return {
+        "minutes": minutes,
+        "points": productivity * share * boost,
+        "rebounds": (c("offensive_rebounding") * 0.4 + c("defensive_rebounding") * 0.6) * performance / 8 * share,
+        "assists": (c("pass_accuracy") * 0.3 + c("ball_handle") * 0.2) * performance / 5 * share,
+        "steals": c("steal") * performance / 25 * share,
+        "blocks": c("block") * performance / 20 * share,
+        "turnovers": np.maximum(0, share * (5 - (c("ball_handle") + c("pass_accuracy")) / 50) * performance),
+    }
+
+
+def simulate_team(team, team_factor, opp_def_factor, rng=random):
+    """Box score (list of per-player dicts) for one team. rng is a random.Random-like source."""
+    rows, minutes = rotation(team, rng.randint(3, 5))
+
+    # per-player form and hot-hand draws, in roster order
+    performance = np.empty(len(rows))
+    boost = np.ones(len(rows))
+    for i in range(len(rows)):
+        performance[i] = rng.uniform(0.95, 1.05)
+        if rng.random() < HOT_HAND_CHANCE:
+            boost[i] = rng.uniform(1.4, 1.8)
+
+    stats = player_stats(team.ratings[rows], minutes, performance, boost, team_factor * 20, opp_def_factor / 100)
+    columns = {stat: [round(v) for v in stats[stat].tolist()] for stat in BOX_STATS}
+
+    return [
+        {
+            "player_id": int(team.player_ids[row]),
+            "name": team.names[row],
+            "position": team.positions[row],
+            **{stat: columns[stat][i] for stat in BOX_STATS},
+        }
+        for i, row in enumerate(rows.tolist())
+    ]
+
+
+def simulate_game(home, away, rng=random):
+    """
+    Simulate one game between two TeamRatings.
+    Returns a dict with home_box, away_box, home_score, away_score and
+    home_win (home wins ties).
+    """
+    home_off, home_def = team_off_def(home)
+    away_off, away_def = team_off_def(away)
+
+    home_factor = home_off / (home_off + away_def + 50)
+    away_factor = away_off / (away_off + home_def + 50)
+
+    home_box = simulate_team(home, home_factor, away_def, rng)
+    away_box = simulate_team(away, away_factor, home_def, rng)
+
+    home_score = sum(p["points"] for p in home_box)
+    away_score = sum(p["points"] for p in away_box)
+
+    return {
+        "home_box": home_box,
+        "away_box": away_box,
+        "home_score": home_score,
+        "away_score": away_score,
+        "home_win": home_score >= away_score,
+    }
+
+
+def simulate_batch(home, away, iterations, rng=None, chunk_size=25_000):
+    """
+    Monte Carlo version of simulate_game(): plays the matchup `iterations`
+    times as array operations (no Python loop per game or player).
+    rng is a NumPy Generator or seed. Returns home_scores and away_scores
+    (one entry per iteration) and per-team dicts of mean stat lines keyed by
+    row index into the team's TeamRatings.
+    """
+    rng = np.random.default_rng(rng)
+    home_off, home_def = team_off_def(home)
+    away_off, away_def = team_off_def(away)
+    sides = (
+        (home, home_off / (home_off + away_def + 50), away_def),
+        (away, away_off / (away_off + home_def + 50), home_def),
+    )
+
+    scores = [np.empty(iterations, dtype=np.int64) for _ in sides]
+    totals = [None, None]
+    tables = []
+    for team, _, _ in sides:
+        # minutes for every bench size, padded to the 5-man-bench rotation
+        rows, _ = rotation(team, 5)
+        minutes = np.zeros((3, len(rows)))
+        for bench_size in (3, 4, 5):
+            _, played = rotation(team, bench_size)
+            minutes[bench_size - 3, :len(played)] = played
+        tables.append((rows, minutes))
+
+    for start in range(0, iterations, chunk_size):
+        n = min(chunk_size, iterations - start)
+        for side, (team, team_factor, opp_def) in enumerate(sides):
+            rows, minutes_table = tables[side]
+            shape = (n, len(rows))
+            minutes = minutes_table[rng.integers(3, 6, size=n) - 3]
+            performance = rng.uniform(0.95, 1.05, size=shape)
+            boost = np.where(rng.random(shape) < HOT_HAND_CHANCE, rng.uniform(1.4, 1.8, size=shape), 1.0)
+
+            stats = player_stats(
+                team.ratings[rows], minutes, performance, boost, team_factor * 20, opp_def / 100
+            )
+            rounded = {stat: np.round(stats[stat]) for stat in BOX_STATS}
+            scores[side][start:start + n] = rounded["points"].sum(axis=1)
+
+            chunk_totals = {stat: values.sum(axis=0) for stat, values in rounded.items()}
+            if totals[side] is None:
+                totals[side] = chunk_totals
+            else:
+                for stat in BOX_STATS:
+                    totals[side][stat] += chunk_totals[stat]
+
+    lines = []
+    for side, (rows, _) in enumerate(tables):
+        lines.append({
+            int(row): {stat: totals[side][stat][i] / iterations for stat in BOX_STATS}
+            for i, row in enumerate(rows.tolist())
+        })
+
+    return {
+        "home_scores": scores[0],
+        "away_scores": scores[1],
+        "home_lines": lines[0],
+        "away_lines": lines[1],
+    }
@@ -0,0 +1,68 @@
+import random
+
+from jobs.registry import register
+from players.models import RecruitingClass
+from .models import League
+from .recruiting import recruit_class
+from .season import play_games, unplayed_games
+from .services import populate_league, progress_league
+
+
+@register("league.create_teams")
+def create_teams(params, progress):
+    """Background create_teams. One transaction, so it can only be cancelled before it starts."""
+    league = League.objects.get(id=params["league_id"])
+    progress(0, params["num_teams"])
+    teams = populate_league(
+        league,
+        num_teams=params["num_teams"],
+        roster_size=params["roster_size"],
+        conferences=params.get("conferences"),
+    )
+    return {"league_id": league.id, "team_ids": [team.id for team in teams]}
+
+
+@register("league.simulate")
+def simulate(params, progress):
+    """
+    Background simulate_week / simulate_season. Each week is played and
+    committed on its own, with games seeded from (seed, game ID), so the
+    results match a single play_games() call with the same seed and a cancel
+    stops between weeks.
+    """
+    league = League.objects.get(id=params["league_id"])
+    games = unplayed_games(league)
+    if params.get("week") is not None:
+        games = games.filter(week=params["week"])
+    games = list(games)
+    seed = params.get("seed")
+    if seed is None:
+        seed = random.getrandbits(63)
+
+    weeks = sorted({g.week for g in games})
+    played = 0
+    for week in weeks:
+        progress(played, len(games))
+        week_games = [g for g in games if g.week == week]
+        play_games(week_games, seed=seed, workers=params.get("workers", 1))
+        played += len(week_games)
+    return {"games_played": played, "weeks": weeks, "seed": seed}
+
+
+@register("league.offseason")
+def offseason(params, progress):
+    """Background offseason; one transaction, like create_teams"""
+    league = League.objects.get(id=params["league_id"])
+    seed = params.get("seed")
+    if seed is None:
+        seed = random.getrandbits(63)
+    return {"league_id": league.id, "seed": seed, **progress_league(league, rng=seed)}
+
+
+@register("league.recruit")
+def recruit(params, progress):
+    """Background recruit; one transaction, like create_teams"""
+    league = League.objects.get(id=params["league_id"])
+    recruiting_class = RecruitingClass.objects.get(id=params["recruiting_class_id"])
+    stats = recruit_class(league, recruiting_class, roster_size=params["roster_size"], rng=params["seed"])
+    return {"league_id": league.id, "seed": params["seed"], **stats}
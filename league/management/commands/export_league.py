@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from league.models import League
+from league.universe import export_league
+
+
+class Command(BaseCommand):
+    help = "Write a league with its teams, players, games and stats to a columnar .npz file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("league", type=int, help="League ID")
+        parser.add_argument("path", help="Output file (.npz)")
+
+    def handle(self, *args, **options):
+        try:
+            league = League.objects.get(id=options["league"])
+        except League.DoesNotExist:
+            raise CommandError(f"League {options['league']} does not exist")
+        started = time.perf_counter()
+        counts = export_league(league, options["path"])
+        summary = ", ".join(f"{rows} {table}" for table, rows in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {summary} to {options['path']} in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from league.universe import import_league
+
+
+class Command(BaseCommand):
+    help = "Create a new league from a file written by export_league"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Exported .npz file")
+        parser.add_argument("--name", help="Name for the new league (default: the exported name)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            league, counts = import_league(options["path"], name=options["name"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        summary = ", ".join(f"{rows} {table}" for table, rows in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported league {league.id} ({summary}) in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from league.purge import delete_league, delete_recruiting_class, reset_all
+
+
+class Command(BaseCommand):
+    help = "Set-based delete of everything (--all), one league, or one recruiting class"
+
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group(required=True)
+        scope.add_argument("--all", action="store_true",
+                           help="Players, memberships, games, stats and recruiting classes (teams stay)")
+        scope.add_argument("--league", type=int, help="League ID")
+        scope.add_argument("--recruiting-class", type=int, help="Recruiting class ID")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            counts = reset_all()
+        elif options["league"] is not None:
+            counts = delete_league(options["league"])
+        else:
+            counts = delete_recruiting_class(options["recruiting_class"])
+
+        if not any(counts.values()):
+            raise CommandError("Nothing to delete")
+        summary = ", ".join(f"{deleted} {label}" for label, deleted in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Deleted {summary}"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from league.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Rebuild TeamStanding rows from the played games (all leagues, or the given ones)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", type=int, action="append", help="League ID (repeatable)")
+
+    def handle(self, *args, **options):
+        games = rebuild_standings(options["league"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt standings from {games} games"))
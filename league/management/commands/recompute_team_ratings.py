@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from league.models import Team
+from league.ratings import recompute_team_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored overall/offense/defense ratings of every team (or of one league)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", type=int, help="Only recompute teams of this league ID")
+
+    def handle(self, *args, **options):
+        team_ids = None
+        if options["league"] is not None:
+            team_ids = Team.objects.filter(league_id=options["league"]).values_list("id", flat=True)
+        count = recompute_team_ratings(team_ids)
+        self.stdout.write(self.style.SUCCESS(f"Recomputed ratings for {count} teams"))
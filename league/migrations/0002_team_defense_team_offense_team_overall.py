@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+OFFENSE_FIELDS = ("three_point_shot", "mid_range_shot", "close_shot", "driving_layup", "driving_dunk")
+DEFENSE_FIELDS = ("perimeter_defense", "interior_defense", "steal", "block", "defensive_rebounding")
+
+
+def fill_team_ratings(apps, schema_editor):
+    Team = apps.get_model("league", "Team")
+    for team in Team.objects.prefetch_related("players"):
+        players = list(team.players.all())
+        if players:
+            team.overall = sum(p.overall for p in players) // len(players)
+        team.offense = sum(getattr(p, f) for p in players for f in OFFENSE_FIELDS)
+        team.defense = sum(getattr(p, f) for p in players for f in DEFENSE_FIELDS)
+        team.save(update_fields=["overall", "offense", "defense"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='defense',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='offense',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='overall',
+            field=models.IntegerField(db_index=True, default=60),
+        ),
+        migrations.RunPython(fill_team_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0003_game_game_league_week_idx'),
+        ('players', '0006_alter_player_recruiting_class'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='season',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='league',
+            name='season',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.CreateModel(
+            name='PlayerGameStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minutes', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('rebounds', models.IntegerField(default=0)),
+                ('assists', models.IntegerField(default=0)),
+                ('steals', models.IntegerField(default=0)),
+                ('blocks', models.IntegerField(default=0)),
+                ('turnovers', models.IntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='box_scores', to='league.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to='players.player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to='league.team')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'player'), name='unique_player_game_stat')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlayerSeasonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('games', models.IntegerField(default=0)),
+                ('minutes', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('rebounds', models.IntegerField(default=0)),
+                ('assists', models.IntegerField(default=0)),
+                ('steals', models.IntegerField(default=0)),
+                ('blocks', models.IntegerField(default=0)),
+                ('turnovers', models.IntegerField(default=0)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_season_stats', to='league.league')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='players.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['league', 'season', 'points'], name='season_stat_points_idx')],
+                'constraints': [models.UniqueConstraint(fields=('player', 'league', 'season'), name='unique_player_season_stat')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0005_teamstanding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='mode',
+            field=models.CharField(default='classic', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='roster_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0006_game_seed_team_roster_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='state',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+    ]
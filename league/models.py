@@ -1,6 +1,8 @@
 from django.db import models
 from players.models import Player
 
+DEFAULT_TEAM_OVERALL = 60  # baseline for a team without players
+
 
 class Conference(models.Model):
     name = models.CharField(max_length=100)
@@ -13,6 +15,7 @@ class Conference(models.Model):
 class League(models.Model):
     name = models.CharField(max_length=100)
     conferences = models.ManyToManyField(Conference, related_name="leagues")
+    season = models.IntegerField(default=1)  # current season; new games are tagged with it
 
     def __str__(self):
         return self.name
@@ -25,12 +28,14 @@ class Team(models.Model):
         Conference, on_delete=models.CASCADE, related_name="teams", null=True, blank=True
     )
     players = models.ManyToManyField(Player, related_name="teams", blank=True)
+    state = models.CharField(max_length=50, blank=True, default="")  # home state, for recruiting
 
-    @property
-    def overall(self):
-        if self.players.exists():
-            return int(sum(p.overall for p in self.players.all()) / self.players.count())
-        return 60  # default baseline
+    # Denormalized roster ratings, kept current by league.ratings
+    overall = models.IntegerField(default=DEFAULT_TEAM_OVERALL, db_index=True)
+    offense = models.IntegerField(default=0, db_index=True)
+    defense = models.IntegerField(default=0, db_index=True)
+    # bumped with every ratings recompute; part of the simulation cache key
+    roster_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.name
@@ -44,6 +49,88 @@ class Game(models.Model):
     away_score = models.IntegerField(default=0)
     winner = models.ForeignKey(Team, related_name="wins", on_delete=models.CASCADE, null=True, blank=True)
     week = models.IntegerField(default=1)
+    season = models.IntegerField(default=1)
+    # engine and seed of a simulate request, so the game can be replayed
+    mode = models.CharField(max_length=20, default="classic")
+    seed = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["league", "week"], name="game_league_week_idx"),
+        ]
 
     def __str__(self):
         return f"{self.home_team} vs {self.away_team} (Week {self.week})"
+
+
+class PlayerGameStat(models.Model):
+    """One player's box score line for one game"""
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="box_scores")
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="game_stats")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="game_stats")
+    minutes = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    rebounds = models.IntegerField(default=0)
+    assists = models.IntegerField(default=0)
+    steals = models.IntegerField(default=0)
+    blocks = models.IntegerField(default=0)
+    turnovers = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["game", "player"], name="unique_player_game_stat"),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} in game {self.game_id}: {self.points} pts"
+
+
+class PlayerSeasonStat(models.Model):
+    """Running season totals per player, incremented as each game is recorded"""
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="season_stats")
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="player_season_stats")
+    season = models.IntegerField()
+    games = models.IntegerField(default=0)
+    minutes = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    rebounds = models.IntegerField(default=0)
+    assists = models.IntegerField(default=0)
+    steals = models.IntegerField(default=0)
+    blocks = models.IntegerField(default=0)
+    turnovers = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["player", "league", "season"], name="unique_player_season_stat"),
+        ]
+        indexes = [
+            models.Index(fields=["league", "season", "points"], name="season_stat_points_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} season {self.season}: {self.points} pts in {self.games} games"
+
+
+class TeamStanding(models.Model):
+    """Season record per team, updated in place as each game is recorded"""
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="standings")
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="standings")
+    season = models.IntegerField()
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    conference_wins = models.IntegerField(default=0)
+    conference_losses = models.IntegerField(default=0)
+    points_for = models.IntegerField(default=0)
+    points_against = models.IntegerField(default=0)
+    streak = models.IntegerField(default=0)  # +n for n straight wins, -n for losses
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team", "season"], name="unique_team_standing"),
+        ]
+        indexes = [
+            models.Index(fields=["league", "season"], name="standing_league_season_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.team_id} season {self.season}: {self.wins}-{self.losses}"
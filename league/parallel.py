@@ -0,0 +1,78 @@
+"""
+Process-pool fan-out for season simulation.
+
+Team ratings are shipped to each worker once (pool initializer); tasks only
+carry IDs and a seed. Every game or season replica gets its own seed derived
+from the master seed and the task's key, so results do not depend on how many
+workers run or how tasks are split between them.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import simulate_game
+
+DEFAULT_CHUNKSIZE = 64
+
+_worker_state = {}
+
+
+def task_seed(master_seed, *key):
+    """Deterministic 63-bit seed for one task, independent of scheduling; fits Game.seed"""
+    state = np.random.SeedSequence(master_seed, spawn_key=key).generate_state(2, np.uint32)
+    return ((int(state[0]) << 32) | int(state[1])) >> 1
+
+
+def _init_worker(ratings, matchups=None):
+    _worker_state["ratings"] = ratings
+    _worker_state["matchups"] = matchups
+
+
+def _play_game(task):
+    game_id, home_id, away_id, seed = task
+    ratings = _worker_state["ratings"]
+    return simulate_game(ratings[home_id], ratings[away_id], random.Random(seed))
+
+
+def _play_replica(task):
+    """Play every matchup once; returns {team_id: wins}"""
+    replica, seed = task
+    ratings = _worker_state["ratings"]
+    wins = dict.fromkeys(ratings, 0)
+    for game_id, home_id, away_id in _worker_state["matchups"]:
+        result = simulate_game(ratings[home_id], ratings[away_id], random.Random(task_seed(seed, game_id)))
+        wins[home_id if result["home_win"] else away_id] += 1
+    return wins
+
+
+def _run(fn, tasks, ratings, matchups, workers, chunksize):
+    if workers <= 1:
+        _init_worker(ratings, matchups)
+        try:
+            return [fn(task) for task in tasks]
+        finally:
+            _worker_state.clear()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ratings, matchups)) as pool:
+        return list(pool.map(fn, tasks, chunksize=chunksize))
+
+
+def simulate_matchups(matchups, ratings, master_seed, workers=1, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Simulate (game_id, home_id, away_id) matchups across `workers` processes.
+    ratings maps team ID -> TeamRatings. Results come back in input order.
+    """
+    tasks = [(game_id, home, away, task_seed(master_seed, game_id)) for game_id, home, away in matchups]
+    return _run(_play_game, tasks, ratings, None, workers, chunksize)
+
+
+def simulate_replicas(matchups, ratings, master_seed, replicas, workers=1):
+    """
+    Play the same set of matchups `replicas` times (whole-season projections).
+    Returns a (replicas x teams) win matrix and the team IDs for its columns.
+    """
+    tasks = [(r, task_seed(master_seed, r)) for r in range(replicas)]
+    results = _run(_play_replica, tasks, ratings, list(matchups), workers, chunksize=1)
+    team_ids = sorted(ratings)
+    wins = np.array([[result[t] for t in team_ids] for result in results], dtype=np.int32)
+    return wins, team_ids
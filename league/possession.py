@@ -0,0 +1,210 @@
+"""
+Possession-level simulation engine.
+
+Each game is played as individual possessions: a ball handler is picked by
+minutes and usage, then the possession ends in a turnover (maybe a steal),
+or a rim / mid-range / three-point attempt that can be blocked, fouled,
+made (maybe assisted) or missed and rebounded, with offensive rebounds
+starting another chance. Pace comes from team speed, so uptempo rosters get
+more possessions. Every rating in TeamRatings feeds in, including
+post_moves, standing_dunk, speed_with_ball, speed, strength and vertical,
+which the classic engine ignores.
+
+The loop is over chances, not possessions: all possessions still alive are
+resolved together with array operations, so a full game (with overtimes)
+takes a few milliseconds. Takes the same TeamRatings as engine.simulate_game()
+and returns the same result shape.
+"""
+import numpy as np
+
+from .engine import BOX_STATS, COL, rotation
+
+ENGINE_VERSION = 1  # see engine.ENGINE_VERSION
+
+BASE_POSSESSIONS = 70.0  # per team per 40 minutes at average pace
+POSSESSION_SD = 3.0
+OVERTIME_SHARE = 5 / 40
+MAX_OVERTIMES = 5
+MAX_CHANCES = 4  # shots per possession, counting offensive rebounds
+
+RIM, MID, THREE = range(3)
+BASE_SHOT_MIX = np.log([0.42, 0.22, 0.36])
+BASE_MAKE = np.array([0.56, 0.40, 0.345])
+SHOT_POINTS = np.array([2, 2, 3])
+FOUL_CHANCE = np.array([0.14, 0.05, 0.02])
+
+
+def _weights(values, minutes):
+    weights = np.maximum(values, 1.0) * minutes
+    return weights / weights.sum()
+
+
+def _avg(values, minutes):
+    return float(values @ minutes / minutes.sum())
+
+
+def _pick(rng, probabilities, size):
+    """Categorical draws by inverse CDF (rng.choice re-validates p on every call)"""
+    cumulative = np.cumsum(probabilities)
+    return np.minimum(np.searchsorted(cumulative, rng.random(size) * cumulative[-1]), len(probabilities) - 1)
+
+
+class _Side:
+    """One team's rotation and the per-player numbers the possession loop uses"""
+
+    def __init__(self, team, rng):
+        rows, minutes = rotation(team, int(rng.integers(3, 6)))
+        r = team.ratings[rows].astype(np.float64)
+
+        def c(field):
+            return r[:, COL[field]]
+
+        self.team, self.rows, self.minutes = team, rows, minutes
+        self.n = len(rows)
+
+        # offense
+        self.usage = _weights(c("overall") ** 2 + c("speed_with_ball") * 20, minutes)
+        self.security = c("ball_handle") * 0.6 + c("pass_accuracy") * 0.4
+        rim = (
+            c("close_shot") * 0.25 + c("driving_layup") * 0.2 + c("driving_dunk") * 0.15 +
+            c("standing_dunk") * 0.1 + c("post_moves") * 0.15 + c("strength") * 0.05 +
+            c("speed_with_ball") * 0.05 + c("vertical") * 0.05
+        )
+        self.skill = np.stack([rim, c("mid_range_shot"), c("three_point_shot")], axis=1)
+        mix = np.exp(BASE_SHOT_MIX + (self.skill - self.skill.mean(axis=1, keepdims=True)) / 12)
+        self.shot_mix = np.cumsum(mix / mix.sum(axis=1, keepdims=True), axis=1)
+        self.free_throw = np.clip(c("free_throw") / 100 * 0.9 + 0.03, 0.4, 0.95)
+        self.passing = _weights(c("pass_accuracy") * 0.6 + c("ball_handle") * 0.4, minutes)
+        self.assist_rate = float(np.clip(0.5 + (_avg(c("pass_accuracy"), minutes) - 70) / 150, 0.3, 0.7))
+        self.off_rebounding = _weights(c("offensive_rebounding") + c("vertical") * 0.3 + c("strength") * 0.3, minutes)
+        self.off_rebound_strength = _avg(
+            c("offensive_rebounding") + (c("strength") + c("vertical")) * 0.25, minutes
+        )
+
+        # defense
+        self.rim_defense = _avg(c("interior_defense") * 0.8 + c("block") * 0.2, minutes)
+        self.perimeter_defense = _avg(c("perimeter_defense"), minutes)
+        self.steal_rate = _avg(c("steal") * 0.7 + c("speed") * 0.3, minutes)
+        self.stealing = _weights(c("steal"), minutes)
+        self.block_rate = _avg(c("block") + c("vertical") * 0.5, minutes)
+        self.blocking = _weights(c("block") + c("vertical") * 0.3, minutes)
+        self.def_rebounding = _weights(c("defensive_rebounding") + c("strength") * 0.3, minutes)
+        self.def_rebound_strength = _avg(
+            c("defensive_rebounding") + (c("strength") + c("vertical")) * 0.25, minutes
+        )
+        self.pace = _avg(c("speed") * 0.6 + c("speed_with_ball") * 0.4, minutes)
+
+    def totals(self):
+        return {stat: np.zeros(self.n) for stat in BOX_STATS if stat != "minutes"}
+
+
+def _play(offense, defense, possessions, rng, off_box, def_box):
+    """Play `possessions` possessions of offense against defense into the two box score dicts"""
+    n_off, n_def = offense.n, defense.n
+    defense_by_type = np.array([defense.rim_defense, defense.perimeter_defense, defense.perimeter_defense])
+    turnover_chance = np.clip(0.17 - (offense.security - 70) / 600 + (defense.steal_rate - 65) / 700, 0.07, 0.3)
+    steal_share = float(np.clip(0.5 + (defense.steal_rate - 65) / 150, 0.3, 0.7))
+    block_chance = float(np.clip(0.07 + (defense.block_rate - 95) / 500, 0.02, 0.16))
+    off_rebound_chance = float(np.clip(
+        0.3 + (offense.off_rebound_strength - defense.def_rebound_strength) / 150, 0.15, 0.45
+    ))
+
+    handler = _pick(rng, offense.usage, possessions)
+    for _ in range(MAX_CHANCES):
+        k = len(handler)
+        if not k:
+            break
+        u = rng.random((k, 6))
+
+        turnover = u[:, 0] < turnover_chance[handler]
+        off_box["turnovers"] += np.bincount(handler[turnover], minlength=n_off)
+        stolen = turnover & (u[:, 1] < steal_share)
+        def_box["steals"] += np.bincount(_pick(rng, defense.stealing, int(stolen.sum())), minlength=n_def)
+
+        shooter = handler[~turnover]
+        u = u[~turnover]
+        shot = (u[:, 1] > offense.shot_mix[shooter, 0]).astype(np.int64) + (u[:, 1] > offense.shot_mix[shooter, 1])
+
+        blocked = (shot == RIM) & (u[:, 2] < block_chance)
+        def_box["blocks"] += np.bincount(_pick(rng, defense.blocking, int(blocked.sum())), minlength=n_def)
+
+        make_chance = np.clip(
+            BASE_MAKE[shot] + (offense.skill[shooter, shot] - defense_by_type[shot]) / 220, 0.15, 0.85
+        )
+        made = ~blocked & (u[:, 3] < make_chance)
+        fouled = ~blocked & (u[:, 4] < FOUL_CHANCE[shot])
+
+        # and-ones shoot one free throw, missed shots two (three on threes)
+        attempts = np.where(made, 1, SHOT_POINTS[shot]) * fouled
+        free_throws = rng.binomial(attempts, offense.free_throw[shooter])
+        points = SHOT_POINTS[shot] * made + free_throws
+        off_box["points"] += np.bincount(shooter, weights=points, minlength=n_off)
+
+        assisted = made & (u[:, 5] < offense.assist_rate)
+        passer = _pick(rng, offense.passing, int(assisted.sum()))
+        passer = np.where(passer == shooter[assisted], (passer + 1) % n_off, passer)
+        off_box["assists"] += np.bincount(passer, minlength=n_off)
+
+        # a miss without a foul is rebounded; offensive boards keep the possession alive
+        missed = ~made & ~fouled
+        offensive = rng.random(int(missed.sum())) < off_rebound_chance
+        def_box["rebounds"] += np.bincount(
+            _pick(rng, defense.def_rebounding, int((~offensive).sum())), minlength=n_def
+        )
+        rebounder = _pick(rng, offense.off_rebounding, int(offensive.sum()))
+        off_box["rebounds"] += np.bincount(rebounder, minlength=n_off)
+        handler = rebounder
+
+
+def simulate_possessions(home, away, rng=None):
+    """
+    Simulate one game between two TeamRatings possession by possession.
+    rng is a NumPy Generator or seed; a random.Random (or the random module)
+    is accepted too and seeds a Generator. Returns the simulate_game() result
+    plus the number of regulation possessions and overtimes.
+    """
+    if hasattr(rng, "getrandbits"):
+        rng = rng.getrandbits(64)
+    rng = np.random.default_rng(rng)
+
+    sides = (_Side(home, rng), _Side(away, rng))
+    boxes = [side.totals() for side in sides]
+    pace = 1 + ((sides[0].pace + sides[1].pace) / 2 - 75) / 150
+    possessions = max(40, int(round(rng.normal(BASE_POSSESSIONS * pace, POSSESSION_SD))))
+
+    def play(count):
+        _play(sides[0], sides[1], count, rng, boxes[0], boxes[1])
+        _play(sides[1], sides[0], count, rng, boxes[1], boxes[0])
+
+    play(possessions)
+    overtimes = 0
+    while boxes[0]["points"].sum() == boxes[1]["points"].sum() and overtimes < MAX_OVERTIMES:
+        play(max(1, int(round(possessions * OVERTIME_SHARE))))
+        overtimes += 1
+
+    box_scores = []
+    for side, box in zip(sides, boxes):
+        minutes = np.round(side.minutes * (40 + 5 * overtimes) / 40).astype(np.int64).tolist()
+        columns = {stat: box[stat].astype(np.int64).tolist() for stat in box}
+        box_scores.append([
+            {
+                "player_id": int(side.team.player_ids[row]),
+                "name": side.team.names[row],
+                "position": side.team.positions[row],
+                "minutes": minutes[i],
+                **{stat: columns[stat][i] for stat in BOX_STATS if stat != "minutes"},
+            }
+            for i, row in enumerate(side.rows.tolist())
+        ])
+
+    home_score = sum(p["points"] for p in box_scores[0])
+    away_score = sum(p["points"] for p in box_scores[1])
+    return {
+        "home_box": box_scores[0],
+        "away_box": box_scores[1],
+        "home_score": home_score,
+        "away_score": away_score,
+        "home_win": home_score >= away_score,
+        "possessions": possessions,
+        "overtimes": overtimes,
+    }
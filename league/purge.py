@@ -0,0 +1,111 @@
+"""
+Set-based deletes for resetting data.
+
+Every function issues one DELETE per table, dependents first (box scores and
+season totals, standings, Team.players rows, games, teams, players,
+recruiting classes), inside one transaction. No rows are loaded into Python,
+so clearing hundreds of thousands of players takes seconds. Delete signals do
+not fire, so team ratings are recomputed explicitly afterwards.
+
+Each returns {table label: rows deleted}.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q
+
+from backend.db import delete_rows
+from players.models import Player, RecruitingClass
+from . import snapshot
+from .models import Game, League, PlayerGameStat, PlayerSeasonStat, Team, TeamStanding
+from .ratings import recompute_team_ratings
+
+Membership = Team.players.through
+
+PLAYER_ID_CHUNK = 500  # IDs per DELETE ... WHERE player_id IN (...)
+
+
+def _delete_players(players):
+    """Delete a Player queryset and everything hanging off it"""
+    return Counter({
+        "box_scores": delete_rows(PlayerGameStat.objects.filter(player__in=players)),
+        "season_stats": delete_rows(PlayerSeasonStat.objects.filter(player__in=players)),
+        "memberships": delete_rows(Membership.objects.filter(player__in=players)),
+        "players": delete_rows(players),
+    })
+
+
+def reset_all():
+    """Clear every player, membership, game, stat line and recruiting class. Teams and leagues stay."""
+    with transaction.atomic():
+        counts = {
+            "box_scores": delete_rows(PlayerGameStat.objects.all()),
+            "season_stats": delete_rows(PlayerSeasonStat.objects.all()),
+            "standings": delete_rows(TeamStanding.objects.all()),
+            "memberships": delete_rows(Membership.objects.all()),
+            "games": delete_rows(Game.objects.all()),
+            "players": delete_rows(Player.objects.all()),
+            "recruiting_classes": delete_rows(RecruitingClass.objects.all()),
+        }
+        recompute_team_ratings()
+    return counts
+
+
+def delete_all_players():
+    """Delete every player (with box scores, season totals and memberships). Games stay."""
+    with transaction.atomic():
+        counts = {
+            "box_scores": delete_rows(PlayerGameStat.objects.all()),
+            "season_stats": delete_rows(PlayerSeasonStat.objects.all()),
+            "memberships": delete_rows(Membership.objects.all()),
+            "players": delete_rows(Player.objects.all()),
+        }
+        recompute_team_ratings()
+    return counts
+
+
+def delete_recruiting_class(class_id):
+    """Delete a recruiting class and its players; rosters they were on are re-rated"""
+    with transaction.atomic():
+        team_ids = list(
+            Membership.objects.filter(player__recruiting_class_id=class_id)
+            .values_list("team_id", flat=True).distinct()
+        )
+        counts = _delete_players(Player.objects.filter(recruiting_class_id=class_id))
+        counts["recruiting_classes"] = delete_rows(RecruitingClass.objects.filter(id=class_id))
+        recompute_team_ratings(team_ids)
+    return dict(counts)
+
+
+def delete_league(league_id):
+    """
+    Delete a league with its games, stats, standings and teams. Games stored
+    under another league that involve one of its teams (cross-league
+    simulate calls) and standings kept for its teams elsewhere go as well,
+    as Team's cascade would. Players who were only on this league's teams go
+    too; conferences are kept since other leagues may share them.
+    """
+    teams = Team.objects.filter(league_id=league_id).values("id")
+    games = Game.objects.filter(Q(league_id=league_id) | Q(home_team__in=teams) | Q(away_team__in=teams))
+    with transaction.atomic():
+        # collected before memberships go; a player on another league's team survives
+        player_ids = list(
+            Membership.objects.filter(team__league_id=league_id)
+            .exclude(player__in=Membership.objects.exclude(team__league_id=league_id).values("player_id"))
+            .values_list("player_id", flat=True).distinct()
+        )
+        counts = Counter({
+            "box_scores": delete_rows(PlayerGameStat.objects.filter(game__in=games)),
+            "season_stats": delete_rows(PlayerSeasonStat.objects.filter(league_id=league_id)),
+            "standings": delete_rows(TeamStanding.objects.filter(Q(league_id=league_id) | Q(team__in=teams))),
+            "memberships": delete_rows(Membership.objects.filter(team__league_id=league_id)),
+            "games": delete_rows(games),
+            "teams": delete_rows(Team.objects.filter(league_id=league_id)),
+        })
+        for start in range(0, len(player_ids), PLAYER_ID_CHUNK):
+            counts.update(_delete_players(Player.objects.filter(id__in=player_ids[start:start + PLAYER_ID_CHUNK])))
+
+        delete_rows(League.conferences.through.objects.filter(league_id=league_id))
+        counts["leagues"] = delete_rows(League.objects.filter(id=league_id))
+    snapshot.invalidate([league_id])
+    return dict(counts)
@@ -0,0 +1,73 @@
+"""
+Denormalized team ratings (Team.overall / offense / defense).
+
+The sums mirror engine.team_off_def(); overall is the roster's average
+player overall, truncated. Every recompute also bumps Team.roster_version,
+which keys the simulation result cache (league.simcache) and the league
+snapshots (league.snapshot).
+"""
+from django.db.models import Count, F, Sum
+
+from backend.db import update_rows
+
+from . import snapshot
+from .engine import DEFENSE_FIELDS, OFFENSE_FIELDS
+from .models import DEFAULT_TEAM_OVERALL, Team
+
+
+def _summed(fields):
+    expr = F(f"players__{fields[0]}")
+    for field in fields[1:]:
+        expr = expr + F(f"players__{field}")
+    return Sum(expr)
+
+
+def _rating_rows(team_ids=None):
+    """(team_id, league_id, (overall, offense, defense)) straight from the players table"""
+    teams = Team.objects.all() if team_ids is None else Team.objects.filter(id__in=team_ids)
+    rows = teams.annotate(
+        player_count=Count("players"),
+        overall_sum=Sum("players__overall"),
+        offense_sum=_summed(OFFENSE_FIELDS),
+        defense_sum=_summed(DEFENSE_FIELDS),
+    ).values_list("id", "league_id", "player_count", "overall_sum", "offense_sum", "defense_sum")
+
+    return [
+        (
+            team_id,
+            league_id,
+            (overall_sum // count if count else DEFAULT_TEAM_OVERALL, offense_sum or 0, defense_sum or 0),
+        )
+        for team_id, league_id, count, overall_sum, offense_sum, defense_sum in rows
+    ]
+
+
+def compute_team_ratings(team_ids=None):
+    """{team_id: (overall, offense, defense)} straight from the players table"""
+    return {team_id: values for team_id, _, values in _rating_rows(team_ids)}
+
+
+def recompute_team_ratings(team_ids=None):
+    """
+    Recompute and store ratings for the given teams (all teams by default),
+    bump their roster_version and drop their leagues' snapshots
+    """
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        if not team_ids:
+            return 0
+    rows = _rating_rows(team_ids)
+    update_rows(
+        Team,
+        ["overall", "offense", "defense"],
+        (values + (team_id,) for team_id, _, values in rows),
+        bump=["roster_version"],
+    )
+    snapshot.invalidate(None if team_ids is None else {league_id for _, league_id, _ in rows})
+    return len(rows)
+
+
+def player_team_ids(player_ids):
+    return set(
+        Team.players.through.objects.filter(player_id__in=player_ids).values_list("team_id", flat=True)
+    )
@@ -0,0 +1,181 @@
+"""
+Recruiting: sign the players of a recruiting class to a league's teams.
+
+Needs: every team aims for an even split of `roster_size` across POSITIONS
+(extra spots go to the guards first) and has an opening at each position
+where its roster is below that target.
+
+Preferences: recruits rank teams by prestige (Team.overall), a bonus for a
+team in their home state and Gumbel noise (seeded). Teams rank recruits by
+their recruiting score (overall, plus half the room left to potential) with
+a smaller home-state bonus; ties go to the higher ranked recruit.
+
+Matching is recruit-proposing deferred acceptance (Gale-Shapley with
+capacities), run separately per position: each free recruit proposes to
+its next team, and each team keeps its best offers in a min-heap of the
+size of its opening, bumping the worst when full. The result is stable:
+no recruit and team would both rather have each other than what they got.
+
+Teams rank recruits almost the same way, so at a position with C openings
+any recruit whose score plus the state bonus is below the C-th best score
+goes unsigned in every stable matching; those are dropped before the
+preference matrix is built, which keeps it to about C rows.
+"""
+import heapq
+import time
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count
+
+from backend.db import insert_rows
+from players.utils import POSITIONS
+from .models import Team
+from .ratings import recompute_team_ratings
+
+POTENTIAL_WEIGHT = 0.5
+RECRUIT_STATE_AFFINITY = 5.0  # team overall points a recruit gives up to stay home
+TEAM_STATE_AFFINITY = 3.0  # recruiting score points a team gives up for a local recruit
+PREFERENCE_NOISE = 2.0
+
+Membership = Team.players.through
+
+
+def position_targets(roster_size):
+    """{position: players wanted} splitting roster_size evenly, extras to the first positions"""
+    base, extra = divmod(roster_size, len(POSITIONS))
+    return {position: base + (i < extra) for i, position in enumerate(POSITIONS)}
+
+
+def team_needs(league, roster_size):
+    """(team_ids, {position: open spots per team}) for every team of the league, in ID order"""
+    team_ids = list(league.teams.order_by("id").values_list("id", flat=True))
+    index = {team_id: i for i, team_id in enumerate(team_ids)}
+    targets = position_targets(roster_size)
+    needs = {position: np.full(len(team_ids), target, dtype=np.int64) for position, target in targets.items()}
+    counts = (
+        Membership.objects.filter(team__league=league, player__position__in=POSITIONS)
+        .values_list("team_id", "player__position")
+        .annotate(players=Count("id"))
+    )
+    for team_id, position, players in counts:
+        needs[position][index[team_id]] -= players
+    return team_ids, {position: np.maximum(need, 0) for position, need in needs.items()}
+
+
+def recruiting_scores(overall, potential):
+    return overall + np.maximum(potential - overall, 0) * POTENTIAL_WEIGHT
+
+
+def deferred_acceptance(preferences, priority, capacity):
+    """
+    Recruit-proposing deferred acceptance.
+    preferences is an (n, k) array of team columns in each recruit's order,
+    priority[r, t] team t's ranking of recruit r (higher is better, ties go to
+    the lower r) and capacity[t] its openings. Each team tracks its weakest
+    held offer once full, so a recruit skips every team that would reject
+    them with one array comparison, and only accepted proposals touch the heaps.
+    Returns the team column each recruit signed with, or -1.
+    """
+    n, k = preferences.shape
+    ordered = np.take_along_axis(priority, preferences, axis=1)  # priorities in proposal order
+    held = [[] for _ in range(k)]  # per team, a min-heap of (priority, -recruit)
+    worst = np.where(np.asarray(capacity) > 0, -np.inf, np.inf)  # teams without openings start full
+    worst_recruit = np.full(k, n)
+    proposals = np.zeros(n, dtype=np.int64)
+    free = list(range(n))[::-1]  # best ranked recruits propose first
+    while free:
+        r = free.pop()
+        start = proposals[r]
+        teams, offers = preferences[r, start:], ordered[r, start:]
+        accepting = (offers > worst[teams]) | ((offers == worst[teams]) & (r < worst_recruit[teams]))
+        if not accepting.any():
+            proposals[r] = k
+            continue
+        i = int(accepting.argmax())
+        t = int(teams[i])
+        proposals[r] = start + i + 1
+        if len(held[t]) < capacity[t]:
+            heapq.heappush(held[t], (offers[i], -r))
+        else:
+            free.append(-heapq.heapreplace(held[t], (offers[i], -r))[1])  # the bumped recruit proposes on
+        if len(held[t]) == capacity[t]:
+            worst[t], worst_recruit[t] = held[t][0][0], -held[t][0][1]
+
+    signed = np.full(n, -1)
+    for t, offers in enumerate(held):
+        for _, r in offers:
+            signed[-r] = t
+    return signed
+
+
+def recruit_class(league, recruiting_class, roster_size=15, rng=None):
+    """
+    Sign players of a recruiting class (those not already on one of the
+    league's teams) to the league's teams, one stable matching per position.
+    Memberships are written with one executemany() and team ratings are
+    recomputed, in one transaction. Returns stats, including
+    {team_id: [player_id, ...]} under "signings".
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(rng)
+    team_ids, needs = team_needs(league, roster_size)
+    teams = Team.objects.filter(id__in=team_ids).order_by("id").values_list("overall", "state")
+    prestige = np.array([overall for overall, _ in teams], dtype=np.float64)
+    team_states = [state for _, state in teams]
+
+    rostered = Membership.objects.filter(team__league=league).values("player_id")
+    rows = list(
+        recruiting_class.players.filter(position__in=POSITIONS).exclude(id__in=rostered)
+        .order_by("id").values_list("id", "position", "overall", "potential", "state")
+    )
+    ids, positions, overall, potential, states = (
+        [np.array(column) for column in zip(*rows)] if rows else [np.array([])] * 5
+    )
+    # states as integer codes; teams without a state get one no recruit has
+    state_codes = {state: i for i, state in enumerate(sorted(set(states.tolist())))}
+    states = np.array([state_codes[state] for state in states.tolist()], dtype=np.int64)
+    team_states = np.array([state_codes.get(state, -1) for state in team_states], dtype=np.int64)
+    scores = recruiting_scores(overall.astype(np.float64), potential.astype(np.float64))
+
+    signings = {}
+    for position in POSITIONS:
+        openings = np.flatnonzero(needs[position])
+        capacity = needs[position][openings]
+        candidates = np.flatnonzero(positions == position)
+        if not len(openings) or not len(candidates):
+            continue
+        # best ranked first, without the recruits that cannot sign (see the module docstring)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        cutoff = scores[candidates[min(capacity.sum(), len(candidates)) - 1]]
+        candidates = candidates[scores[candidates] + TEAM_STATE_AFFINITY >= cutoff]
+
+        local = states[candidates][:, None] == team_states[openings][None, :]
+        utility = (
+            prestige[openings][None, :] + RECRUIT_STATE_AFFINITY * local
+            + rng.gumbel(scale=PREFERENCE_NOISE, size=local.shape)
+        )
+        priority = scores[candidates][:, None] + TEAM_STATE_AFFINITY * local
+        signed = deferred_acceptance(np.argsort(-utility, axis=1), priority, capacity)
+        for r, t in enumerate(signed.tolist()):
+            if t >= 0:
+                signings.setdefault(team_ids[openings[t]], []).append(int(ids[candidates[r]]))
+
+    with transaction.atomic():
+        insert_rows(
+            Membership, ["team_id", "player_id"],
+            ((team_id, player_id) for team_id, players in signings.items() for player_id in players),
+        )
+        # insert_rows() skips the m2m_changed hook
+        recompute_team_ratings(signings)
+
+    signed = sum(len(players) for players in signings.values())
+    elapsed = time.perf_counter() - started
+    return {
+        "signed": signed,
+        "unsigned": len(rows) - signed,
+        "teams": len(signings),
+        "open_spots": int(sum(need.sum() for need in needs.values())) - signed,
+        "elapsed_seconds": round(elapsed, 4),
+        "signings": {team_id: sorted(players) for team_id, players in sorted(signings.items())},
+    }
@@ -0,0 +1,80 @@
+"""
+Season schedule generation.
+
+Pure functions over team IDs; league.season turns the output into Game rows.
+"""
+import random
+
+
+def round_robin(team_ids):
+    """
+    Single round robin by the circle method.
+    Returns a list of rounds, each a list of (home, away) pairs. With an odd
+    number of teams one team sits out each round.
+    """
+    teams = list(team_ids)
+    if len(teams) < 2:
+        return []
+    if len(teams) % 2:
+        teams.append(None)  # bye
+
+    n = len(teams)
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            a, b = teams[i], teams[n - 1 - i]
+            if a is None or b is None:
+                continue
+            # alternate home court so nobody is home every week
+            pairs.append((a, b) if (r + i) % 2 == 0 else (b, a))
+        rounds.append(pairs)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def non_conference_round(conference_of, played, rng):
+    """
+    Pair every team with an opponent from another conference where possible,
+    avoiding repeat matchups. One team gets a bye when the count is odd.
+    """
+    pool = list(conference_of)
+    rng.shuffle(pool)
+    pairs = []
+    while len(pool) > 1:
+        team = pool.pop()
+        candidates = [t for t in pool if frozenset((team, t)) not in played]
+        opponent = next((t for t in candidates if conference_of[t] != conference_of[team]), None)
+        if opponent is None:
+            opponent = candidates[0] if candidates else pool[0]
+        pool.remove(opponent)
+        played.add(frozenset((team, opponent)))
+        pairs.append((team, opponent) if rng.random() < 0.5 else (opponent, team))
+    return pairs
+
+
+def build_schedule(conference_of, non_conference_games=0, rng=random):
+    """
+    Full season schedule as a list of (week, home_id, away_id).
+
+    conference_of maps team ID -> conference ID (None for independents, who
+    play each other as if they were a conference). Non-conference weeks come
+    first, then a single round robin inside every conference, with all
+    conferences playing the same week in parallel.
+    """
+    schedule = []
+    played = set()
+    for week in range(1, non_conference_games + 1):
+        schedule += [(week, home, away) for home, away in non_conference_round(conference_of, played, rng)]
+
+    members = {}
+    for team, conference in conference_of.items():
+        members.setdefault(conference, []).append(team)
+
+    for teams in members.values():
+        for r, pairs in enumerate(round_robin(sorted(teams))):
+            week = non_conference_games + r + 1
+            schedule += [(week, home, away) for home, away in pairs]
+
+    schedule.sort(key=lambda game: game[0])
+    return schedule
@@ -0,0 +1,176 @@
+"""
+Season orchestration: turning a schedule into Game rows and playing them in bulk.
+"""
+import random
+import secrets
+
+from django.db import transaction
+
+from backend.commitqueue import CommitQueue
+from backend.db import update_rows
+from backend.timing import timed
+
+from . import simcache
+from .engine import ENGINE_VERSION, simulate_game, team_ratings
+from .models import Game
+from .parallel import simulate_matchups, simulate_replicas, task_seed
+from .possession import ENGINE_VERSION as POSSESSION_ENGINE_VERSION, simulate_possessions
+from .schedule import build_schedule
+from .snapshot import snapshot_ratings
+from .standings import update_standings
+from .stats import record_box_scores
+
+# engines selectable with `mode`; both take (home, away, rng) and return the same result shape
+SIMULATION_MODES = {
+    "classic": simulate_game,
+    "possession": simulate_possessions,
+}
+ENGINE_VERSIONS = {
+    "classic": ENGINE_VERSION,
+    "possession": POSSESSION_ENGINE_VERSION,
+}
+
+
+def create_schedule(league, non_conference_games=0, rng=random):
+    """Generate the league's schedule and bulk_create it as unplayed Game rows"""
+    conference_of = dict(league.teams.values_list("id", "conference_id"))
+    schedule = build_schedule(conference_of, non_conference_games, rng)
+    return Game.objects.bulk_create(
+        [
+            Game(league=league, season=league.season, week=week, home_team_id=home, away_team_id=away)
+            for week, home, away in schedule
+        ],
+        batch_size=1000,
+    )
+
+
+def unplayed_games(league):
+    """Scheduled games of the league's current season without a result, in week order"""
+    return league.games.filter(season=league.season, winner__isnull=True).order_by("week", "id")
+
+
+def ratings_for(team):
+    """TeamRatings for a Team whose players are loaded, using its stored offense/defense"""
+    return team_ratings(team.players.all(), offense=team.offense, defense=team.defense)
+
+
+def load_ratings(team_ids):
+    """
+    TeamRatings for every team ID, read from the league snapshots (one query
+    while they are current). Raises ValueError if any of the teams has no players.
+    """
+    ratings = snapshot_ratings(team_ids)
+    empty = sorted(team_id for team_id, team in ratings.items() if not len(team.player_ids))
+    if empty:
+        raise ValueError(f"Teams without players: {empty}")
+    return ratings
+
+
+def new_seed():
+    return secrets.randbits(63)
+
+
+def simulate_seeded(home_team, away_team, mode="classic", seed=None):
+    """
+    Play one game between two Team rows on its own generator,
+    random.Random(seed), drawing a fresh seed when none is given.
+    Results are memoized by (roster versions, engine version, seed), so
+    rosters are only loaded on a cache miss. Returns (result, seed, cached).
+    Raises ValueError if a team has no players.
+    """
+    if seed is None:
+        seed = new_seed()
+    key = simcache.result_key(home_team, away_team, mode, ENGINE_VERSIONS[mode], seed)
+    result = simcache.results.get(key)
+    if result is not None:
+        return result, seed, True
+
+    ratings = load_ratings([home_team.id, away_team.id])
+    with timed("sim"):
+        result = SIMULATION_MODES[mode](ratings[home_team.id], ratings[away_team.id], random.Random(seed))
+    simcache.results.set(key, result)
+    return result, seed, False
+
+
+def _save_simulated_games(items):
+    """CommitQueue handler: items are (Game field dict, engine result); returns the saved Games"""
+    games = Game.objects.bulk_create([Game(**fields) for fields, _ in items])
+    record_results(games, [result for _, result in items])
+    return games
+
+
+_game_writer = CommitQueue(_save_simulated_games, name="game-writer")
+
+
+def save_simulated_game(result, **fields):
+    """
+    Save one ad-hoc game (Game fields as keywords) with its box score,
+    standings and season totals. Concurrent callers are committed together
+    by one writer thread; see backend.commitqueue.
+    """
+    return _game_writer.submit((fields, result))
+
+
+def play_games(games, rng=random, seed=None, workers=1):
+    """
+    Simulate already-scheduled Game rows and save their results and box
+    scores in one transaction. Returns the engine result for each game, in order.
+
+    Every game is played with the classic engine on its own generator,
+    seeded from (seed, game ID) and spread over `workers` processes; the same
+    seed gives the same results for any worker count. Without a seed, one is
+    drawn from `rng`. The per-game seed and mode are stored on the Game, so
+    GameViewSet.replay can re-run it.
+    Raises ValueError if a game was already played or a team has no players.
+    """
+    games = list(games)
+    if any(g.winner_id is not None for g in games):
+        raise ValueError("Games have already been played")
+    ratings = load_ratings([g.home_team_id for g in games] + [g.away_team_id for g in games])
+
+    if seed is None:
+        seed = rng.getrandbits(63)
+    matchups = [(g.id, g.home_team_id, g.away_team_id) for g in games]
+    with timed("sim"):
+        results = simulate_matchups(matchups, ratings, seed, workers=workers)
+
+    for game, result in zip(games, results):
+        game.home_score = result["home_score"]
+        game.away_score = result["away_score"]
+        game.winner_id = game.home_team_id if result["home_win"] else game.away_team_id
+        game.mode = "classic"
+        game.seed = task_seed(seed, game.id)
+
+    with transaction.atomic():
+        save_results(games)
+        record_results(games, results)
+    return results
+
+
+def record_results(games, results):
+    """Everything derived from finished games: box scores, season totals and standings"""
+    record_box_scores(games, results)
+    update_standings(games)
+
+
+def project_season(league, replicas, seed, workers=1):
+    """
+    Expected final wins per team from `replicas` simulations of the remaining
+    schedule. Nothing is written.
+    """
+    games = list(unplayed_games(league))
+    ratings = load_ratings(league.teams.values_list("id", flat=True))
+
+    matchups = [(g.id, g.home_team_id, g.away_team_id) for g in games]
+    with timed("sim"):
+        wins, team_ids = simulate_replicas(matchups, ratings, seed, replicas, workers=workers)
+    return team_ids, wins
+
+
+def save_results(games):
+    """Write scores, winners, modes and seeds for many games in one statement batch"""
+    update_rows(
+        Game,
+        ["home_score", "away_score", "winner_id", "mode", "seed"],
+        ((g.home_score, g.away_score, g.winner_id, g.mode, g.seed, g.id) for g in games),
+    )
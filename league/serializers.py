@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import League, Conference, Team, Game
-from players.serializers import PlayerSerializer
+from players.serializers import DynamicFieldsMixin, PlayerSerializer, TimedListSerializer
 
 
 class ConferenceSerializer(serializers.ModelSerializer):
@@ -9,27 +9,55 @@ class ConferenceSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    resource_name = "team"
+    nested_fields = ("players",)
     players = PlayerSerializer(many=True, read_only=True)
 
     class Meta:
         model = Team
-        fields = ["id", "name", "overall", "players", "conference", "league"]
+        fields = ["id", "name", "state", "overall", "offense", "defense", "players", "conference", "league"]
+        read_only_fields = ["overall", "offense", "defense"]
+        list_serializer_class = TimedListSerializer
 
 
-class LeagueSerializer(serializers.ModelSerializer):
+class LeagueSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    resource_name = "league"
+    nested_fields = ("teams",)
     teams = TeamSerializer(many=True, read_only=True)
 
     class Meta:
         model = League
-        fields = ["id", "name", "conferences", "teams"]
+        fields = ["id", "name", "season", "conferences", "teams"]
+        read_only_fields = ["season"]
+        list_serializer_class = TimedListSerializer
 
 
-class GameSerializer(serializers.ModelSerializer):
+class GameSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    resource_name = "game"
+    nested_fields = ("home_team", "away_team", "winner")
     home_team = TeamSerializer(read_only=True)
     away_team = TeamSerializer(read_only=True)
     winner = TeamSerializer(read_only=True)
 
     class Meta:
         model = Game
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+        list_serializer_class = TimedListSerializer
+
+
+class GameListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact game row for schedules and listings: team IDs and names, no rosters"""
+    resource_name = "game"
+    home_team_name = serializers.CharField(source="home_team.name", read_only=True)
+    away_team_name = serializers.CharField(source="away_team.name", read_only=True)
+    winner_name = serializers.CharField(source="winner.name", read_only=True, default=None)
+
+    class Meta:
+        model = Game
+        fields = [
+            "id", "league", "week",
+            "home_team", "home_team_name", "away_team", "away_team_name",
+            "home_score", "away_score", "winner", "winner_name",
+        ]
+        list_serializer_class = TimedListSerializer
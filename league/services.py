@@ -0,0 +1,147 @@
+import json
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+
+from backend.db import update_rows
+from players.models import Player
+from players.services import DEFAULT_CHUNK_SIZE, build_players
+from players.utils import (
+    POSITIONS, STAT_FIELDS, US_STATES, compute_overall, compute_specialization, generate_player_columns,
+    position_codes, progress_stats,
+)
+from .models import Conference, League, Team
+from .ratings import recompute_team_ratings
+
+
+def resolve_conferences(league, conferences=None):
+    """
+    Conferences to spread new teams across.
+    conferences may be None (the league's existing conferences), a number of
+    conferences to create, or a list of conference names (created if missing).
+    """
+    if conferences is None:
+        return list(league.conferences.order_by("id"))
+
+    if isinstance(conferences, int):
+        existing = league.conferences.count()
+        names = [f"Conference {existing + i + 1}" for i in range(conferences)]
+    else:
+        names = [str(name) for name in conferences]
+
+    by_name = {c.name: c for c in league.conferences.filter(name__in=names)}
+    missing = [Conference(name=name) for name in names if name not in by_name]
+    for conf in Conference.objects.bulk_create(missing):
+        by_name[conf.name] = conf
+    league.conferences.add(*by_name.values())
+    return [by_name[name] for name in names]
+
+
+def populate_league(league, num_teams=4, roster_size=15, conferences=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    Create num_teams teams with roster_size generated players each.
+    Teams are assigned round-robin to the resolved conferences and get a
+    random home state. Teams, players and Team.players memberships are written
+    with bulk_create in one transaction.
+    """
+    rng = np.random.default_rng(rng)
+    # not tied to a recruiting class
+    columns = generate_player_columns(num_teams * roster_size, rng=rng)
+    states = rng.choice(US_STATES, size=num_teams).tolist()
+
+    with transaction.atomic():
+        confs = resolve_conferences(league, conferences)
+        first = league.teams.count() + 1
+
+        teams = Team.objects.bulk_create([
+            Team(
+                name=f"Team {first + i}",
+                league=league,
+                conference=confs[i % len(confs)] if confs else None,
+                state=states[i],
+            )
+            for i in range(num_teams)
+        ])
+
+        players = []
+        for start in range(0, num_teams * roster_size, chunk_size):
+            players += Player.objects.bulk_create(
+                build_players(columns, start, start + chunk_size), batch_size=chunk_size
+            )
+
+        Membership = Team.players.through
+        Membership.objects.bulk_create(
+            [
+                Membership(team_id=team.id, player_id=player.id)
+                for i, team in enumerate(teams)
+                for player in players[i * roster_size:(i + 1) * roster_size]
+            ],
+            batch_size=chunk_size,
+        )
+        # bulk_create skips the m2m_changed hooks
+        recompute_team_ratings([team.id for team in teams])
+
+    return teams
+
+
+def advance_season(league):
+    """Move the league on to its next season; games created from now on are tagged with it"""
+    League.objects.filter(id=league.id).update(season=F("season") + 1)
+    league.refresh_from_db(fields=["season"])
+    return league.season
+
+
+def progress_league(league, chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    Offseason development for every player rostered in the league (see
+    players.utils.progress_stats). Ratings are read with one values_list(),
+    progressed as one matrix, and the changed players written back in chunks
+    of `chunk_size` with update_rows(), inside one transaction. Players with
+    a position outside STAT_RANGES are left as they are. Team ratings of
+    every team the players are on are recomputed afterwards, and the league
+    moves on to its next season (advance_season).
+    """
+    Membership = Team.players.through
+    rostered = Membership.objects.filter(team__league=league).values("player_id")
+    rows = list(
+        Player.objects.filter(id__in=rostered, position__in=POSITIONS)
+        .order_by("id")
+        .values_list("id", "position", *STAT_FIELDS)
+    )
+    if not rows:
+        return {"season": advance_season(league), "players": 0, "improved": 0, "overall_gain": 0.0}
+
+    ids, positions, *columns = zip(*rows)
+    before = np.array(columns, dtype=np.int64).T
+    after = progress_stats(before, position_codes(positions), rng=rng)
+    overall_before = compute_overall(before)
+    overall = compute_overall(after)
+    specialization = compute_specialization(after).tolist()
+
+    changed = np.flatnonzero((after != before).any(axis=1)).tolist()
+    ids = list(ids)
+    after_rows = after.tolist()
+    overall_rows = overall.tolist()
+    updates = [
+        (*after_rows[i], overall_rows[i], json.dumps(specialization[i]), ids[i])
+        for i in changed
+    ]
+
+    with transaction.atomic():
+        for start in range(0, len(updates), chunk_size):
+            update_rows(Player, [*STAT_FIELDS, "overall", "specialization"], updates[start:start + chunk_size])
+        if updates:
+            # update_rows() skips the post_save hook; players can be on teams in other leagues too
+            recompute_team_ratings(
+                Membership.objects.filter(player_id__in=rostered).values_list("team_id", flat=True).distinct()
+            )
+        advance_season(league)
+
+    return {
+        "season": league.season,
+        "players": len(ids),
+        "improved": int((overall > overall_before).sum()),
+        "overall_gain": round(float((overall - overall_before).mean()), 2),
+    }
@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from players.models import Player
+from .models import Team
+from .ratings import player_team_ids, recompute_team_ratings
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+def roster_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Team ratings current when rosters change through the ORM"""
+    if reverse and action == "pre_clear":
+        # player.teams.clear(): remember the teams before the rows disappear
+        instance._cleared_team_ids = player_team_ids([instance.pk])
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        recompute_team_ratings([instance.pk])
+    elif action == "post_clear":
+        recompute_team_ratings(instance.__dict__.pop("_cleared_team_ids", ()))
+    else:
+        recompute_team_ratings(pk_set)
+
+
+@receiver(post_save, sender=Player)
+def player_saved(sender, instance, created, raw=False, **kwargs):
+    """A rating change on a rostered player changes their teams' ratings"""
+    if created or raw:
+        return
+    recompute_team_ratings(player_team_ids([instance.pk]))
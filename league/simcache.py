@@ -0,0 +1,68 @@
+"""
+Memoized results for single seeded simulations.
+
+A seeded game is a pure function of the two rosters, the engine and the
+seed, so repeated what-if requests can reuse the first result. Keys carry
+each team's roster_version, which league.ratings bumps on every roster or
+rating change, and the engine version, so a stale entry is never hit; it
+just ages out of the LRU.
+
+The cache is per process and bounded by settings.SIMULATION_CACHE_SIZE.
+Cached results are shared between callers and must not be mutated.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+DEFAULT_CACHE_SIZE = 512
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used key beyond maxsize"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+results = LRUCache(getattr(settings, "SIMULATION_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+
+
+def result_key(home_team, away_team, mode, engine_version, seed):
+    return (
+        home_team.id, home_team.roster_version,
+        away_team.id, away_team.roster_version,
+        mode, engine_version, seed,
+    )
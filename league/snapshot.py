@@ -0,0 +1,261 @@
+"""
+Memory-mapped league snapshots for the simulation code.
+
+Engines only need about 20 small integers per player, yet loading rosters
+through the ORM builds a full Player instance for every one of them. A
+snapshot stores a whole league in one binary file instead:
+
+    magic (8 bytes) | header length (uint64) | JSON header | arrays
+
+and the arrays, each 64-byte aligned, are:
+
+    team_ids, roster_versions, offense, defense   one entry per team (int64)
+    offsets        team i's players are rows offsets[i]:offsets[i + 1] (int64)
+    player_ids     one entry per roster row (int64)
+    positions      index into header["positions"] (uint8)
+    ratings        roster rows x engine.RATING_FIELDS (uint8)
+    name_offsets, names   UTF-8 player names (int64 offsets, uint8 bytes)
+
+Files are opened with np.memmap, so TeamRatings built from a snapshot are
+views into the page cache: nothing is copied, and every process that maps
+the same file shares the same memory.
+
+A snapshot is named after its league and a digest of the league's team IDs
+and roster versions. Loading costs one query for those; a changed roster
+gives a new digest, and the snapshot is rebuilt on demand. Rating recomputes
+(every roster or player change, see league.ratings) also delete the stale
+files through invalidate().
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from itertools import groupby
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from .engine import RATING_FIELDS, TeamRatings
+from .models import Team
+
+MAGIC = b"LGSNAP1\n"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+_open = {}  # league_id -> LeagueSnapshot mapped by this process
+_lock = threading.Lock()
+
+
+def snapshot_dir():
+    path = getattr(settings, "LEAGUE_SNAPSHOT_DIR", None)
+    return Path(path) if path else Path(tempfile.gettempdir()) / "league-snapshots"
+
+
+def _padded(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def _digest(teams):
+    """teams: (team_id, roster_version) pairs in ID order"""
+    payload = json.dumps([str(connection.settings_dict["NAME"]), FORMAT_VERSION, list(teams)])
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _path(league_id, digest):
+    return snapshot_dir() / f"league-{league_id}-{digest}.snap"
+
+
+class LeagueSnapshot:
+    """Read-only view of one snapshot file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a league snapshot")
+            (length,) = struct.unpack("<Q", f.read(8))
+            self.header = json.loads(f.read(length))
+        if self.header["fields"] != list(RATING_FIELDS):
+            raise ValueError(f"{self.path} was built for different rating fields")
+
+        self._buffer = np.memmap(self.path, dtype=np.uint8, mode="r")
+        data_start = _padded(len(MAGIC) + 8 + length)
+        for name, (dtype, shape, offset) in self.header["arrays"].items():
+            offset += data_start
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            setattr(self, name, self._buffer[offset:offset + size].view(dtype).reshape(shape))
+
+        self.league_id = self.header["league_id"]
+        self.digest = self.header["digest"]
+        self.position_names = self.header["positions"]
+        self._rows = {team_id: i for i, team_id in enumerate(self.team_ids.tolist())}
+
+    def __reduce__(self):
+        # other processes map the same file rather than receiving a copy
+        return LeagueSnapshot, (str(self.path),)
+
+    def __contains__(self, team_id):
+        return team_id in self._rows
+
+    def team(self, team_id):
+        """TeamRatings for one team; ratings and player_ids are views into the file"""
+        i = self._rows[team_id]
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        name_offsets = self.name_offsets[start:end + 1].tolist()
+        names = bytes(self.names[name_offsets[0]:name_offsets[-1]])
+        base = name_offsets[0]
+        return TeamRatings(
+            player_ids=self.player_ids[start:end],
+            names=[names[a - base:b - base].decode() for a, b in zip(name_offsets, name_offsets[1:])],
+            positions=[self.position_names[code] for code in self.positions[start:end].tolist()],
+            ratings=self.ratings[start:end],
+            offense=int(self.offense[i]),
+            defense=int(self.defense[i]),
+        )
+
+
+def write_snapshot(path, league_id, digest, teams, rows):
+    """
+    Write a snapshot file atomically (temp file + rename).
+    teams: (team_id, roster_version, offense, defense) in ID order;
+    rows: (team_id, player_id, name, position, *RATING_FIELDS) ordered by team.
+    """
+    counts = dict.fromkeys((t[0] for t in teams), 0)
+    for row in rows:
+        counts[row[0]] += 1
+
+    ratings = np.array([row[4:] for row in rows], dtype=np.int64).reshape(len(rows), len(RATING_FIELDS))
+    if ratings.size and (ratings.min() < 0 or ratings.max() > 255):
+        raise ValueError("Ratings must fit in 0-255 to be snapshotted")
+    encoded = [row[2].encode() for row in rows]
+    position_names = sorted({row[3] for row in rows})
+    position_codes = {name: i for i, name in enumerate(position_names)}
+
+    arrays = {
+        "team_ids": np.array([t[0] for t in teams], dtype=np.int64),
+        "roster_versions": np.array([t[1] for t in teams], dtype=np.int64),
+        "offense": np.array([t[2] for t in teams], dtype=np.int64),
+        "defense": np.array([t[3] for t in teams], dtype=np.int64),
+        "offsets": np.concatenate([[0], np.cumsum([counts[t[0]] for t in teams])]).astype(np.int64),
+        "player_ids": np.array([row[1] for row in rows], dtype=np.int64),
+        "positions": np.array([position_codes[row[3]] for row in rows], dtype=np.uint8),
+        "ratings": ratings.astype(np.uint8),
+        "name_offsets": np.concatenate([[0], np.cumsum([len(b) for b in encoded])]).astype(np.int64),
+        "names": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+    header = {
+        "format": FORMAT_VERSION,
+        "league_id": league_id,
+        "digest": digest,
+        "fields": list(RATING_FIELDS),
+        "positions": position_names,
+        "arrays": {},
+    }
+    offset = 0  # relative to the start of the data, which follows the padded header
+    for name, array in arrays.items():
+        header["arrays"][name] = [array.dtype.str, list(array.shape), offset]
+        offset = _padded(offset + array.nbytes)
+    encoded_header = json.dumps(header).encode()
+    data_start = _padded(len(MAGIC) + 8 + len(encoded_header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(encoded_header)) + encoded_header)
+            for name, array in arrays.items():
+                f.seek(data_start + header["arrays"][name][2])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def build_snapshot(league_id, teams, digest):
+    """Read a league's rosters (one query, no model instances) and write its snapshot"""
+    rows = list(
+        Team.players.through.objects.filter(team__league_id=league_id)
+        .order_by("team_id", "player_id")
+        .values_list("team_id", "player_id", "player__name", "player__position",
+                     *(f"player__{field}" for field in RATING_FIELDS))
+    )
+    path = _path(league_id, digest)
+    write_snapshot(path, league_id, digest, teams, rows)
+    for stale in snapshot_dir().glob(f"league-{league_id}-*.snap"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return LeagueSnapshot(path)
+
+
+def league_snapshot(league_id, teams):
+    """
+    The current snapshot of a league, opened from disk or built.
+    teams: (team_id, roster_version, offense, defense) for every team, in ID order.
+    """
+    digest = _digest([t[:2] for t in teams])
+    snapshot = _open.get(league_id)
+    if snapshot is not None and snapshot.digest == digest:
+        return snapshot
+    path = _path(league_id, digest)
+    with _lock:
+        try:
+            snapshot = LeagueSnapshot(path)
+        except (FileNotFoundError, ValueError):
+            snapshot = build_snapshot(league_id, teams, digest)
+        _open[league_id] = snapshot
+    return snapshot
+
+
+class SnapshotRatings(dict):
+    """
+    {team_id: TeamRatings} backed by snapshots. Pickles as the snapshot paths,
+    so worker processes map the same files instead of receiving copies.
+    """
+
+    def __init__(self, snapshots, team_ids):
+        super().__init__((team_id, snapshot.team(team_id)) for snapshot in snapshots
+                         for team_id in team_ids if team_id in snapshot)
+        self.snapshots = snapshots
+
+    def __reduce__(self):
+        return SnapshotRatings, (self.snapshots, list(self))
+
+
+def snapshot_ratings(team_ids):
+    """{team_id: TeamRatings} for the given teams, read from their leagues' snapshots"""
+    team_ids = set(team_ids)
+    leagues = Team.objects.filter(id__in=team_ids).values("league_id")
+    teams = (
+        Team.objects.filter(league_id__in=leagues)
+        .order_by("league_id", "id")
+        .values_list("league_id", "id", "roster_version", "offense", "defense")
+    )
+    snapshots = [
+        league_snapshot(league_id, [row[1:] for row in rows])
+        for league_id, rows in groupby(teams, key=lambda row: row[0])
+    ]
+    return SnapshotRatings(snapshots, team_ids)
+
+
+def invalidate(league_ids=None):
+    """Forget and delete the snapshots of the given leagues (all by default)"""
+    with _lock:
+        if league_ids is None:
+            _open.clear()
+            patterns = ["league-*.snap"]
+        else:
+            league_ids = set(league_ids)
+            for league_id in league_ids:
+                _open.pop(league_id, None)
+            patterns = [f"league-{league_id}-*.snap" for league_id in league_ids]
+        directory = snapshot_dir()
+        for pattern in patterns:
+            for path in directory.glob(pattern):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,91 @@
+"""
+Incrementally maintained standings (TeamStanding).
+
+Each recorded game updates its two teams' rows in place, so the cost is O(1)
+per game no matter how many games the league has. rebuild_standings()
+recomputes everything from the Game table for consistency repair.
+"""
+from django.db import connection, transaction
+
+from .models import Game, Team, TeamStanding
+
+COUNTERS = ["wins", "losses", "conference_wins", "conference_losses", "points_for", "points_against"]
+
+
+def _update_sql():
+    """Add one game to a team's row; the streak extends or flips sign in SQL"""
+    qn = connection.ops.quote_name
+    return (
+        "UPDATE {table} SET {counters}, "
+        "{streak} = CASE WHEN %s THEN (CASE WHEN {streak} > 0 THEN {streak} + 1 ELSE 1 END) "
+        "ELSE (CASE WHEN {streak} < 0 THEN {streak} - 1 ELSE -1 END) END "
+        "WHERE {team} = %s AND {season} = %s"
+    ).format(
+        table=qn(TeamStanding._meta.db_table),
+        counters=", ".join(f"{qn(c)} = {qn(c)} + %s" for c in COUNTERS),
+        streak=qn("streak"),
+        team=qn("team_id"),
+        season=qn("season"),
+    )
+
+
+def standing_updates(games, conference_of):
+    """
+    Yield one (team_id, season, won, points_for, points_against, conference_game)
+    tuple per team per game, in game order.
+    """
+    for game in games:
+        home_conf = conference_of.get(game.home_team_id)
+        conference_game = home_conf is not None and home_conf == conference_of.get(game.away_team_id)
+        home_won = game.winner_id == game.home_team_id
+        yield game.home_team_id, game.season, home_won, game.home_score, game.away_score, conference_game
+        yield game.away_team_id, game.season, not home_won, game.away_score, game.home_score, conference_game
+
+
+def update_standings(games):
+    """
+    Apply finished games (in the order given) to TeamStanding.
+    Call inside the transaction that saves the games.
+    """
+    games = [g for g in games if g.winner_id is not None]
+    if not games:
+        return
+    team_ids = {g.home_team_id for g in games} | {g.away_team_id for g in games}
+    conference_of = dict(Team.objects.filter(id__in=team_ids).values_list("id", "conference_id"))
+
+    TeamStanding.objects.bulk_create(
+        {
+            (g.league_id, team, g.season): TeamStanding(league_id=g.league_id, team_id=team, season=g.season)
+            for g in games for team in (g.home_team_id, g.away_team_id)
+        }.values(),
+        ignore_conflicts=True,
+    )
+
+    rows = [
+        (
+            int(won), int(not won),
+            int(won and conf), int(conf and not won),
+            scored, allowed,
+            won, team_id, season,
+        )
+        for team_id, season, won, scored, allowed, conf in standing_updates(games, conference_of)
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(_update_sql(), rows)
+
+
+def rebuild_standings(league_ids=None):
+    """Recompute standings from every played game (all leagues by default)"""
+    games = Game.objects.filter(winner__isnull=False).order_by("season", "week", "id")
+    standings = TeamStanding.objects.all()
+    if league_ids is not None:
+        games = games.filter(league_id__in=league_ids)
+        standings = standings.filter(league_id__in=league_ids)
+
+    with transaction.atomic():
+        standings.delete()
+        games = list(games.only(
+            "id", "league_id", "season", "home_team_id", "away_team_id", "home_score", "away_score", "winner_id"
+        ))
+        update_standings(games)
+    return len(games)
@@ -0,0 +1,49 @@
+"""
+Persisted box scores and incrementally maintained season totals.
+"""
+from backend.db import increment_rows, insert_rows
+
+from .engine import BOX_STATS
+from .models import PlayerGameStat, PlayerSeasonStat
+
+
+def record_box_scores(games, results):
+    """
+    Store every player line of the given games (Game rows with their
+    simulate_game() results) and fold them into PlayerSeasonStat.
+    Cost is O(player lines); existing season rows are updated in place.
+    A player on both rosters keeps only their first (home) line.
+    Call inside the transaction that saves the games.
+    """
+    lines = []
+    season_totals = {}
+    for game, result in zip(games, results):
+        seen = set()
+        for team_id, box in ((game.home_team_id, result["home_box"]), (game.away_team_id, result["away_box"])):
+            for line in box:
+                if line["player_id"] in seen:
+                    continue  # one line per (game, player); see unique_player_game_stat
+                seen.add(line["player_id"])
+                stats = [line[stat] for stat in BOX_STATS]
+                lines.append((game.id, line["player_id"], team_id, *stats))
+                key = (line["player_id"], game.league_id, game.season)
+                totals = season_totals.setdefault(key, [0] * (len(BOX_STATS) + 1))
+                totals[0] += 1
+                for i, value in enumerate(stats, start=1):
+                    totals[i] += value
+
+    insert_rows(PlayerGameStat, ["game_id", "player_id", "team_id", *BOX_STATS], lines)
+
+    # make sure every season row exists, then add this batch to it
+    PlayerSeasonStat.objects.bulk_create(
+        [PlayerSeasonStat(player_id=p, league_id=l, season=s) for p, l, s in season_totals],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    increment_rows(
+        PlayerSeasonStat,
+        ["player_id", "league_id", "season"],
+        ["games", *BOX_STATS],
+        (tuple(totals) + key for key, totals in season_totals.items()),
+    )
+    return len(lines)
@@ -1,3 +1,1136 @@
-from django.test import TestCase
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 
-# Create your tests here.
+import numpy as np
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.db.models import Prefetch
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from backend.commitqueue import CommitQueue
+from players.models import Player, RecruitingClass
+from players.services import create_recruiting_class
+from jobs.runner import run_pending
+from players.utils import STAT_FIELDS, compute_overall, compute_specialization, generate_players
+from . import recruiting, season, simcache
+from .engine import BOX_STATS, COL, simulate_batch, simulate_game, team_off_def, team_ratings
+from .models import DEFAULT_TEAM_OVERALL, Conference, Game, League, PlayerGameStat, PlayerSeasonStat, Team, TeamStanding
+from .parallel import simulate_matchups, simulate_replicas
+from .possession import simulate_possessions
+from .ratings import compute_team_ratings
+from .schedule import build_schedule, round_robin
+from .season import create_schedule, load_ratings, play_games, ratings_for, unplayed_games
+from .services import advance_season, populate_league
+from .snapshot import snapshot_ratings
+from .standings import rebuild_standings
+from .universe import export_league, import_league
+from .views import GAME_EXPORT_FIELDS
+
+
+def make_roster(size, seed):
+    return team_ratings(
+        SimpleNamespace(id=seed * 100 + i, **p) for i, p in enumerate(generate_players(size, rng=seed))
+    )
+
+
+class CreateTeamsTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+
+    def test_defaults(self):
+        response = self.client.post(f"/league/leagues/{self.league.id}/create_teams/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["teams"]), 4)
+        self.assertTrue(all(len(t["players"]) == 15 for t in response.data["teams"]))
+        self.assertEqual(Player.objects.count(), 60)
+
+    def test_team_count_roster_size_and_conferences(self):
+        response = self.client.post(
+            f"/league/leagues/{self.league.id}/create_teams/",
+            {"num_teams": 6, "roster_size": 8, "conferences": ["East", "West"]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Team.players.through.objects.count(), 48)
+        self.assertEqual(set(self.league.conferences.values_list("name", flat=True)), {"East", "West"})
+        per_conf = {c.name: c.teams.count() for c in Conference.objects.all()}
+        self.assertEqual(per_conf, {"East": 3, "West": 3})
+
+    def test_invalid_parameters(self):
+        response = self.client.post(f"/league/leagues/{self.league.id}/create_teams/", {"num_teams": 0})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Team.objects.exists())
+
+
+class EngineTests(SimpleTestCase):
+    def test_box_scores(self):
+        result = simulate_game(make_roster(13, 1), make_roster(7, 2), random.Random(0))
+        self.assertEqual(result["home_score"], sum(p["points"] for p in result["home_box"]))
+        self.assertEqual(result["away_score"], sum(p["points"] for p in result["away_box"]))
+        self.assertEqual(result["home_win"], result["home_score"] >= result["away_score"])
+        self.assertTrue(8 <= len(result["home_box"]) <= 10)
+        self.assertEqual(len(result["away_box"]), 7)
+        self.assertAlmostEqual(sum(p["minutes"] for p in result["home_box"]), 200, delta=5)
+
+    def test_fixed_seed_is_deterministic(self):
+        home, away = make_roster(15, 3), make_roster(15, 4)
+        self.assertEqual(
+            simulate_game(home, away, random.Random(42)), simulate_game(home, away, random.Random(42))
+        )
+
+
+class PossessionEngineTests(SimpleTestCase):
+    def test_box_scores_add_up(self):
+        result = simulate_possessions(make_roster(13, 1), make_roster(7, 2), np.random.default_rng(0))
+        self.assertEqual(result["home_score"], sum(p["points"] for p in result["home_box"]))
+        self.assertEqual(result["away_score"], sum(p["points"] for p in result["away_box"]))
+        self.assertNotEqual(result["home_score"], result["away_score"])  # overtime settles ties
+        self.assertEqual(set(result["home_box"][0]), {"player_id", "name", "position", *BOX_STATS})
+        self.assertAlmostEqual(sum(p["minutes"] for p in result["home_box"]), 200 + 25 * result["overtimes"], delta=5)
+
+    def test_seeded_and_random_module_rngs(self):
+        home, away = make_roster(15, 3), make_roster(15, 4)
+        self.assertEqual(simulate_possessions(home, away, 42), simulate_possessions(home, away, 42))
+        self.assertEqual(
+            simulate_possessions(home, away, random.Random(5)), simulate_possessions(home, away, random.Random(5))
+        )
+        simulate_possessions(home, away, random)
+
+    def test_realistic_averages(self):
+        home, away = make_roster(13, 5), make_roster(13, 6)
+        rng = np.random.default_rng(1)
+        results = [simulate_possessions(home, away, rng) for _ in range(200)]
+        points = np.mean([r["home_score"] + r["away_score"] for r in results]) / 2
+        turnovers = np.mean([sum(p["turnovers"] for p in r["home_box"]) for r in results])
+        self.assertTrue(55 < points < 95, points)
+        self.assertTrue(6 < turnovers < 20, turnovers)
+
+    def test_ratings_the_classic_engine_ignores_matter(self):
+        base = make_roster(13, 7)
+        boosted = base._replace(ratings=base.ratings.copy())
+        for field in ("post_moves", "standing_dunk", "strength", "vertical"):
+            boosted.ratings[:, COL[field]] = 99
+        opponent = make_roster(13, 8)
+
+        def mean_score(team):
+            rng = np.random.default_rng(2)
+            return np.mean([simulate_possessions(team, opponent, rng)["home_score"] for _ in range(200)])
+
+        self.assertGreater(mean_score(boosted), mean_score(base))
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = simcache.LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c"), len(cache)), (1, 3, 2))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+
+class SimulateEndpointTests(TestCase):
+    def setUp(self):
+        simcache.results.clear()
+        self.league = League.objects.create(name="Test League")
+        self.home, self.away = populate_league(self.league, num_teams=2, roster_size=12, rng=0)
+
+    def test_matches_engine_for_fixed_seed(self):
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": self.away.id, "seed": 9}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["seed"], 9)
+
+        expected = simulate_game(
+            team_ratings(self.home.players.order_by("id")), team_ratings(self.away.players.order_by("id")),
+            random.Random(9),
+        )
+        self.assertEqual(response.data["home_box"], expected["home_box"])
+        self.assertEqual(response.data["away_score"], expected["away_score"])
+        game = Game.objects.get(id=response.data["game_id"])
+        self.assertEqual((game.mode, game.seed), ("classic", 9))
+
+    def test_repeat_is_served_from_cache_until_a_roster_changes(self):
+        payload = {"home_team_id": self.home.id, "away_team_id": self.away.id, "seed": 3, "preview": True}
+        first = self.client.post("/league/games/simulate/", payload)
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.data["cached"])
+        self.assertIsNone(first.data["game_id"])
+        self.assertFalse(Game.objects.exists())
+
+        with self.assertNumQueries(2):  # the two teams; no players
+            second = self.client.post("/league/games/simulate/", payload)
+        self.assertTrue(second.data["cached"])
+        self.assertEqual(second.data["home_box"], first.data["home_box"])
+
+        version = Team.objects.get(id=self.home.id).roster_version
+        removed = self.home.players.first()
+        self.home.players.remove(removed)
+        self.assertEqual(Team.objects.get(id=self.home.id).roster_version, version + 1)
+        third = self.client.post("/league/games/simulate/", payload)
+        self.assertFalse(third.data["cached"])
+        self.assertNotIn(removed.id, [line["player_id"] for line in third.data["home_box"]])
+
+    def test_unseeded_games_can_be_replayed(self):
+        response = self.client.post(
+            "/league/games/simulate/",
+            {"home_team_id": self.home.id, "away_team_id": self.away.id, "mode": "possession"},
+        )
+        seed = response.data["seed"]
+        self.assertIsInstance(seed, int)
+        simcache.results.clear()
+
+        replay = self.client.get(f"/league/games/{response.data['game_id']}/replay/")
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual((replay.data["mode"], replay.data["seed"]), ("possession", seed))
+        self.assertTrue(replay.data["matches"])
+        self.assertEqual(replay.data["home_box"], response.data["home_box"])
+
+        self.away.players.remove(self.away.players.first())
+        self.assertFalse(self.client.get(f"/league/games/{response.data['game_id']}/replay/").data["matches"])
+
+    def test_scheduled_games_have_no_seed_to_replay(self):
+        create_schedule(self.league)
+        game = unplayed_games(self.league).first()
+        self.assertEqual(self.client.get(f"/league/games/{game.id}/replay/").status_code, 400)
+
+    def test_season_games_can_be_replayed(self):
+        create_schedule(self.league)
+        self.client.post(f"/league/leagues/{self.league.id}/simulate_season/")  # unseeded, default path
+        play_games([Game.objects.create(league=self.league, home_team=self.away, away_team=self.home, week=9)],
+                   seed=5, workers=2)
+        simcache.results.clear()
+
+        for game in Game.objects.filter(league=self.league):
+            self.assertEqual(game.mode, "classic")
+            self.assertIsNotNone(game.seed)
+            replay = self.client.get(f"/league/games/{game.id}/replay/")
+            self.assertEqual(replay.status_code, 200)
+            self.assertTrue(replay.data["matches"])
+
+    def test_invalid_seed(self):
+        for seed in ("abc", -1, 2 ** 63):
+            response = self.client.post(
+                "/league/games/simulate/",
+                {"home_team_id": self.home.id, "away_team_id": self.away.id, "seed": seed},
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 400, seed)
+
+    def test_team_cannot_play_itself(self):
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": self.home.id},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Game.objects.exists())
+
+    def test_player_on_both_rosters_gets_one_line(self):
+        shared = self.away.players.first()
+        Player.objects.filter(id=shared.id).update(overall=99)  # in both rotations
+        self.home.players.add(shared)
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": self.away.id, "seed": 1},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(shared.id, [line["player_id"] for line in response.data["home_box"]])
+        self.assertIn(shared.id, [line["player_id"] for line in response.data["away_box"]])
+        lines = PlayerGameStat.objects.filter(game_id=response.data["game_id"], player=shared)
+        self.assertEqual(list(lines.values_list("team_id", flat=True)), [self.home.id])
+        self.assertEqual(PlayerSeasonStat.objects.get(player=shared).games, 1)
+
+    def test_possession_mode(self):
+        response = self.client.post(
+            "/league/games/simulate/",
+            {"home_team_id": self.home.id, "away_team_id": self.away.id, "mode": "possession"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["mode"], "possession")
+        self.assertGreater(response.data["possessions"], 0)
+        self.assertEqual(PlayerGameStat.objects.filter(game_id=response.data["game_id"]).count(),
+                         len(response.data["home_box"]) + len(response.data["away_box"]))
+
+    def test_unknown_mode(self):
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": self.away.id, "mode": "dice"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Game.objects.exists())
+
+    def test_empty_roster(self):
+        empty = Team.objects.create(name="Empty", league=self.league)
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": empty.id}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_odds_does_not_save_games(self):
+        response = self.client.get(
+            "/league/games/odds/",
+            {"home_team_id": self.home.id, "away_team_id": self.away.id, "iterations": 5000, "seed": 1},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Game.objects.exists())
+        self.assertAlmostEqual(response.data["home_win_pct"] + response.data["away_win_pct"], 100)
+        self.assertLessEqual(response.data["home_score"]["p5"], response.data["home_score"]["p95"])
+        self.assertEqual(len(response.data["home_lines"]), 10)
+
+        again = self.client.get(
+            "/league/games/odds/",
+            {"home_team_id": self.home.id, "away_team_id": self.away.id, "iterations": 5000, "seed": 1},
+        )
+        self.assertEqual(again.data, response.data)
+
+        negative = self.client.get(
+            "/league/games/odds/", {"home_team_id": self.home.id, "away_team_id": self.away.id, "seed": -5},
+        )
+        self.assertEqual(negative.status_code, 400)
+
+
+class SimulateBatchTests(SimpleTestCase):
+    def test_matches_single_game_model(self):
+        home, away = make_roster(15, 5), make_roster(12, 6)
+        batch = simulate_batch(home, away, 20000, rng=0)
+
+        rng = random.Random(0)
+        games = [simulate_game(home, away, rng) for _ in range(4000)]
+        self.assertAlmostEqual(batch["home_scores"].mean(), np.mean([g["home_score"] for g in games]), delta=1.0)
+        self.assertAlmostEqual(batch["away_scores"].mean(), np.mean([g["away_score"] for g in games]), delta=1.0)
+        self.assertAlmostEqual(
+            (batch["home_scores"] >= batch["away_scores"]).mean(),
+            np.mean([g["home_win"] for g in games]),
+            delta=0.03,
+        )
+
+
+class ScheduleTests(SimpleTestCase):
+    def test_round_robin_plays_everyone_once(self):
+        for n in (2, 5, 8):
+            rounds = round_robin(range(n))
+            pairs = [frozenset(p) for r in rounds for p in r]
+            self.assertEqual(len(pairs), n * (n - 1) // 2)
+            self.assertEqual(len(set(pairs)), len(pairs))
+            for r in rounds:
+                teams = [t for p in r for t in p]
+                self.assertEqual(len(teams), len(set(teams)))
+
+    def test_build_schedule(self):
+        conference_of = {t: t % 4 for t in range(40)}
+        schedule = build_schedule(conference_of, non_conference_games=3, rng=random.Random(0))
+        non_conference = [g for g in schedule if g[0] <= 3]
+        self.assertEqual(len(non_conference), 60)
+        self.assertTrue(all(conference_of[h] != conference_of[a] for _, h, a in non_conference))
+        self.assertEqual(len(schedule) - len(non_conference), 4 * 45)
+        for week in {g[0] for g in schedule}:
+            teams = [t for w, h, a in schedule if w == week for t in (h, a)]
+            self.assertEqual(len(teams), len(set(teams)))
+
+
+class SeasonTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        populate_league(self.league, num_teams=8, roster_size=10, conferences=2, rng=0)
+
+    def test_schedule_and_simulate(self):
+        url = f"/league/leagues/{self.league.id}/"
+        response = self.client.post(url + "generate_schedule/", {"non_conference_games": 2})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["games"], 8 + 2 * 6)
+        self.assertEqual(response.data["weeks"], 5)
+        self.assertEqual(self.client.post(url + "generate_schedule/").status_code, 400)
+
+        response = self.client.post(url + "simulate_week/")
+        self.assertEqual(response.data["week"], 1)
+        self.assertEqual(response.data["games_played"], 4)
+        self.assertEqual(Game.objects.filter(winner__isnull=False).count(), 4)
+
+        # league, unplayed games, roster versions (the snapshot is current), then in one
+        # transaction: the score executemany, box score inserts, season rows and the
+        # season executemany, team conferences, standing rows and the standings executemany
+        with self.assertNumQueries(20):
+            response = self.client.post(url + "simulate_season/")
+        self.assertEqual(response.data["games_played"], 16)
+        self.assertFalse(Game.objects.filter(winner__isnull=True).exists())
+        self.assertEqual(self.client.post(url + "simulate_season/").status_code, 400)
+
+    def test_seeded_results_do_not_depend_on_worker_count(self):
+        create_schedule(self.league, non_conference_games=2)
+        games = list(unplayed_games(self.league))
+        ratings = load_ratings(self.league.teams.values_list("id", flat=True))
+        matchups = [(g.id, g.home_team_id, g.away_team_id) for g in games]
+
+        serial = simulate_matchups(matchups, ratings, 123, workers=1)
+        self.assertEqual(serial, simulate_matchups(matchups, ratings, 123, workers=2))
+        self.assertNotEqual(serial, simulate_matchups(matchups, ratings, 124, workers=1))
+        self.assertEqual(serial, play_games(games, seed=123, workers=2))
+
+        serial_wins, _ = simulate_replicas(matchups, ratings, 5, replicas=4, workers=1)
+        parallel_wins, _ = simulate_replicas(matchups, ratings, 5, replicas=4, workers=2)
+        np.testing.assert_array_equal(serial_wins, parallel_wins)
+        self.assertTrue((serial_wins.sum(axis=1) == len(games)).all())
+
+    def test_project_season(self):
+        create_schedule(self.league, non_conference_games=1)
+        response = self.client.post(
+            f"/league/leagues/{self.league.id}/project_season/", {"replicas": 20, "seed": 3}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["teams"]), 8)
+        self.assertAlmostEqual(sum(t["projected_wins"] for t in response.data["teams"]), 4 + 12, places=5)
+        self.assertFalse(Game.objects.filter(winner__isnull=False).exists())
+
+    def test_only_the_current_season_counts(self):
+        url = f"/league/leagues/{self.league.id}/"
+        create_schedule(self.league, non_conference_games=1)
+        play_games(unplayed_games(self.league).filter(week__lte=2), seed=1)
+        advance_season(self.league)
+        create_schedule(self.league, non_conference_games=1)
+        play_games(unplayed_games(self.league).filter(week=1), seed=2)
+        self.assertEqual(unplayed_games(self.league).count(), 12)
+        self.assertTrue(all(g.season == 2 for g in unplayed_games(self.league)))
+
+        response = self.client.post(url + "project_season/", {"replicas": 20, "seed": 3})
+        self.assertEqual(sum(t["wins"] for t in response.data["teams"]), 4)
+        self.assertAlmostEqual(sum(t["projected_wins"] for t in response.data["teams"]), 16, places=5)
+
+        response = self.client.post(url + "simulate_season/", {"seed": 4})
+        self.assertEqual(response.data["games_played"], 12)
+        # last season's unplayed games stay as they were
+        self.assertEqual(self.league.games.filter(season=1, winner__isnull=True).count(), 8)
+
+
+class TeamRatingsTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.team, self.other = populate_league(self.league, num_teams=2, roster_size=6, rng=1)
+
+    def assertStored(self, team):
+        team.refresh_from_db()
+        self.assertEqual((team.overall, team.offense, team.defense), compute_team_ratings([team.id])[team.id])
+        if team.players.exists():
+            ratings = team_ratings(team.players.all())
+            self.assertEqual((team.offense, team.defense), team_off_def(ratings))
+            self.assertEqual(team.overall, int(sum(p.overall for p in team.players.all()) / team.players.count()))
+
+    def test_populate_stores_ratings(self):
+        self.assertStored(self.team)
+        self.assertNotEqual(self.team.offense, 0)
+
+    def test_roster_and_player_changes(self):
+        player = self.other.players.first()
+        self.team.players.add(player)
+        self.assertStored(self.team)
+
+        player.close_shot = 99
+        player.overall = 99
+        player.save()
+        self.assertStored(self.team)
+        self.assertStored(self.other)
+
+        player.teams.clear()
+        self.assertStored(self.team)
+        self.assertStored(self.other)
+
+        self.team.players.clear()
+        self.team.refresh_from_db()
+        self.assertEqual((self.team.overall, self.team.offense, self.team.defense), (60, 0, 0))
+
+    def test_player_delete_and_recompute_command(self):
+        player = self.team.players.first()
+        response = self.client.delete(f"/players/{player.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertStored(self.team)
+
+        Team.objects.update(overall=0, offense=0, defense=0)
+        call_command("recompute_team_ratings")
+        self.assertStored(self.team)
+        self.assertStored(self.other)
+
+    def test_listing_does_not_query_players_for_ratings(self):
+        with self.assertNumQueries(2):  # teams, prefetched players
+            response = self.client.get("/league/teams/")
+        self.assertEqual(response.data[0]["overall"], Team.objects.get(id=response.data[0]["id"]).overall)
+
+
+class ResponseShapeTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.teams = populate_league(self.league, num_teams=3, roster_size=5, conferences=1, rng=2)
+        self.url = f"/league/leagues/{self.league.id}/"
+
+    def test_league_depth(self):
+        with self.assertNumQueries(4):  # league, conferences, teams, players
+            full = self.client.get(self.url).data
+        self.assertIn("close_shot", full["teams"][0]["players"][0])
+
+        with self.assertNumQueries(4):
+            teams_only = self.client.get(self.url, {"depth": 1}).data
+        self.assertEqual(teams_only["teams"][0]["players"], full_ids(full["teams"][0]["players"]))
+        self.assertEqual(teams_only["teams"][0]["overall"], full["teams"][0]["overall"])
+
+        with self.assertNumQueries(3):
+            ids_only = self.client.get(self.url, {"depth": 0}).data
+        self.assertEqual(ids_only["teams"], [t.id for t in self.teams])
+
+        self.assertEqual(self.client.get(self.url, {"depth": "x"}).status_code, 400)
+
+    def test_sparse_fieldsets(self):
+        with self.assertNumQueries(2):  # league, teams
+            data = self.client.get(self.url, {"fields": "id,teams", "fields[team]": "id,name,overall"}).data
+        self.assertEqual(set(data), {"id", "teams"})
+        self.assertEqual(set(data["teams"][0]), {"id", "name", "overall"})
+
+        data = self.client.get(f"/league/teams/{self.teams[0].id}/", {"fields[player]": "id,name"}).data
+        self.assertEqual(set(data["players"][0]), {"id", "name"})
+
+        player = self.teams[0].players.first()
+        data = self.client.get(f"/players/{player.id}/", {"fields": "id,overall,ranking"}).data
+        self.assertEqual(data, {"id": player.id, "overall": player.overall, "ranking": player.ranking})
+
+    def test_game_depth(self):
+        home, away = self.teams[:2]
+        game = Game.objects.create(league=self.league, home_team=home, away_team=away, winner=home)
+        data = self.client.get(f"/league/games/{game.id}/", {"depth": 0}).data
+        self.assertEqual((data["home_team"], data["winner"]), (home.id, home.id))
+        data = self.client.get(f"/league/games/{game.id}/", {"depth": 1}).data
+        self.assertEqual(data["home_team"]["players"], sorted(home.players.values_list("id", flat=True)))
+
+
+def full_ids(players):
+    return [p["id"] for p in players]
+
+
+class GameListTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        populate_league(self.league, num_teams=6, roster_size=5, conferences=1, rng=3)
+        create_schedule(self.league)
+        play_games(unplayed_games(self.league).filter(week=1), seed=1)
+
+    def test_compact_paginated_listing(self):
+        with self.assertNumQueries(2):  # count, page with teams joined
+            response = self.client.get("/league/games/", {"league": self.league.id, "page_size": 4})
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 4)
+        row = response.data["results"][0]
+        self.assertEqual(row["week"], 1)
+        self.assertEqual(row["home_team_name"], Team.objects.get(id=row["home_team"]).name)
+        self.assertIsNotNone(row["winner_name"])
+        self.assertNotIn("players", str(row))
+
+    def test_filters(self):
+        team = self.league.teams.first()
+        response = self.client.get("/league/games/", {"team": team.id})
+        self.assertEqual(response.data["count"], 5)
+        self.assertTrue(all(team.id in (g["home_team"], g["away_team"]) for g in response.data["results"]))
+
+        response = self.client.get("/league/games/", {"league": self.league.id, "week": 2})
+        self.assertEqual(response.data["count"], 3)
+        self.assertIsNone(response.data["results"][0]["winner_name"])
+
+        self.assertEqual(self.client.get("/league/games/", {"week": "x"}).status_code, 400)
+
+    def test_export_streams_filtered_games(self):
+        response = self.client.get("/league/games/export/", {"league": self.league.id, "week": 1, "format": "csv"})
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(","), GAME_EXPORT_FIELDS)
+        self.assertEqual(len(lines), 4)
+
+        response = self.client.get("/league/games/export/", {"team": self.league.teams.first().id})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual([r["week"] for r in rows], sorted(r["week"] for r in rows))
+
+    def test_depth_gives_nested_games(self):
+        response = self.client.get("/league/games/", {"league": self.league.id, "depth": 1, "page_size": 1})
+        self.assertIsInstance(response.data["results"][0]["home_team"]["players"], list)
+
+
+class BoxScoreTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.home, self.away = populate_league(self.league, num_teams=2, roster_size=10, rng=4)
+
+    def test_simulate_persists_box_score(self):
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": self.away.id}
+        )
+        game = Game.objects.get(id=response.data["game_id"])
+        self.assertEqual(game.box_scores.count(), len(response.data["home_box"]) + len(response.data["away_box"]))
+
+        stored = self.client.get(f"/league/games/{game.id}/box_score/").data
+        self.assertEqual(stored["home_box"], response.data["home_box"])
+        self.assertEqual(sum(l["points"] for l in stored["away_box"]), game.away_score)
+
+    def test_season_totals_match_game_lines(self):
+        Game.objects.bulk_create([
+            Game(league=self.league, home_team=self.home, away_team=self.away, week=w) for w in (1, 2, 3)
+        ])
+        play_games(unplayed_games(self.league), seed=2)
+        play_games([Game.objects.create(league=self.league, home_team=self.away, away_team=self.home, week=4)], seed=3)
+
+        for season_stat in PlayerSeasonStat.objects.all():
+            lines = PlayerGameStat.objects.filter(player=season_stat.player)
+            self.assertEqual(season_stat.games, lines.count())
+            self.assertEqual(season_stat.points, sum(l.points for l in lines))
+            self.assertEqual(season_stat.rebounds, sum(l.rebounds for l in lines))
+
+        response = self.client.get(f"/league/leagues/{self.league.id}/player_stats/", {"order": "rebounds", "limit": 5})
+        rows = response.data["players"]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual([r["rebounds"] for r in rows], sorted((r["rebounds"] for r in rows), reverse=True))
+        self.assertEqual(rows[0]["per_game"]["rebounds"], round(rows[0]["rebounds"] / rows[0]["games"], 1))
+
+        for bad in ({"order": "name"}, {"limit": -1}):
+            self.assertEqual(self.client.get(f"/league/leagues/{self.league.id}/player_stats/", bad).status_code, 400)
+
+
+class StandingsTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        populate_league(self.league, num_teams=6, roster_size=6, conferences=2, rng=5)
+        create_schedule(self.league, non_conference_games=2)
+
+    def expected(self):
+        """Standings computed the slow way, by scanning every game"""
+        table = {}
+        for game in Game.objects.filter(winner__isnull=False).order_by("week", "id"):
+            conf_game = game.home_team.conference_id == game.away_team.conference_id
+            for team, scored, allowed in (
+                (game.home_team_id, game.home_score, game.away_score),
+                (game.away_team_id, game.away_score, game.home_score),
+            ):
+                row = table.setdefault(team, [0, 0, 0, 0, 0, 0, 0])
+                won = game.winner_id == team
+                row[0 if won else 1] += 1
+                if conf_game:
+                    row[2 if won else 3] += 1
+                row[4] += scored
+                row[5] += allowed
+                row[6] = (max(row[6], 0) + 1) if won else (min(row[6], 0) - 1)
+        return table
+
+    def stored(self):
+        return {
+            s.team_id: [s.wins, s.losses, s.conference_wins, s.conference_losses,
+                        s.points_for, s.points_against, s.streak]
+            for s in TeamStanding.objects.all()
+        }
+
+    def test_incremental_standings_match_full_scan(self):
+        url = f"/league/leagues/{self.league.id}/"
+        self.client.post(url + "simulate_week/")
+        self.assertEqual(self.stored(), self.expected())
+        # a one-off game lands in week 1, after the scheduled week 1 games
+        home, away = self.league.teams.all()[:2]
+        self.client.post("/league/games/simulate/", {"home_team_id": home.id, "away_team_id": away.id})
+        self.client.post(url + "simulate_season/", {"seed": 4})
+        self.assertEqual(self.stored(), self.expected())
+
+        response = self.client.get(url + "standings/")
+        rows = response.data["standings"]
+        self.assertEqual(len(rows), 6)
+        pct = [r["wins"] / (r["wins"] + r["losses"]) for r in rows]
+        self.assertEqual(pct, sorted(pct, reverse=True))
+        self.assertRegex(rows[0]["streak"], r"^[WL]\d+$")
+
+        conference = self.league.conferences.first()
+        rows = self.client.get(url + "standings/", {"conference": conference.id}).data["standings"]
+        self.assertEqual({r["conference_id"] for r in rows}, {conference.id})
+
+    def test_rebuild(self):
+        self.client.post(f"/league/leagues/{self.league.id}/simulate_season/")
+        expected = self.stored()
+        TeamStanding.objects.update(wins=0, streak=0)
+        call_command("rebuild_standings", league=[self.league.id])
+        self.assertEqual(self.stored(), expected)
+
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Doomed")
+        self.other = League.objects.create(name="Survivor")
+        for league in (self.league, self.other):
+            populate_league(league, num_teams=4, roster_size=5, conferences=1, rng=league.id)
+            create_schedule(league)
+            play_games(unplayed_games(league).filter(week=1), seed=1)
+        self.rc, _ = create_recruiting_class(2026, 10, rng=4)
+        self.signee = self.rc.players.first()
+        self.other.teams.first().players.add(self.signee)
+
+    def test_delete_league_leaves_other_leagues_alone(self):
+        shared = self.league.teams.first().players.first()
+        self.other.teams.last().players.add(shared)
+        before = Player.objects.count()
+
+        response = self.client.delete(f"/league/leagues/{self.league.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(League.objects.filter(id=self.league.id).exists())
+        self.assertFalse(Team.objects.filter(league_id=self.league.id).exists())
+        self.assertFalse(Game.objects.filter(league_id=self.league.id).exists())
+        self.assertFalse(TeamStanding.objects.filter(league_id=self.league.id).exists())
+        # its 20 rostered players go, except the one also on a Survivor team
+        self.assertEqual(Player.objects.count(), before - 19)
+        self.assertTrue(Player.objects.filter(id=shared.id).exists())
+        self.assertEqual(Game.objects.filter(league=self.other, winner__isnull=False).count(), 2)
+        self.assertTrue(PlayerGameStat.objects.filter(game__league=self.other).exists())
+
+    def test_delete_league_after_cross_league_game(self):
+        # an expansion team with no games of its own this season
+        away = Team.objects.create(league=self.league, name="Expansion")
+        away.players.add(*self.rc.players.exclude(id=self.signee.id)[:5])
+        home = self.other.teams.first()
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": home.id, "away_team_id": away.id, "seed": 2},
+            content_type="application/json",
+        )
+        game = Game.objects.get(id=response.data["game_id"])
+        self.assertEqual(game.league_id, self.other.id)
+        rebuild_standings([self.other.id])
+        self.assertTrue(TeamStanding.objects.filter(league=self.other, team=away).exists())
+
+        self.assertEqual(self.client.delete(f"/league/leagues/{self.league.id}/").status_code, 204)
+        self.assertFalse(Game.objects.filter(id=game.id).exists())
+        self.assertFalse(PlayerGameStat.objects.filter(game_id=game.id).exists())
+        self.assertFalse(TeamStanding.objects.filter(team_id=away.id).exists())
+        self.assertEqual(Game.objects.filter(league=self.other, winner__isnull=False).count(), 2)
+
+    def test_delete_recruiting_class_rerates_rosters(self):
+        team = self.other.teams.first()
+        with self.assertNumQueries(13):  # lookup, affected teams, one DELETE per table, re-rate + savepoints
+            response = self.client.delete(f"/players/class/{self.rc.id}/")
+        self.assertEqual(response.data["deleted"]["players"], 10)
+        self.assertEqual(response.data["deleted"]["memberships"], 1)
+        self.assertFalse(RecruitingClass.objects.exists())
+        team.refresh_from_db()
+        self.assertEqual((team.overall, team.offense, team.defense), compute_team_ratings([team.id])[team.id])
+        self.assertEqual(self.client.delete(f"/players/class/{self.rc.id}/").status_code, 404)
+
+    def test_delete_all_players(self):
+        response = self.client.delete("/players/delete_all/")
+        self.assertEqual(response.data["message"], "Deleted 50 players.")
+        self.assertFalse(PlayerSeasonStat.objects.exists())
+        self.assertEqual(Game.objects.count(), 12)
+        self.assertEqual(set(Team.objects.values_list("overall", flat=True)), {DEFAULT_TEAM_OVERALL})
+
+    def test_reset_command(self):
+        call_command("purge", all=True, stdout=io.StringIO())
+        for model in (Player, RecruitingClass, Game, PlayerGameStat, PlayerSeasonStat, TeamStanding):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertEqual(Team.objects.count(), 8)
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Timed")
+        self.home, self.away = populate_league(self.league, num_teams=2, roster_size=5, rng=1)
+
+    @staticmethod
+    def metrics(response):
+        parts = [part.split(";") for part in response["Server-Timing"].split(", ")]
+        return {name: dict(p.split("=", 1) for p in params) for name, *params in parts}
+
+    def test_disabled_by_default(self):
+        response = self.client.get(f"/league/leagues/{self.league.id}/")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING=True, SERVER_TIMING_LOG=True)
+    def test_breakdown(self):
+        with self.assertLogs("backend.timing", "INFO") as logs:
+            response = self.client.post(
+                "/league/games/simulate/", {"home_team_id": self.home.id, "away_team_id": self.away.id}
+            )
+            detail = self.client.get(f"/league/leagues/{self.league.id}/")
+
+        simulate = self.metrics(response)
+        self.assertEqual(set(simulate), {"db", "sim", "ser", "render", "total"})
+        self.assertGreater(float(simulate["sim"]["dur"]), 0)
+        self.assertRegex(simulate["db"]["desc"], r'"\d+ queries"')
+
+        shown = self.metrics(detail)
+        self.assertGreater(float(shown["ser"]["dur"]), 0)
+        self.assertGreater(float(shown["render"]["dur"]), 0)
+        self.assertEqual(float(shown["sim"]["dur"]), 0)
+
+        line = json.loads(logs.records[1].getMessage())
+        self.assertEqual((line["path"], line["status"]), (f"/league/leagues/{self.league.id}/", 200))
+        self.assertGreater(line["queries"], 0)
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.teams = populate_league(self.league, num_teams=3, roster_size=9, rng=4)
+
+    def test_matches_the_orm(self):
+        ratings = snapshot_ratings([team.id for team in self.teams])
+        for team in self.teams:
+            expected = ratings_for(Team.objects.prefetch_related(
+                Prefetch("players", queryset=Player.objects.order_by("id"))
+            ).get(id=team.id))
+            loaded = ratings[team.id]
+            self.assertIsInstance(loaded.ratings, np.memmap)
+            self.assertEqual(loaded.ratings.dtype, np.uint8)
+            np.testing.assert_array_equal(loaded.ratings, expected.ratings)
+            np.testing.assert_array_equal(loaded.player_ids, expected.player_ids)
+            self.assertEqual((loaded.names, loaded.positions), (expected.names, expected.positions))
+            self.assertEqual((loaded.offense, loaded.defense), (expected.offense, expected.defense))
+            self.assertEqual(
+                simulate_game(loaded, loaded, random.Random(1)), simulate_game(expected, expected, random.Random(1))
+            )
+
+    def test_current_snapshot_costs_one_query(self):
+        team_ids = [team.id for team in self.teams]
+        snapshot_ratings(team_ids)
+        with self.assertNumQueries(1):
+            snapshot_ratings(team_ids)
+
+    def test_player_changes_rebuild_it(self):
+        team = self.teams[0]
+        before = snapshot_ratings([team.id])[team.id]
+        player = Player.objects.get(id=int(before.player_ids[0]))
+        player.three_point_shot = 11
+        player.save()
+
+        after = snapshot_ratings([team.id])[team.id]
+        self.assertEqual(after.ratings[0, COL["three_point_shot"]], 11)
+        self.assertFalse(before.ratings is after.ratings)
+
+        team.players.remove(player)
+        self.assertNotIn(player.id, snapshot_ratings([team.id])[team.id].player_ids.tolist())
+
+    def test_pickles_by_path(self):
+        ratings = snapshot_ratings([self.teams[0].id])
+        restored = pickle.loads(pickle.dumps(ratings))
+        self.assertLess(len(pickle.dumps(ratings)), 500)
+        np.testing.assert_array_equal(restored[self.teams[0].id].ratings, ratings[self.teams[0].id].ratings)
+
+
+class CommitQueueTests(TransactionTestCase):
+    """The writer thread needs committed data, so these run outside a test transaction"""
+
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.home, self.away = populate_league(self.league, num_teams=2, roster_size=10, rng=0)
+
+    def simulate_concurrently(self, count):
+        def post(seed):
+            response = Client().post(
+                "/league/games/simulate/",
+                {"home_team_id": self.home.id, "away_team_id": self.away.id, "seed": seed},
+            )
+            connections.close_all()
+            return response
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            return list(pool.map(post, range(count)))
+
+    @override_settings(COMMIT_QUEUE_MAX_WAIT=0.05)
+    def test_concurrent_simulations_are_committed_in_groups(self):
+        writer = season._game_writer
+        batches, committed = writer.batches, writer.committed
+        responses = self.simulate_concurrently(24)
+
+        self.assertEqual([r.status_code for r in responses], [201] * 24)
+        self.assertEqual(Game.objects.count(), 24)
+        self.assertEqual(len({r.data["game_id"] for r in responses}), 24)
+        self.assertEqual(writer.committed - committed, 24)
+        self.assertLess(writer.batches - batches, 24)
+        standings = TeamStanding.objects.filter(league=self.league)
+        self.assertEqual(sum(s.wins for s in standings), 24)
+        for response in responses[:3]:
+            stored = PlayerGameStat.objects.filter(game_id=response.data["game_id"]).count()
+            self.assertEqual(stored, len(response.data["home_box"]) + len(response.data["away_box"]))
+
+    def test_a_failing_item_only_fails_its_caller(self):
+        def handler(items):
+            if "bad" in items:
+                raise ValueError("bad item")
+            return [Conference.objects.create(name=item).id for item in items]
+
+        writer = CommitQueue(handler, name="test-writer")
+        with override_settings(COMMIT_QUEUE_MAX_WAIT=0.05), ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(writer.submit, name) for name in ("a", "bad", "b", "c")]
+        self.assertRaises(ValueError, futures[1].result)
+        self.assertEqual(sorted(Conference.objects.values_list("name", flat=True)), ["a", "b", "c"])
+
+
+class UniverseTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Original", season=3)
+        self.teams = populate_league(self.league, num_teams=4, roster_size=8, conferences=["East", "West"], rng=5)
+        self.recruits, _ = create_recruiting_class(2030, 20, rng=6)
+        self.teams[0].players.add(*self.recruits.players.order_by("id")[:2])
+        create_schedule(self.league, non_conference_games=1, rng=random.Random(2))
+        play_games(unplayed_games(self.league), seed=3)
+        self.path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "league.npz")
+
+    def test_round_trip(self):
+        out = io.StringIO()
+        call_command("export_league", self.league.id, self.path, stdout=out)
+        self.assertIn("34 memberships", out.getvalue())
+        call_command("import_league", self.path, "--name", "Clone", stdout=io.StringIO())
+
+        clone = League.objects.get(name="Clone")
+        self.assertEqual(clone.season, 3)
+        self.assertEqual(sorted(clone.conferences.values_list("name", flat=True)), ["East", "West"])
+        self.assertFalse(clone.conferences.filter(id__in=self.league.conferences.all()).exists())
+
+        def summary(league):
+            teams = league.teams.order_by("id")
+            return {
+                "teams": [(t.name, t.conference.name, t.overall, t.offense, t.defense) for t in teams],
+                "rosters": [sorted(t.players.values_list("name", "overall", "specialization")) for t in teams],
+                "games": list(league.games.order_by("id").values_list(
+                    "week", "home_team__name", "away_team__name", "home_score", "away_score", "winner__name"
+                )),
+                "box_scores": list(PlayerGameStat.objects.filter(game__league=league).order_by("id").values_list(
+                    "player__name", "team__name", *BOX_STATS
+                )),
+                "season_stats": sorted(PlayerSeasonStat.objects.filter(league=league).values_list(
+                    "player__name", "season", "games", "points"
+                )),
+                "standings": sorted(league.standings.values_list("team__name", "wins", "losses", "streak")),
+            }
+
+        self.assertEqual(summary(clone), summary(self.league))
+        # the recruiting class comes along with its unsigned players
+        cloned_class = RecruitingClass.objects.exclude(id=self.recruits.id).get()
+        self.assertEqual(cloned_class.year, 2030)
+        self.assertEqual(cloned_class.players.count(), 20)
+        self.assertEqual(Player.objects.filter(teams__league=clone).count(), 34)
+
+    def test_players_with_only_stats_keep_their_class(self):
+        # a recruit who played and then left every roster still references their class
+        other_class, _ = create_recruiting_class(2031, 5, rng=7)
+        recruit = other_class.players.order_by("id").first()
+        Player.objects.filter(id=recruit.id).update(overall=99)  # first in the rotation
+        home, away = self.teams[:2]
+        home.players.add(recruit)
+        game = Game.objects.create(league=self.league, home_team=home, away_team=away, week=99)
+        play_games([game], seed=1)
+        self.assertTrue(PlayerGameStat.objects.filter(game=game, player=recruit).exists())
+        home.players.remove(recruit)
+
+        counts = export_league(self.league, self.path)
+        self.assertEqual(counts["recruiting_classes"], 2)
+        clone, counts = import_league(self.path)
+        cloned = Player.objects.get(season_stats__league=clone, recruiting_class__year=2031)
+        self.assertEqual((cloned.name, cloned.overall), (recruit.name, 99))
+        self.assertEqual(cloned.recruiting_class.players.count(), 5)
+
+    def test_cross_league_games_are_left_out(self):
+        other = League.objects.create(name="Other")
+        visitor, = populate_league(other, num_teams=1, roster_size=5, rng=8)
+        response = self.client.post(
+            "/league/games/simulate/", {"home_team_id": self.teams[0].id, "away_team_id": visitor.id, "seed": 1},
+            content_type="application/json",
+        )
+        self.assertEqual(Game.objects.get(id=response.data["game_id"]).league_id, self.league.id)
+        rebuild_standings([self.league.id])
+        self.assertTrue(self.league.standings.filter(team=visitor).exists())
+
+        counts = export_league(self.league, self.path)
+        self.assertEqual(counts["games"], self.league.games.count() - 1)
+        self.assertEqual(counts["standings"], 4)
+        clone, _ = import_league(self.path)
+        self.assertEqual(clone.games.count(), counts["games"])
+        self.assertEqual(clone.standings.count(), 4)
+
+    def test_imported_league_plays_on(self):
+        export_league(self.league, self.path)
+        clone, counts = import_league(self.path)
+        self.assertEqual(counts["teams"], 4)
+        create_schedule(clone, rng=random.Random(4))
+        self.assertTrue(play_games(unplayed_games(clone), seed=1))
+
+    def test_rejects_other_files(self):
+        np.savez(self.path, something=np.arange(3))
+        with self.assertRaises(CommandError):
+            call_command("import_league", self.path)
+        self.assertEqual(League.objects.count(), 1)
+
+
+class OffseasonTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.teams = populate_league(self.league, num_teams=3, roster_size=8, rng=6)
+        self.other = League.objects.create(name="Other")
+        populate_league(self.other, num_teams=1, roster_size=5, rng=7)
+
+    def test_players_develop_and_team_ratings_follow(self):
+        before = dict(Player.objects.values_list("id", "overall"))
+        versions = dict(Team.objects.values_list("id", "roster_version"))
+        # a player shared with another league's team; its ratings follow too
+        shared = self.teams[0].players.first()
+        outside = self.other.teams.get()
+        outside.players.add(shared)
+        versions[outside.id] += 1
+
+        response = self.client.post(f"/league/leagues/{self.league.id}/offseason/", {"seed": 4},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["seed"], 4)
+        self.assertEqual(response.data["players"], 24)
+        self.assertGreater(response.data["improved"], 0)
+
+        after = dict(Player.objects.values_list("id", "overall"))
+        league_players = set(Player.objects.filter(teams__league=self.league).values_list("id", flat=True))
+        self.assertTrue(all(after[i] >= before[i] for i in league_players))
+        self.assertEqual({i: after[i] for i in before if i not in league_players},
+                         {i: before[i] for i in before if i not in league_players})
+
+        for player in Player.objects.filter(id__in=league_players):
+            stats = np.array([[getattr(player, field) for field in STAT_FIELDS]])
+            self.assertEqual(player.overall, compute_overall(stats)[0])
+            self.assertEqual(player.specialization, compute_specialization(stats)[0].tolist())
+
+        for team in Team.objects.all():
+            self.assertEqual((team.overall, team.offense, team.defense), compute_team_ratings([team.id])[team.id])
+            self.assertEqual(team.roster_version, versions[team.id] + 1)
+
+    def test_seeded_runs_match(self):
+        self.client.post(f"/league/leagues/{self.league.id}/offseason/", {"seed": 9})
+        first = list(Player.objects.order_by("id").values_list(*STAT_FIELDS))
+
+        clone = League.objects.create(name="Clone")
+        populate_league(clone, num_teams=3, roster_size=8, rng=6)
+        self.client.post(f"/league/leagues/{clone.id}/offseason/", {"seed": 9})
+        players = Player.objects.filter(teams__league=clone).order_by("id").values_list(*STAT_FIELDS)
+        self.assertEqual(list(players), first[:24])
+
+    def test_offseason_starts_the_next_season(self):
+        response = self.client.patch(f"/league/leagues/{self.league.id}/", {"season": 7},
+                                     content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["season"], 1)
+
+        response = self.client.post(f"/league/leagues/{self.league.id}/offseason/", {"seed": 1},
+                                    content_type="application/json")
+        self.assertEqual(response.data["season"], 2)
+        self.assertEqual(self.client.get(f"/league/leagues/{self.league.id}/").data["season"], 2)
+        self.assertEqual(League.objects.get(id=self.other.id).season, 1)
+        create_schedule(League.objects.get(id=self.league.id))
+        self.assertEqual(set(self.league.games.values_list("season", flat=True)), {2})
+
+    @override_settings(JOBS_LOCAL_WORKERS=0)
+    def test_async_and_bad_seed(self):
+        url = f"/league/leagues/{self.league.id}/offseason/"
+        self.assertEqual(self.client.post(url, {"seed": "x"}).status_code, 400)
+        response = self.client.post(f"{url}?async=1", {"seed": 2})
+        self.assertEqual(response.status_code, 202)
+        run_pending()
+        result = self.client.get(response.data["result_url"]).data["result"]
+        self.assertEqual((result["league_id"], result["players"], result["seed"]), (self.league.id, 24, 2))
+
+
+class RecruitingTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.teams = populate_league(self.league, num_teams=6, roster_size=10, rng=8)
+        self.recruits, _ = create_recruiting_class(2026, 200, rng=9)
+        self.url = f"/league/leagues/{self.league.id}/recruit/"
+
+    def test_deferred_acceptance_is_stable(self):
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            n, k = 40, 6
+            scores = np.sort(rng.integers(60, 80, size=n))[::-1].astype(np.float64)
+            priority = scores[:, None] + 3.0 * (rng.random((n, k)) < 0.2)
+            preferences = np.argsort(-rng.random((n, k)), axis=1)
+            capacity = rng.integers(0, 4, size=k)
+            signed = recruiting.deferred_acceptance(preferences, priority, capacity)
+
+            for t in range(k):
+                self.assertLessEqual((signed == t).sum(), capacity[t])
+            for r in range(n):
+                rank = {t: i for i, t in enumerate(preferences[r].tolist())}
+                for t in preferences[r][:rank.get(signed[r], k)].tolist():
+                    held = np.flatnonzero(signed == t)
+                    # every team r would rather join is full of recruits it ranks higher
+                    self.assertEqual(len(held), capacity[t])
+                    self.assertTrue(all((priority[h, t], -h) > (priority[r, t], -r) for h in held))
+
+            # recruits below the cutoff never sign, so dropping them up front changes nothing
+            cutoff = scores[min(capacity.sum(), n) - 1]
+            self.assertTrue(np.all(signed[scores + 3.0 < cutoff] == -1))
+
+    def test_recruit_fills_positional_needs(self):
+        before = {team.id: set(team.players.values_list("id", flat=True)) for team in self.teams}
+        response = self.client.post(self.url, {"recruiting_class": self.recruits.id, "roster_size": 15, "seed": 3},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data["seed"], 3)
+        self.assertEqual(data["signed"] + data["unsigned"], 200)
+        self.assertEqual(data["open_spots"], 0)
+
+        targets = recruiting.position_targets(15)
+        for team in Team.objects.filter(league=self.league):
+            signed = set(team.players.values_list("id", flat=True)) - before[team.id]
+            self.assertEqual(signed, set(data["signings"].get(team.id, [])))
+            positions = Counter(team.players.values_list("position", flat=True))
+            for position, target in targets.items():
+                self.assertEqual(positions[position], max(target, positions[position]))
+                new = team.players.filter(id__in=signed, position=position).count()
+                if new:
+                    self.assertEqual(positions[position], target)
+            self.assertEqual((team.overall, team.offense, team.defense), compute_team_ratings([team.id])[team.id])
+
+        # a second pass finds every need filled and signs nobody
+        again = self.client.post(self.url, {"recruiting_class": self.recruits.id, "roster_size": 15},
+                                 content_type="application/json").data
+        self.assertEqual((again["signed"], again["unsigned"]), (0, 200 - data["signed"]))
+
+    def test_best_recruits_sign_and_home_state_helps(self):
+        data = self.client.post(self.url, {"recruiting_class": self.recruits.id, "roster_size": 15, "seed": 4},
+                                content_type="application/json").data
+        signed = {player_id for players in data["signings"].values() for player_id in players}
+        players = self.recruits.players.all()
+        for position in recruiting.position_targets(15):
+            at_position = [p for p in players if p.position == position]
+            scores = {p.id: float(recruiting.recruiting_scores(p.overall, p.potential)) for p in at_position}
+            taken = [scores[i] for i in scores if i in signed]
+            passed = [scores[i] for i in scores if i not in signed]
+            if taken and passed:
+                self.assertGreaterEqual(min(taken) + recruiting.TEAM_STATE_AFFINITY, max(passed))
+
+        # with every team in one state, that state's recruits are preferred over equal ones elsewhere
+        Team.objects.filter(league=self.league).update(state="Ohio")
+        Team.players.through.objects.filter(player__recruiting_class=self.recruits).delete()
+        Player.objects.filter(recruiting_class=self.recruits).update(overall=70, potential=70)
+        Player.objects.filter(recruiting_class=self.recruits, id__in=list(signed)[:20]).update(state="Ohio")
+        Player.objects.filter(recruiting_class=self.recruits).exclude(id__in=list(signed)[:20]).update(state="Utah")
+        data = self.client.post(self.url, {"recruiting_class": self.recruits.id, "roster_size": 15, "seed": 5},
+                                content_type="application/json").data
+        signed_states = Counter(Player.objects.filter(id__in=[p for ps in data["signings"].values() for p in ps])
+                                .values_list("state", flat=True))
+        self.assertEqual(signed_states["Ohio"], 20)
+
+    @override_settings(JOBS_LOCAL_WORKERS=0)
+    def test_validation_and_async(self):
+        self.assertEqual(self.client.post(self.url, {}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"recruiting_class": "x"}).status_code, 400)
+        too_small = {"recruiting_class": self.recruits.id, "roster_size": 2}
+        self.assertEqual(self.client.post(self.url, too_small).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"recruiting_class": 999}).status_code, 404)
+
+        response = self.client.post(f"{self.url}?async=1", {"recruiting_class": self.recruits.id, "seed": 6})
+        self.assertEqual(response.status_code, 202)
+        run_pending()
+        result = self.client.get(response.data["result_url"]).data["result"]
+        self.assertEqual((result["league_id"], result["seed"]), (self.league.id, 6))
+        self.assertEqual(Team.players.through.objects.filter(player__recruiting_class=self.recruits).count(),
+                         result["signed"])
@@ -0,0 +1,232 @@
+"""
+Columnar export and import of a whole league.
+
+A league "universe" (its conferences, teams, rosters, players and their
+recruiting classes, games, box scores, season totals and standings) is
+written to one compressed .npz file, one array per table column, keyed
+"table/column". Nullable integer columns use -1 for NULL, JSON and datetime
+columns are stored as strings, and "meta" holds a JSON header.
+
+Only the league's own teams are exported, so games against another
+league's team (a cross-league simulate call) are left out with their box
+scores, as are standings kept for another league's teams.
+
+Importing creates a new league, with its own copies of the conferences and
+players, so a universe can be cloned next to the original. Every row gets
+a new ID: each exported table is given the block of IDs above its current
+maximum, in the original ID order, and references are remapped with
+vectorized lookups. Rows are then written with one executemany() per table
+inside one transaction, so importing hundreds of thousands of rows takes
+seconds.
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+from django.db import connection, models, transaction
+from django.db.models import Max, Q
+
+from backend.db import insert_rows
+from players.models import Player, RecruitingClass
+from .engine import BOX_STATS
+from .models import Conference, Game, League, PlayerGameStat, PlayerSeasonStat, Team, TeamStanding
+
+FORMAT_VERSION = 1
+NULL = -1
+
+Membership = Team.players.through
+LeagueConference = League.conferences.through
+
+# table -> (model, exported columns); the league foreign key is implied
+TABLES = {
+    "conferences": (Conference, ["id", "name", "strength"]),
+    "recruiting_classes": (RecruitingClass, ["id", "year", "created_at"]),
+    "players": (Player, [field.attname for field in Player._meta.concrete_fields]),
+    "teams": (Team, ["id", "name", "conference_id", "state", "overall", "offense", "defense"]),
+    "memberships": (Membership, ["team_id", "player_id"]),
+    "games": (Game, [
+        "id", "season", "week", "home_team_id", "away_team_id", "home_score", "away_score", "winner_id", "mode", "seed",
+    ]),
+    "box_scores": (PlayerGameStat, ["game_id", "player_id", "team_id", *BOX_STATS]),
+    "season_stats": (PlayerSeasonStat, ["player_id", "season", "games", *BOX_STATS]),
+    "standings": (TeamStanding, [
+        "team_id", "season", "wins", "losses", "conference_wins", "conference_losses",
+        "points_for", "points_against", "streak",
+    ]),
+}
+
+
+def _field(model, column):
+    return next(f for f in model._meta.concrete_fields if f.attname == column)
+
+
+def _to_array(field, values):
+    if isinstance(field, models.JSONField):
+        return np.array([json.dumps(v) for v in values], dtype=str)
+    if isinstance(field, models.DateTimeField):
+        return np.array([v.isoformat() for v in values], dtype=str)
+    if isinstance(field, models.CharField):
+        return np.array(values, dtype=str)
+    if isinstance(field, models.FloatField):
+        return np.array(values, dtype=np.float64)
+    return np.array([NULL if v is None else v for v in values], dtype=np.int64)
+
+
+def _from_array(field, array):
+    """Column values ready for a raw INSERT"""
+    if isinstance(field, models.DateTimeField):
+        return [connection.ops.adapt_datetimefield_value(datetime.fromisoformat(v)) for v in array.tolist()]
+    values = array.tolist()
+    if field.null and array.dtype.kind == "i":
+        return [None if v == NULL else v for v in values]
+    return values
+
+
+def league_querysets(league):
+    """
+    The rows of each table that belong to a league. Players are everyone
+    rostered in it or with a line in its stats, plus the rest of the
+    recruiting classes those players came from. Games are those between
+    two of its teams.
+    """
+    games = league.games.filter(home_team__league=league, away_team__league=league)
+    box_scores = PlayerGameStat.objects.filter(game__in=games)
+    rostered = Membership.objects.filter(team__league=league).values("player_id")
+    in_league = (
+        Q(id__in=rostered)
+        | Q(id__in=box_scores.values("player_id"))
+        | Q(id__in=PlayerSeasonStat.objects.filter(league=league).values("player_id"))
+    )
+    classes = Player.objects.filter(in_league, recruiting_class__isnull=False).values("recruiting_class_id")
+    players = Player.objects.filter(in_league | Q(recruiting_class_id__in=classes))
+    conferences = Conference.objects.filter(
+        Q(id__in=LeagueConference.objects.filter(league=league).values("conference_id"))
+        | Q(id__in=league.teams.values("conference_id"))
+    )
+    return {
+        "conferences": conferences,
+        "recruiting_classes": RecruitingClass.objects.filter(id__in=classes),
+        "players": players,
+        "teams": league.teams.all(),
+        "memberships": Membership.objects.filter(team__league=league),
+        "games": games,
+        "box_scores": box_scores,
+        "season_stats": PlayerSeasonStat.objects.filter(league=league),
+        "standings": TeamStanding.objects.filter(league=league, team__league=league),
+    }
+
+
+def export_league(league, path):
+    """Write a league universe to `path` (.npz); returns {table: rows}"""
+    arrays, counts = {}, {}
+    for table, queryset in league_querysets(league).items():
+        model, columns = TABLES[table]
+        rows = list(queryset.order_by("id").values_list(*columns))
+        counts[table] = len(rows)
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        for column, column_values in zip(columns, values):
+            arrays[f"{table}/{column}"] = _to_array(_field(model, column), column_values)
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "league": {"name": league.name, "season": league.season},
+        "conferences": list(league.conferences.values_list("id", flat=True)),
+        "counts": counts,
+    }
+    arrays["meta"] = np.array(json.dumps(meta))
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    return counts
+
+
+class IdMap:
+    """Old IDs -> a fresh block of new IDs starting at `start`, keeping their order"""
+
+    def __init__(self, old_ids, start):
+        self.old = np.sort(old_ids)
+        self.new = np.arange(start, start + len(self.old), dtype=np.int64)
+
+    def __call__(self, values, nullable=False):
+        values = np.asarray(values, dtype=np.int64)
+        index = np.minimum(np.searchsorted(self.old, values), max(len(self.old) - 1, 0))
+        found = self.old[index] == values if len(self.old) else np.zeros(len(values), dtype=bool)
+        null = values == NULL
+        if not np.all(found | (null & nullable)):
+            raise ValueError(f"Dangling references: {sorted(set(values[~found & ~null].tolist()))[:10]}")
+        return np.where(found, self.new[index] if len(self.new) else NULL, NULL)
+
+
+def _next_id(model):
+    return (model.objects.aggregate(top=Max("id"))["top"] or 0) + 1
+
+
+def import_league(path, name=None):
+    """
+    Create a new league from an export_league() file.
+    Returns (league, {table: rows}). Raises ValueError for an unreadable file.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    try:
+        meta = json.loads(arrays.pop("meta").item())
+    except KeyError:
+        raise ValueError("Not a league export")
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported export format {meta.get('format')}")
+
+    def column(table, name):
+        try:
+            return arrays[f"{table}/{name}"]
+        except KeyError:
+            raise ValueError(f"Export is missing {table}/{name}")
+
+    counts = {}
+    with transaction.atomic():
+        league = League.objects.create(name=name or meta["league"]["name"], season=meta["league"]["season"])
+        ids = {}
+        for table, model in (("conferences", Conference), ("recruiting_classes", RecruitingClass),
+                             ("players", Player), ("teams", Team), ("games", Game)):
+            ids[table] = IdMap(column(table, "id"), _next_id(model))
+
+        remap = {
+            "conferences": {"id": ids["conferences"]},
+            "recruiting_classes": {"id": ids["recruiting_classes"]},
+            "players": {"id": ids["players"], "recruiting_class_id": ids["recruiting_classes"]},
+            "teams": {"id": ids["teams"], "conference_id": ids["conferences"]},
+            "memberships": {"team_id": ids["teams"], "player_id": ids["players"]},
+            "games": {
+                "id": ids["games"], "home_team_id": ids["teams"], "away_team_id": ids["teams"],
+                "winner_id": ids["teams"],
+            },
+            "box_scores": {"game_id": ids["games"], "player_id": ids["players"], "team_id": ids["teams"]},
+            "season_stats": {"player_id": ids["players"]},
+            "standings": {"team_id": ids["teams"]},
+        }
+        league_tables = {"teams", "games", "season_stats", "standings"}
+
+        for table, (model, columns) in TABLES.items():
+            # columns with a default (e.g. Team.state) may be missing from older exports
+            columns = [c for c in columns if f"{table}/{c}" in arrays or not _field(model, c).has_default()]
+            values = []
+            for attname in columns:
+                array = column(table, attname)
+                field = _field(model, attname)
+                if attname in remap[table]:
+                    array = remap[table][attname](array, nullable=field.null)
+                values.append(_from_array(field, array))
+            rows = len(values[0])
+            if table in league_tables:
+                columns = [*columns, "league_id"]
+                values.append([league.id] * rows)
+            # columns that are not exported (e.g. Team.roster_version) start from their defaults
+            for field in model._meta.concrete_fields:
+                if field.attname not in columns and not field.primary_key:
+                    columns = [*columns, field.attname]
+                    values.append([field.get_default()] * rows)
+            insert_rows(model, [_field(model, c).column for c in columns], zip(*values))
+            counts[table] = rows
+
+        conference_ids = ids["conferences"](np.array(meta["conferences"], dtype=np.int64))
+        insert_rows(LeagueConference, ["league_id", "conference_id"], ((league.id, c) for c in conference_ids.tolist()))
+
+    return league, counts
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ConferenceViewSet, LeagueViewSet, TeamViewSet, GameViewSet, create_league
+from .views import ConferenceViewSet, LeagueViewSet, TeamViewSet, GameViewSet, create_league, export_games
 
 router = DefaultRouter()
 router.register(r'conferences', ConferenceViewSet, basename='conference')
@@ -10,5 +10,6 @@ router.register(r'games', GameViewSet, basename='game')
 
 urlpatterns = [
     path("create-league/", create_league, name="create-league"),
+    path("games/export/", export_games, name="export-games"),
     path("", include(router.urls)),
 ]
@@ -1,47 +1,433 @@
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from .models import League, Conference, Team, Game
-from .serializers import LeagueSerializer, ConferenceSerializer, TeamSerializer, GameSerializer
-from players.models import Player
-from players.utils import generate_player
+from .models import League, Conference, Team, Game, PlayerSeasonStat, TeamStanding
+from .serializers import LeagueSerializer, ConferenceSerializer, TeamSerializer, GameSerializer, GameListSerializer
+from .engine import BOX_STATS, simulate_batch
+from .season import (
+    SIMULATION_MODES, create_schedule, load_ratings, play_games, project_season, save_simulated_game, simulate_seeded,
+    unplayed_games,
+)
+from .purge import delete_league
+from .recruiting import recruit_class
+from .services import populate_league, progress_league
+from players.models import Player, RecruitingClass
 from players.serializers import PlayerSerializer
+from players.views import ResponseShapeMixin
+from jobs.runner import enqueue
+from jobs.views import accepted, request_flag, wants_async
+from backend.export import export_options, stream_queryset
+from backend.pagination import PageSizePagination
+from backend.timing import timed
+import numpy as np
+import os
 import random
 
+MAX_TEAMS_PER_REQUEST = 1000
+MAX_ROSTER_SIZE = 30
+MAX_ODDS_ITERATIONS = 1_000_000
+MAX_SEED = 2 ** 63 - 1  # Game.seed is a signed 64-bit column
+ODDS_PERCENTILES = (5, 25, 50, 75, 95)
+MAX_NON_CONFERENCE_GAMES = 20
+MAX_SEASON_REPLICAS = 10_000
+MAX_STAT_ROWS = 1000
+SEASON_STAT_FIELDS = ("games",) + BOX_STATS
+
 
 class ConferenceViewSet(viewsets.ModelViewSet):
     queryset = Conference.objects.all()
     serializer_class = ConferenceSerializer
 
 
-class LeagueViewSet(viewsets.ModelViewSet):
+# actions whose response is the viewset's serializer, and so worth prefetching for
+SERIALIZING_ACTIONS = ("list", "retrieve")
+
+
+def players_prefetch(lookup, ids_only):
+    if ids_only:
+        return Prefetch(lookup, queryset=Player.objects.only("id"))
+    return Prefetch(lookup)
+
+
+class LeagueViewSet(ResponseShapeMixin, viewsets.ModelViewSet):
+    resource_name = "league"
     queryset = League.objects.all()
     serializer_class = LeagueSerializer
 
+    def perform_destroy(self, instance):
+        # set-based; Model.delete() would load every game, stat line and roster row
+        delete_league(instance.pk)
+
+    def get_queryset(self):
+        """Prefetch only what the requested ?depth= / ?fields= shape serializes"""
+        queryset = super().get_queryset()
+        if self.action not in SERIALIZING_ACTIONS:
+            return queryset
+        if self.wants("league", "conferences"):
+            queryset = queryset.prefetch_related("conferences")
+        if not self.wants("league", "teams"):
+            return queryset
+
+        depth = self.response_shape["depth"]
+        if depth == 0:
+            return queryset.prefetch_related(Prefetch("teams", queryset=Team.objects.only("id", "league_id")))
+        queryset = queryset.prefetch_related("teams")
+        if self.wants("team", "players"):
+            queryset = queryset.prefetch_related(players_prefetch("teams__players", ids_only=depth == 1))
+        return queryset
+
     @action(detail=True, methods=["post"])
     def create_teams(self, request, pk=None):
         """
-        Create 4 teams with 5 randomly generated players each
+        Populate the league with generated teams.
+        Optional JSON: { "num_teams": 4, "roster_size": 15, "conferences": 2 | ["East", "West"], "async": false }
         """
         league = self.get_object()
 
-        # create teams
-        for i in range(4):
-            team = Team.objects.create(name=f"Team {i+1}", league=league)
+        try:
+            num_teams = int(request.data.get("num_teams", 4))
+            roster_size = int(request.data.get("roster_size", 15))
+        except (TypeError, ValueError):
+            return Response({"error": "num_teams and roster_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= num_teams <= MAX_TEAMS_PER_REQUEST or not 5 <= roster_size <= MAX_ROSTER_SIZE:
+            return Response(
+                {"error": f"num_teams must be 1-{MAX_TEAMS_PER_REQUEST} and roster_size 5-{MAX_ROSTER_SIZE}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        conferences = request.data.get("conferences")
+        if isinstance(conferences, str):
+            conferences = int(conferences) if conferences.isdigit() else [conferences]
+        if conferences is not None and not (
+            (isinstance(conferences, int) and conferences > 0) or (isinstance(conferences, list) and conferences)
+        ):
+            return Response({"error": "conferences must be a positive number or a list of names"}, status=status.HTTP_400_BAD_REQUEST)
 
-            # generate 15 players and assign
-            for _ in range(15):
-                data = generate_player()
-                player = Player.objects.create(**data, recruiting_class=None)  # not tied to recruiting class
-                team.players.add(player)
+        if wants_async(request):
+            return accepted(enqueue("league.create_teams", {
+                "league_id": league.id, "num_teams": num_teams, "roster_size": roster_size, "conferences": conferences,
+            }))
 
+        populate_league(league, num_teams=num_teams, roster_size=roster_size, conferences=conferences)
+
+        league = League.objects.prefetch_related("teams__players").get(pk=league.pk)
         return Response(LeagueSerializer(league).data)
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["post"])
+    def generate_schedule(self, request, pk=None):
+        """
+        Build the season schedule: non-conference weeks, then a round robin
+        inside every conference. Optional JSON: { "non_conference_games": 4, "replace": false }
+        """
+        league = self.get_object()
+        try:
+            non_conference_games = int(request.data.get("non_conference_games", 4))
+        except (TypeError, ValueError):
+            return Response({"error": "non_conference_games must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= non_conference_games <= MAX_NON_CONFERENCE_GAMES:
+            return Response(
+                {"error": f"non_conference_games must be between 0 and {MAX_NON_CONFERENCE_GAMES}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            pending = unplayed_games(league)
+            if pending.exists():
+                if str(request.data.get("replace", "")).lower() not in ("1", "true"):
+                    return Response(
+                        {"error": "League already has unplayed games; pass replace=true to regenerate"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                pending.delete()
+            games = create_schedule(league, non_conference_games)
+
+        return Response({
+            "games": len(games),
+            "weeks": max((g.week for g in games), default=0),
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["post"])
+    def simulate_week(self, request, pk=None):
+        """
+        Play every unplayed game of one week (default: the earliest week left).
+        Optional JSON: { "week": 3, "seed": 1, "workers": 4, "async": false }
+        """
+        league = self.get_object()
+        pending = unplayed_games(league)
+        week = request.data.get("week")
+        if week is None:
+            first = pending.first()
+            if first is None:
+                return Response({"error": "No unplayed games left"}, status=status.HTTP_400_BAD_REQUEST)
+            week = first.week
+        try:
+            week = int(week)
+        except (TypeError, ValueError):
+            return Response({"error": "week must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        games = list(pending.filter(week=week))
+        if not games:
+            return Response({"error": f"No unplayed games in week {week}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            seed, workers = simulation_options(request.data)
+            if wants_async(request):
+                return accepted(enqueue("league.simulate", {
+                    "league_id": league.id, "week": week, "seed": seed, "workers": workers,
+                }))
+            play_games(games, seed=seed, workers=workers)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "week": week,
+            "games_played": len(games),
+            "results": [game_result(g) for g in games],
+        })
+
+    @action(detail=True, methods=["post"])
+    def simulate_season(self, request, pk=None):
+        """
+        Play every remaining unplayed game of the season.
+        Optional JSON: { "seed": 1, "workers": 4, "async": false }
+        """
+        league = self.get_object()
+        games = list(unplayed_games(league))
+        if not games:
+            return Response({"error": "No unplayed games left"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            seed, workers = simulation_options(request.data)
+            if wants_async(request):
+                return accepted(enqueue("league.simulate", {"league_id": league.id, "seed": seed, "workers": workers}))
+            play_games(games, seed=seed, workers=workers)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "games_played": len(games),
+            "weeks": sorted({g.week for g in games}),
+            "seed": seed,
+        })
+
+    @action(detail=True, methods=["post"])
+    def offseason(self, request, pk=None):
+        """
+        Develop every rostered player toward their potential, recompute team ratings
+        and move the league on to its next season.
+        Optional JSON: { "seed": 1, "async": false }
+        """
+        league = self.get_object()
+        try:
+            seed, _ = simulation_options(request.data)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if seed is None:
+            seed = random.getrandbits(63)
+        if wants_async(request):
+            return accepted(enqueue("league.offseason", {"league_id": league.id, "seed": seed}))
+        return Response({"seed": seed, **progress_league(league, rng=seed)})
+
+    @action(detail=True, methods=["post"])
+    def recruit(self, request, pk=None):
+        """
+        Sign players of a recruiting class to the league's teams by positional need, ranking and home state.
+        JSON: { "recruiting_class": 1, "roster_size": 15, "seed": 1, "async": false }
+        """
+        league = self.get_object()
+        try:
+            class_id = int(request.data["recruiting_class"])
+            roster_size = int(request.data.get("roster_size", 15))
+        except KeyError:
+            return Response({"error": "recruiting_class is required"}, status=status.HTTP_400_BAD_REQUEST)
+        except (TypeError, ValueError):
+            return Response({"error": "recruiting_class and roster_size must be integers"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 5 <= roster_size <= MAX_ROSTER_SIZE:
+            return Response({"error": f"roster_size must be 5-{MAX_ROSTER_SIZE}"}, status=status.HTTP_400_BAD_REQUEST)
+        recruiting_class = RecruitingClass.objects.filter(id=class_id).first()
+        if recruiting_class is None:
+            return Response({"error": "Recruiting class not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            seed, _ = simulation_options(request.data)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if seed is None:
+            seed = random.getrandbits(63)
+
+        if wants_async(request):
+            return accepted(enqueue("league.recruit", {
+                "league_id": league.id, "recruiting_class_id": class_id, "roster_size": roster_size, "seed": seed,
+            }))
+        return Response({"seed": seed, **recruit_class(league, recruiting_class, roster_size=roster_size, rng=seed)})
+
+    @action(detail=True, methods=["post"])
+    def project_season(self, request, pk=None):
+        """
+        Simulate the remaining schedule many times without saving anything.
+        Optional JSON: { "replicas": 100, "seed": 1, "workers": 4 }
+        """
+        league = self.get_object()
+        try:
+            seed, workers = simulation_options(request.data)
+            replicas = int(request.data.get("replicas", 100))
+            if not 1 <= replicas <= MAX_SEASON_REPLICAS:
+                raise ValueError(f"replicas must be between 1 and {MAX_SEASON_REPLICAS}")
+            if seed is None:
+                seed = random.getrandbits(63)
+            team_ids, wins = project_season(league, replicas, seed, workers=workers)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        current = dict(
+            league.games.filter(season=league.season, winner__isnull=False)
+            .values_list("winner").annotate(wins=Count("id"))
+        )
+        names = dict(league.teams.values_list("id", "name"))
+        return Response({
+            "replicas": replicas,
+            "seed": seed,
+            "teams": [
+                {
+                    "team_id": team_id,
+                    "name": names[team_id],
+                    "wins": current.get(team_id, 0),
+                    "projected_wins": round(current.get(team_id, 0) + float(wins[:, i].mean()), 2),
+                    "projected_wins_std": round(float(wins[:, i].std()), 2),
+                }
+                for i, team_id in enumerate(team_ids)
+            ],
+        })
+
+    @action(detail=True, methods=["get"])
+    def player_stats(self, request, pk=None):
+        """
+        Season totals and per-game averages from the maintained aggregates.
+        Query params: season (default: current), order (default points), limit (default 50), player
+        """
+        league = self.get_object()
+        params = request.query_params
+        order = params.get("order", "points")
+        if order not in SEASON_STAT_FIELDS:
+            return Response({"error": f"order must be one of {list(SEASON_STAT_FIELDS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            season = int(params.get("season", league.season))
+            limit = min(int(params.get("limit", 50)), MAX_STAT_ROWS)
+            player = int(params["player"]) if "player" in params else None
+        except ValueError:
+            return Response({"error": "season, limit and player must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 0:
+            return Response({"error": "limit must be non-negative"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = PlayerSeasonStat.objects.filter(league=league, season=season)
+        if player is not None:
+            rows = rows.filter(player_id=player)
+        rows = rows.order_by(f"-{order}", "id").values(
+            "player_id", "player__name", "player__position", *SEASON_STAT_FIELDS
+        )[:limit]
+
+        def line(row):
+            games = row["games"] or 1
+            return {
+                "player_id": row["player_id"],
+                "name": row["player__name"],
+                "position": row["player__position"],
+                **{stat: row[stat] for stat in SEASON_STAT_FIELDS},
+                "per_game": {stat: round(row[stat] / games, 1) for stat in BOX_STATS},
+            }
+
+        return Response({"season": season, "players": [line(row) for row in rows]})
+
+    @action(detail=True, methods=["get"])
+    def standings(self, request, pk=None):
+        """
+        Standings from the maintained TeamStanding rows.
+        Query params: season (default: current), conference (ID)
+        """
+        league = self.get_object()
+        try:
+            season = int(request.query_params.get("season", league.season))
+            conference = request.query_params.get("conference")
+            conference = int(conference) if conference is not None else None
+        except ValueError:
+            return Response({"error": "season and conference must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = TeamStanding.objects.filter(league=league, season=season).select_related("team__conference")
+        if conference is not None:
+            rows = rows.filter(team__conference_id=conference)
+
+        def line(row):
+            return {
+                "team_id": row.team_id,
+                "name": row.team.name,
+                "conference": row.team.conference.name if row.team.conference else None,
+                "conference_id": row.team.conference_id,
+                "wins": row.wins,
+                "losses": row.losses,
+                "conference_wins": row.conference_wins,
+                "conference_losses": row.conference_losses,
+                "points_for": row.points_for,
+                "points_against": row.points_against,
+                "point_differential": row.points_for - row.points_against,
+                "streak": f"W{row.streak}" if row.streak > 0 else f"L{-row.streak}" if row.streak < 0 else "",
+            }
+
+        def rank(row):
+            played = row.wins + row.losses
+            return (-(row.wins / played if played else 0), -(row.points_for - row.points_against), row.team_id)
+
+        return Response({
+            "season": season,
+            "standings": [line(row) for row in sorted(rows, key=rank)],
+        })
+
+
+def simulation_options(data):
+    """(seed, workers) from request data; raises ValueError on bad input"""
+    try:
+        seed = data.get("seed")
+        seed = int(seed) if seed is not None else None
+        workers = int(data.get("workers", 1))
+    except (TypeError, ValueError):
+        raise ValueError("seed and workers must be integers")
+    if seed is not None and seed < 0:
+        raise ValueError("seed must be non-negative")
+    if not 1 <= workers <= (os.cpu_count() or 1):
+        raise ValueError(f"workers must be between 1 and {os.cpu_count() or 1}")
+    return seed, workers
+
+
+def game_result(game):
+    return {
+        "game_id": game.id,
+        "week": game.week,
+        "home_team_id": game.home_team_id,
+        "away_team_id": game.away_team_id,
+        "home_score": game.home_score,
+        "away_score": game.away_score,
+        "winner_id": game.winner_id,
+    }
+
+
+class TeamViewSet(ResponseShapeMixin, viewsets.ModelViewSet):
+    resource_name = "team"
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in SERIALIZING_ACTIONS and self.wants("team", "players"):
+            queryset = queryset.prefetch_related(
+                players_prefetch("players", ids_only=self.response_shape["depth"] == 0)
+            )
+        return queryset
+
     @action(detail=True, methods=["get"])
     def roster(self, request, pk=None):
         team = self.get_object()
@@ -50,152 +436,292 @@ class TeamViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class GameViewSet(viewsets.ModelViewSet):
+def filter_games(queryset, params):
+    """
+    Apply ?league=, ?week= and ?team= (either side) and order by week.
+    Raises ValueError for non-integer values.
+    """
+    if "league" in params:
+        queryset = queryset.filter(league_id=int(params["league"]))
+    if "week" in params:
+        queryset = queryset.filter(week=int(params["week"]))
+    if "team" in params:
+        team = int(params["team"])
+        queryset = queryset.filter(Q(home_team_id=team) | Q(away_team_id=team))
+    return queryset.order_by("week", "id")
+
+
+def stored_box_scores(game):
+    """(home lines, away lines) of a played game in the engine's box score shape"""
+    lines = list(game.box_scores.select_related("player").order_by("id"))
+
+    def line(stat):
+        return {
+            "player_id": stat.player_id,
+            "name": stat.player.name,
+            "position": stat.player.position,
+            **{field: getattr(stat, field) for field in BOX_STATS},
+        }
+
+    return (
+        [line(s) for s in lines if s.team_id == game.home_team_id],
+        [line(s) for s in lines if s.team_id == game.away_team_id],
+    )
+
+
+class GameViewSet(ResponseShapeMixin, viewsets.ModelViewSet):
+    resource_name = "game"
     queryset = Game.objects.all()
     serializer_class = GameSerializer
+    pagination_class = PageSizePagination
+
+    def compact_list(self):
+        # nested rosters only when the client explicitly asks for ?depth=
+        return self.action == "list" and self.response_shape["depth"] is None
+
+    def get_serializer_class(self):
+        if self.compact_list():
+            return GameListSerializer
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        """?league=, ?week= and ?team= (either side) filters for listings"""
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list":
+            return queryset
+        try:
+            return filter_games(queryset, self.request.query_params)
+        except ValueError:
+            raise ValidationError({"detail": "league, week and team must be integers"})
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.compact_list():
+            return queryset.select_related("home_team", "away_team", "winner")
+
+        depth = self.response_shape["depth"]
+        if self.action not in SERIALIZING_ACTIONS or depth == 0:
+            return queryset
+        teams = [f for f in ("home_team", "away_team", "winner") if self.wants("game", f)]
+        queryset = queryset.select_related(*teams)
+        if self.wants("team", "players"):
+            queryset = queryset.prefetch_related(
+                *(players_prefetch(f"{team}__players", ids_only=depth == 1) for team in teams)
+            )
+        return queryset
 
     @action(detail=False, methods=["post"])
     def simulate(self, request):
         """
         Simulate a realistic college basketball game between two teams with bench rotation.
         Expects JSON: { "home_team_id": 1, "away_team_id": 2 }
+        Optional "mode": "classic" (default) or "possession" (possession-by-possession engine)
+        Optional "seed": the same seed and rosters give the same game; one is drawn
+        (and returned) when omitted. Results are cached, so repeats are instant.
+        Optional "preview": true to get the result without saving a game.
         """
         home_id = request.data.get("home_team_id")
         away_id = request.data.get("away_team_id")
+        mode = request.data.get("mode", "classic")
+        if mode not in SIMULATION_MODES:
+            return Response(
+                {"error": f"mode must be one of {', '.join(SIMULATION_MODES)}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        seed = request.data.get("seed")
+        if seed is not None:
+            try:
+                seed = int(seed)
+            except (TypeError, ValueError):
+                seed = -1
+            if not 0 <= seed <= MAX_SEED:
+                return Response(
+                    {"error": f"seed must be an integer between 0 and {MAX_SEED}"}, status=status.HTTP_400_BAD_REQUEST
+                )
 
         try:
-            home_team = Team.objects.prefetch_related('players').get(id=home_id)
-            away_team = Team.objects.prefetch_related('players').get(id=away_id)
-        except Team.DoesNotExist:
+            home_team = Team.objects.select_related('league').get(id=home_id)
+            away_team = Team.objects.get(id=away_id)
+        except (Team.DoesNotExist, ValueError):
             return Response({"error": "Invalid team IDs"}, status=status.HTTP_400_BAD_REQUEST)
+        if home_team.id == away_team.id:
+            return Response({"error": "A team cannot play itself"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # -------------------------
-        # Player stat simulation
-        # -------------------------
-        def simulate_player_stats(player, minutes, team_off_factor, opp_def_factor):
-            performance = random.uniform(0.95, 1.05)
+        try:
+            result, seed, cached = simulate_seeded(home_team, away_team, mode, seed)
+        except ValueError:
+            return Response({"error": "Both teams need players"}, status=status.HTTP_400_BAD_REQUEST)
+        home_box, away_box = result["home_box"], result["away_box"]
+        home_score, away_score = result["home_score"], result["away_score"]
+
+        winner = home_team if result["home_win"] else away_team
+
+        game = None
+        if not request_flag(request, "preview"):
+            game = save_simulated_game(
+                result,
+                league_id=home_team.league_id,
+                season=home_team.league.season,
+                home_team_id=home_team.id,
+                away_team_id=away_team.id,
+                home_score=home_score,
+                away_score=away_score,
+                winner_id=winner.id,
+                mode=mode,
+                seed=seed,
+            )
 
-            productivity = (
-                player.close_shot * 0.25 +
-                player.driving_layup * 0.15 +
-                player.driving_dunk * 0.10 +
-                player.mid_range_shot * 0.20 +
-                player.three_point_shot * 0.20 +
-                player.free_throw * 0.10
-            ) * performance * team_off_factor / (opp_def_factor + 1)
+        return Response({
+            "game_id": game.id if game else None,
+            "home_team": home_team.name,
+            "away_team": away_team.name,
+            "home_score": home_score,
+            "away_score": away_score,
+            "winner": winner.name,
+            "home_box": home_box,
+            "away_box": away_box,
+            "mode": mode,
+            "seed": seed,
+            "cached": cached,
+            **{key: result[key] for key in ("possessions", "overtimes") if key in result},
+        }, status=status.HTTP_201_CREATED if game else status.HTTP_200_OK)
 
-            points = productivity * (minutes / 40)
+    @action(detail=True, methods=["get"])
+    def box_score(self, request, pk=None):
+        """Stored player lines of a played game, split by team"""
+        game = self.get_object()
+        home_box, away_box = stored_box_scores(game)
+        return Response({
+            "game_id": game.id,
+            "home_score": game.home_score,
+            "away_score": game.away_score,
+            "home_box": home_box,
+            "away_box": away_box,
+        })
 
-            if random.random() < 0.05:
-                points *= random.uniform(1.4, 1.8)
+    @action(detail=True, methods=["get"])
+    def replay(self, request, pk=None):
+        """
+        Re-run a game from the simulate endpoint with its stored mode and seed
+        against the current rosters. "matches" says whether the replay
+        reproduced the stored score and box score; it only can while neither
+        roster nor the engine has changed since.
+        """
+        game = self.get_object()
+        if game.seed is None or game.mode not in SIMULATION_MODES:
+            return Response({"error": "Game has no recorded seed to replay"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result, _, cached = simulate_seeded(game.home_team, game.away_team, game.mode, game.seed)
+        except ValueError:
+            return Response({"error": "Both teams need players"}, status=status.HTTP_400_BAD_REQUEST)
+
+        def lines(box):
+            return [(line["player_id"], *(line[stat] for stat in BOX_STATS)) for line in box]
+
+        home_box, away_box = stored_box_scores(game)
+        matches = (
+            (result["home_score"], result["away_score"]) == (game.home_score, game.away_score)
+            and lines(result["home_box"]) == lines(home_box)
+            and lines(result["away_box"]) == lines(away_box)
+        )
+        return Response({
+            "game_id": game.id,
+            "mode": game.mode,
+            "seed": game.seed,
+            "matches": matches,
+            "cached": cached,
+            "home_score": result["home_score"],
+            "away_score": result["away_score"],
+            "home_box": result["home_box"],
+            "away_box": result["away_box"],
+        })
+
+    @action(detail=False, methods=["get"])
+    def odds(self, request):
+        """
+        Monte Carlo win probabilities for a matchup. Nothing is saved.
+        Query params: home_team_id, away_team_id, iterations (default 10000), seed (optional)
+        """
+        try:
+            iterations = int(request.query_params.get("iterations", 10_000))
+            seed = request.query_params.get("seed")
+            seed = int(seed) if seed is not None else None
+        except ValueError:
+            return Response({"error": "iterations and seed must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= iterations <= MAX_ODDS_ITERATIONS:
+            return Response({"error": f"iterations must be between 1 and {MAX_ODDS_ITERATIONS}"}, status=status.HTTP_400_BAD_REQUEST)
+        if seed is not None and seed < 0:
+            return Response({"error": "seed must be non-negative"}, status=status.HTTP_400_BAD_REQUEST)
 
-            rebounds = (player.offensive_rebounding*0.4 + player.defensive_rebounding*0.6) * performance / 8 * (minutes / 40)
-            assists = (player.pass_accuracy*0.3 + player.ball_handle*0.2) * performance / 5 * (minutes / 40)
-            steals = player.steal * performance / 25 * (minutes / 40)
-            blocks = player.block * performance / 20 * (minutes / 40)
-            turnovers = max(0, (minutes / 40) * (5 - (player.ball_handle + player.pass_accuracy)/50) * performance)
+        try:
+            home_team = Team.objects.get(id=request.query_params.get("home_team_id"))
+            away_team = Team.objects.get(id=request.query_params.get("away_team_id"))
+        except (Team.DoesNotExist, ValueError):
+            return Response({"error": "Invalid team IDs"}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            ratings = load_ratings([home_team.id, away_team.id])
+        except ValueError:
+            return Response({"error": "Both teams need players"}, status=status.HTTP_400_BAD_REQUEST)
+        home, away = ratings[home_team.id], ratings[away_team.id]
+        with timed("sim"):
+            result = simulate_batch(home, away, iterations, rng=seed)
+        home_scores, away_scores = result["home_scores"], result["away_scores"]
+        home_win_pct = float((home_scores >= away_scores).mean())
+
+        def distribution(scores):
+            percentiles = np.percentile(scores, ODDS_PERCENTILES)
             return {
-                "player_id": player.id,
-                "name": player.name,
-                "position": player.position,
-                "minutes": round(minutes),
-                "points": round(points),
-                "rebounds": round(rebounds),
-                "assists": round(assists),
-                "steals": round(steals),
-                "blocks": round(blocks),
-                "turnovers": round(turnovers),
+                "mean": round(float(scores.mean()), 2),
+                **{f"p{q}": float(v) for q, v in zip(ODDS_PERCENTILES, percentiles)},
             }
 
-        # -------------------------
-        # Team strengths
-        # -------------------------
-        def team_off_def(team):
-            offense = sum(
-                p.three_point_shot + p.mid_range_shot + p.close_shot + p.driving_layup + p.driving_dunk
-                for p in team.players.all()
-            )
-            defense = sum(
-                p.perimeter_defense + p.interior_defense + p.steal + p.block + p.defensive_rebounding
-                for p in team.players.all()
-            )
-            return offense, defense
-
-        home_off, home_def = team_off_def(home_team)
-        away_off, away_def = team_off_def(away_team)
-
-        home_factor = home_off / (home_off + away_def + 50)
-        away_factor = away_off / (away_off + home_def + 50)
-
-        # -------------------------
-        # Simulate team with 200 minutes
-        # -------------------------
-        def simulate_team(team, team_factor, opp_def_factor):
-            players = sorted(team.players.all(), key=lambda p: p.overall, reverse=True)
-            starters = players[:5]
-            bench = players[5:10]
-
-            total_minutes = 200.0
-            box = []
-
-            # Starters: 85% of total minutes, weighted by overall
-            starter_overall_sum = sum(p.overall for p in starters)
-            starter_minutes = [total_minutes * (p.overall / starter_overall_sum) * 0.85 for p in starters]
-            total_starter = sum(starter_minutes)
-            remaining_minutes = total_minutes - total_starter
-
-            # Bench: top 3–5 players, remaining minutes weighted by overall
-            bench_players = bench[:random.randint(3, 5)]
-            bench_overall_sum = sum(p.overall for p in bench_players) if bench_players else 1
-            bench_minutes = [remaining_minutes * (p.overall / bench_overall_sum) for p in bench_players]
-
-            # Combine players
-            all_players = starters + bench_players
-            all_minutes = starter_minutes + bench_minutes
-
-            # Scale slightly to hit exactly 200
-            scale = total_minutes / sum(all_minutes)
-            all_minutes = [m * scale for m in all_minutes]
-
-            # Simulate stats
-            for p, mins in zip(all_players, all_minutes):
-                box.append(simulate_player_stats(p, mins, team_factor*20, opp_def_factor/100))
-
-            return box
-
-        home_box = simulate_team(home_team, home_factor, away_def)
-        away_box = simulate_team(away_team, away_factor, home_def)
-
-        # -------------------------
-        # Team totals
-        # -------------------------
-        home_score = sum(p['points'] for p in home_box)
-        away_score = sum(p['points'] for p in away_box)
-
-        winner = home_team if home_score >= away_score else away_team
-
-        game = Game.objects.create(
-            league=home_team.league,
-            home_team=home_team,
-            away_team=away_team,
-            home_score=home_score,
-            away_score=away_score,
-            winner=winner,
-        )
+        def projected(team, lines):
+            return [
+                {
+                    "player_id": int(team.player_ids[row]),
+                    "name": team.names[row],
+                    "position": team.positions[row],
+                    **{stat: round(float(value), 1) for stat, value in line.items()},
+                }
+                for row, line in lines.items()
+            ]
 
         return Response({
-            "game_id": game.id,
             "home_team": home_team.name,
             "away_team": away_team.name,
-            "home_score": home_score,
-            "away_score": away_score,
-            "winner": winner.name,
-            "home_box": home_box,
-            "away_box": away_box,
-        }, status=status.HTTP_201_CREATED)
+            "iterations": iterations,
+            "home_win_pct": round(home_win_pct * 100, 2),
+            "away_win_pct": round((1 - home_win_pct) * 100, 2),
+            "home_score": distribution(home_scores),
+            "away_score": distribution(away_scores),
+            "mean_margin": round(float((home_scores - away_scores).mean()), 2),
+            "home_lines": projected(home, result["home_lines"]),
+            "away_lines": projected(away, result["away_lines"]),
+        })
+
 
 
+GAME_EXPORT_FIELDS = [
+    "id", "league_id", "season", "week", "home_team_id", "away_team_id",
+    "home_score", "away_score", "winner_id",
+]
+
+
+@require_GET
+def export_games(request):
+    """
+    Stream games as NDJSON (default) or CSV.
+    Query params: format, chunk_size, and the league/week/team listing filters.
+    A plain Django view so ?format= is not taken over by DRF's content negotiation.
+    """
+    options, error = export_options(request)
+    if error:
+        return error
+    try:
+        games = filter_games(Game.objects.all(), request.GET)
+    except ValueError:
+        return JsonResponse({"error": "league, week and team must be integers"}, status=400)
+    return stream_queryset(games, GAME_EXPORT_FIELDS, *options, filename="games")
 
 
 @api_view(["POST"])
@@ -0,0 +1,11 @@
+from jobs.registry import register
+from .services import create_recruiting_class
+
+
+@register("players.recruiting_class")
+def recruiting_class(params, progress):
+    """Background generate_recruiting_class; chunks commit as they go"""
+    recruiting_class, stats = create_recruiting_class(
+        params["year"], params["count"], chunk_size=params["chunk_size"], progress=progress, atomic=False
+    )
+    return {"id": recruiting_class.id, "year": recruiting_class.year, **stats}
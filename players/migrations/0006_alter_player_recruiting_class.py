@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0005_alter_player_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='recruiting_class',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='players', to='players.recruitingclass'),
+        ),
+    ]
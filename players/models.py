@@ -23,6 +23,8 @@ class Player(models.Model):
         RecruitingClass,
         related_name="players",
         on_delete=models.CASCADE,
+        null=True,
+        blank=True,
     )
 
     # Stats
@@ -48,6 +50,14 @@ class Player(models.Model):
     vertical = models.IntegerField()
     potential = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["overall"], name="player_overall_idx"),
+            models.Index(fields=["potential"], name="player_potential_idx"),
+            models.Index(fields=["position", "overall"], name="player_position_overall_idx"),
+            models.Index(fields=["recruiting_class", "overall"], name="player_class_overall_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.position})"
     
@@ -0,0 +1,103 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PlayerCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over (ordering field, id).
+
+    The cursor holds the last row's sort value and ID, and the next page is
+    `WHERE (field, id) < (value, id) ORDER BY field, id LIMIT n`. That walks
+    the Player indexes directly, so page 1000 costs the same as page 1.
+    DRF's CursorPagination keys on the first ordering field only and falls
+    back to OFFSET within ties, which is most of the table for a 40-99
+    rating, hence the compound key here.
+
+    ?ordering= picks one of `orderings`; ?page_size= and ?cursor= as usual.
+    """
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    orderings = ("-potential", "potential", "-overall", "overall")
+    default_ordering = "-potential"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if self.ordering not in self.orderings:
+            raise ValidationError({"ordering": f"must be one of {', '.join(self.orderings)}"})
+        self.field = self.ordering.lstrip("-")
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        descending = self.ordering.startswith("-") != reverse
+        order = [f"-{self.field}", "-pk"] if descending else [self.field, "pk"]
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            op = "lt" if descending else "gt"
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{op}": value}) | Q(**{self.field: value, f"pk__{op}": pk})
+            )
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            raise ValidationError({"page_size": "must be an integer"})
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            value, pk = cursor["p"]
+            return (int(value), int(pk)), bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, row, reverse):
+        cursor = {"p": [getattr(row, self.field), row.pk], "r": int(reverse)}
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(",", ":")).encode("ascii"))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode("ascii"))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
@@ -1,16 +1,99 @@
 from rest_framework import serializers
+from backend.timing import timed
 from .models import Player, RecruitingClass
 
-class PlayerSerializer(serializers.ModelSerializer):
+
+def response_shape(request):
+    """
+    Serializer context for ?depth= and sparse fieldsets.
+    ?fields=a,b trims the top-level resource; ?fields[team]=a,b trims every
+    serialized team (likewise player, league, game).
+    """
+    fields = {}
+    for key, value in request.query_params.items():
+        if key == "fields":
+            fields[None] = set(filter(None, value.split(",")))
+        elif key.startswith("fields[") and key.endswith("]"):
+            fields[key[7:-1]] = set(filter(None, value.split(",")))
+
+    depth = request.query_params.get("depth")
+    if depth is not None:
+        try:
+            depth = int(depth)
+        except ValueError:
+            raise serializers.ValidationError({"depth": "must be a non-negative integer"})
+        if depth < 0:
+            raise serializers.ValidationError({"depth": "must be a non-negative integer"})
+
+    return {"fields": fields, "depth": depth}
+
+
+class TimedDataMixin:
+    """Counts building a top-level serializer's .data as Server-Timing `ser`"""
+
+    @property
+    def data(self):
+        with timed("ser"):
+            return super().data
+
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
+
+
+class DynamicFieldsMixin(TimedDataMixin):
+    """
+    Applies the `fields` and `depth` serializer context from response_shape().
+    Nested serializers whose remaining depth is used up are replaced by
+    primary keys (see nested_fields).
+    """
+    resource_name = None
+    nested_fields = ()
+
+    @property
+    def level(self):
+        level, node = 0, self.parent
+        while node is not None:
+            if isinstance(node, DynamicFieldsMixin):
+                level += 1
+            node = node.parent
+        return level
+
+    def remaining_depth(self):
+        depth = self.context.get("depth")
+        return None if depth is None else depth - self.level
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        requested = self.context.get("fields", {})
+        wanted = requested.get(self.resource_name)
+        if wanted is None and self.level == 0:
+            wanted = requested.get(None)
+        if wanted:
+            fields = {name: field for name, field in fields.items() if name in wanted}
+
+        remaining = self.remaining_depth()
+        if remaining is not None and remaining < 1:
+            for name in self.nested_fields:
+                if name in fields:
+                    many = isinstance(fields[name], serializers.ListSerializer)
+                    fields[name] = serializers.PrimaryKeyRelatedField(many=many, read_only=True)
+        return fields
+
+
+class PlayerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    resource_name = "player"
     ranking = serializers.SerializerMethodField()
     class Meta:
         model = Player
         fields = "__all__"
+        list_serializer_class = TimedListSerializer
 
 
     def get_ranking(self, obj):
         return obj.ranking
-class RecruitingClassSerializer(serializers.ModelSerializer):
+class RecruitingClassSerializer(TimedDataMixin, serializers.ModelSerializer):
     players = PlayerSerializer(many=True, read_only=True)
 
     class Meta:
@@ -0,0 +1,55 @@
+import time
+from contextlib import nullcontext
+
+from django.db import transaction
+
+from league.purge import delete_recruiting_class
+
+from .models import Player, RecruitingClass
+from .utils import generate_player_columns
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def build_players(columns, start=0, stop=None, **extra):
+    """Build unsaved Player instances for rows [start, stop) of generate_player_columns() output"""
+    keys = list(columns.keys())
+    rows = zip(*(columns[k][start:stop].tolist() for k in keys))
+    return [Player(**dict(zip(keys, row)), **extra) for row in rows]
+
+
+def create_recruiting_class(year, count, chunk_size=DEFAULT_CHUNK_SIZE, rng=None, progress=None, atomic=True):
+    """
+    Generate and insert a recruiting class of `count` players.
+    All rows are generated up front and written with bulk_create in chunks of
+    `chunk_size`, inside one transaction. Returns (recruiting_class, stats).
+
+    With atomic=False each chunk commits on its own, so other connections see
+    progress(done, total) while the class is built (background jobs); if
+    anything raises, including a cancelled progress(), the partial class is
+    deleted again.
+    """
+    started = time.perf_counter()
+    columns = generate_player_columns(count, rng=rng)
+
+    with transaction.atomic() if atomic else nullcontext():
+        recruiting_class = RecruitingClass.objects.create(year=year)
+        try:
+            for start in range(0, count, chunk_size):
+                players = build_players(columns, start, start + chunk_size, recruiting_class=recruiting_class)
+                with transaction.atomic(savepoint=False):
+                    Player.objects.bulk_create(players, batch_size=chunk_size)
+                if progress:
+                    progress(min(start + chunk_size, count), count)
+        except BaseException:
+            if not atomic:
+                delete_recruiting_class(recruiting_class.id)
+            raise
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "created": count,
+        "elapsed_seconds": round(elapsed, 4),
+        "rows_per_second": round(count / elapsed) if elapsed > 0 else None,
+    }
+    return recruiting_class, stats
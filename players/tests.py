@@ -1,3 +1,216 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import random
+from collections import Counter
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from .models import Player, RecruitingClass
+from .services import create_recruiting_class
+from .utils import (
+    POSITIONS,
+    STAT_FIELDS,
+    STAT_INDEX,
+    STAT_RANGES,
+    apply_correlations,
+    compute_overall,
+    compute_specialization,
+    generate_player,
+    generate_player_columns,
+    generate_players,
+    position_codes,
+    progress_stats,
+)
+from .views import INLINE_RECRUITING_CLASS_SIZE, MAX_RECRUITING_CLASS_SIZE
+
+
+class GeneratePlayersTests(SimpleTestCase):
+    def test_same_shape_as_generate_player(self):
+        scalar = generate_player()
+        batch = generate_players(5, rng=1)
+        self.assertEqual(len(batch), 5)
+        for player in batch:
+            self.assertEqual(set(player), set(scalar))
+            self.assertEqual(len(player["specialization"]), 3)
+            self.assertIsInstance(player["overall"], int)
+            self.assertIsInstance(player["name"], str)
+
+    def test_seeded_rng_is_reproducible(self):
+        self.assertEqual(generate_players(50, rng=7), generate_players(50, rng=7))
+
+    def test_fixed_positions(self):
+        self.assertEqual({p["position"] for p in generate_players(20, positions="C", rng=0)}, {"C"})
+        players = generate_players(3, positions=["PG", "SF", "C"], rng=0)
+        self.assertEqual([p["position"] for p in players], ["PG", "SF", "C"])
+        with self.assertRaises(ValueError):
+            generate_players(2, positions=["PG", "XX"])
+
+    def test_rules_match_scalar_generator_exactly(self):
+        """Feed identical raw draws through both versions"""
+        rng = np.random.default_rng(3)
+        for position in POSITIONS:
+            low = np.array([STAT_RANGES[position][f][0] for f in STAT_FIELDS])
+            high = np.array([STAT_RANGES[position][f][1] for f in STAT_FIELDS])
+            raw = rng.integers(low, high, size=(200, len(STAT_FIELDS)), endpoint=True)
+
+            stats = apply_correlations(raw.copy())
+            overall = compute_overall(stats)
+            specialization = compute_specialization(stats)
+
+            for i in range(len(raw)):
+                draws = iter(raw[i].tolist() + [75, 200])  # stats, height, weight
+                with mock.patch.object(random, "randint", side_effect=lambda a, b: next(draws)), \
+                        mock.patch.object(random, "choice", side_effect=lambda seq: seq[0]):
+                    with mock.patch("players.utils.STAT_RANGES", {position: STAT_RANGES[position]}):
+                        expected = generate_player()
+                self.assertEqual([expected[f] for f in STAT_FIELDS], stats[i].tolist())
+                self.assertEqual(expected["overall"], overall[i])
+                self.assertEqual(expected["specialization"], specialization[i].tolist())
+
+    def test_distribution_matches_scalar_generator(self):
+        n = 20000
+        random.seed(11)
+        scalar = [generate_player() for _ in range(n)]
+        batch = generate_players(n, rng=11)
+
+        for key in ("overall", "height", "weight", *STAT_FIELDS):
+            self.assertAlmostEqual(
+                np.mean([p[key] for p in scalar]), np.mean([p[key] for p in batch]), delta=1.0, msg=key
+            )
+        for key in ("position", "state"):
+            scalar_freq = Counter(p[key] for p in scalar)
+            batch_freq = Counter(p[key] for p in batch)
+            for value in scalar_freq:
+                self.assertAlmostEqual(scalar_freq[value] / n, batch_freq[value] / n, delta=0.02, msg=value)
+
+        scalar_top = Counter(p["specialization"][0] for p in scalar)
+        batch_top = Counter(p["specialization"][0] for p in batch)
+        for stat in scalar_top:
+            self.assertAlmostEqual(scalar_top[stat] / n, batch_top[stat] / n, delta=0.02, msg=stat)
+
+
+class ProgressStatsTests(SimpleTestCase):
+    def setUp(self):
+        columns = generate_player_columns(2000, rng=5)
+        self.codes = position_codes(columns["position"])
+        self.stats = np.stack([columns[f] for f in STAT_FIELDS], axis=1)
+
+    def test_grows_toward_potential_within_position_caps(self):
+        progressed = progress_stats(self.stats, self.codes, rng=1)
+        potential = STAT_INDEX["potential"]
+        self.assertTrue(np.all(progressed >= self.stats))
+        self.assertEqual(progressed[:, potential].tolist(), self.stats[:, potential].tolist())
+        self.assertGreater(compute_overall(progressed).mean(), compute_overall(self.stats).mean() + 2)
+
+        # growth never pushes a rating past its position's high (correlations aside)
+        high = np.array([[STAT_RANGES[p][f][1] for f in STAT_FIELDS] for p in POSITIONS])[self.codes]
+        self.assertTrue(np.all(progressed <= np.maximum(apply_correlations(np.minimum(progressed, high)), self.stats)))
+
+        # players already at their potential stay as they are
+        done = compute_overall(self.stats) >= self.stats[:, potential]
+        self.assertTrue(done.any())
+        self.assertEqual(progressed[done].tolist(), self.stats[done].tolist())
+
+    def test_seeded_and_leaves_input_alone(self):
+        before = self.stats.copy()
+        self.assertEqual(progress_stats(self.stats, self.codes, rng=2).tolist(),
+                         progress_stats(self.stats, self.codes, rng=2).tolist())
+        self.assertEqual(self.stats.tolist(), before.tolist())
+
+
+class RecruitingClassEndpointTests(TestCase):
+    def test_small_class_is_serialized_inline(self):
+        response = self.client.post("/players/recruiting-class/", {"count": 25, "year": 2026, "chunk_size": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["players"]), 25)
+        self.assertEqual(response.data["created"], 25)
+        self.assertIn("rows_per_second", response.data)
+        self.assertEqual(Player.objects.filter(recruiting_class_id=response.data["id"]).count(), 25)
+
+    def test_large_class_returns_summary(self):
+        response = self.client.post("/players/recruiting-class/", {"count": INLINE_RECRUITING_CLASS_SIZE + 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("players", response.data)
+        self.assertEqual(RecruitingClass.objects.get().players.count(), INLINE_RECRUITING_CLASS_SIZE + 1)
+
+        page = self.client.get(response.data["players_url"], {"page_size": 10}).data
+        self.assertEqual(len(page["results"]), 10)
+        self.assertIsNotNone(page["next"])
+        self.assertEqual({p["recruiting_class"] for p in page["results"]}, {response.data["id"]})
+
+    def test_count_ceiling(self):
+        response = self.client.post("/players/recruiting-class/", {"count": MAX_RECRUITING_CLASS_SIZE + 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(RecruitingClass.objects.exists())
+
+
+class ExportPlayersTests(TestCase):
+    def setUp(self):
+        create_recruiting_class(2026, 30, chunk_size=10, rng=5)
+
+    def test_ndjson(self):
+        response = self.client.get("/players/export/", {"chunk_size": 7})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 30)
+        self.assertEqual([r["potential"] for r in rows], sorted((r["potential"] for r in rows), reverse=True))
+        self.assertIsInstance(rows[0]["specialization"], list)
+        self.assertIn("recruiting_class_id", rows[0])
+
+    def test_csv(self):
+        response = self.client.get("/players/export/", {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 30)
+        player = Player.objects.get(id=rows[0]["id"])
+        self.assertEqual(int(rows[0]["overall"]), player.overall)
+        self.assertEqual(json.loads(rows[0]["specialization"]), player.specialization)
+
+    def test_bad_format(self):
+        response = self.client.get("/players/export/", {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+
+class PlayerCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.rc, _ = create_recruiting_class(2026, 60, chunk_size=25, rng=9)
+        create_recruiting_class(2027, 20, rng=10)
+
+    def walk(self, url, params):
+        rows, pages, response = [], 0, self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            rows += response.data["results"]
+            pages += 1
+            if response.data["next"] is None:
+                return rows, pages, response
+            response = self.client.get(response.data["next"])
+
+    def test_pages_cover_listing_in_order(self):
+        rows, pages, _ = self.walk("/players/all/", {"page_size": 7})
+        self.assertEqual(pages, 12)
+        self.assertEqual(len({r["id"] for r in rows}), 80)
+        keys = [(r["potential"], r["id"]) for r in rows]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_viewset_ordering_and_filters(self):
+        params = {"ordering": "overall", "recruiting_class": self.rc.id, "page_size": 25}
+        rows, pages, _ = self.walk("/players/", params)
+        self.assertEqual(pages, 3)
+        expected = list(self.rc.players.order_by("overall", "id").values_list("id", flat=True))
+        self.assertEqual([r["id"] for r in rows], expected)
+
+        self.assertEqual(self.client.get("/players/", {"ordering": "name"}).status_code, 400)
+        self.assertEqual(self.client.get("/players/", {"cursor": "junk"}).status_code, 404)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get("/players/", {"page_size": 10})
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual([r["id"] for r in back.data["results"]], [r["id"] for r in first.data["results"]])
+        self.assertIsNotNone(back.data["next"])
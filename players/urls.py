@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PlayerViewSet, generate_recruiting_class, list_players, get_recruiting_class
+from .views import PlayerViewSet, generate_recruiting_class, list_players, get_recruiting_class, export_players
 
 router = DefaultRouter()
 router.register(r'', PlayerViewSet, basename='player')
@@ -9,6 +9,7 @@ urlpatterns = [
     # Functional views
     path("recruiting-class/", generate_recruiting_class, name="recruiting-class"),
     path("all/", list_players, name="list-players"),
+    path("export/", export_players, name="export-players"),
     path("class/<int:class_id>/", get_recruiting_class, name="get-recruiting-class"),
 
     # ViewSet routes (includes delete_all automatically)
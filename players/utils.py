@@ -1,5 +1,7 @@
 import random
 
+import numpy as np
+
 US_STATES = [
     "Alabama","Alaska","Arizona","Arkansas","California","Colorado","Connecticut","Delaware","Florida",
     "Georgia","Hawaii","Idaho","Illinois","Indiana","Iowa","Kansas","Kentucky","Louisiana","Maine",
@@ -250,3 +252,176 @@ def generate_player():
     }
 
 
+# ------------------ Vectorized Player Generator ------------------
+POSITIONS = list(STAT_RANGES.keys())
+STAT_FIELDS = list(STAT_RANGES["PG"].keys())  # same column order for every position
+SPECIALIZATION_EXCLUDED = {"speed", "strength", "vertical", "potential"}
+SKILL_FIELDS = [f for f in STAT_FIELDS if f not in SPECIALIZATION_EXCLUDED]
+
+STAT_INDEX = {stat: i for i, stat in enumerate(STAT_FIELDS)}
+_SKILL_COLUMNS = np.array([STAT_INDEX[f] for f in SKILL_FIELDS])
+
+# (position, stat) lookup tables so a whole class can be sampled in one call
+_STAT_LOW = np.array([[STAT_RANGES[pos][f][0] for f in STAT_FIELDS] for pos in POSITIONS])
+_STAT_HIGH = np.array([[STAT_RANGES[pos][f][1] for f in STAT_FIELDS] for pos in POSITIONS])
+_HEIGHT = np.array([HEIGHT_RANGES[pos] for pos in POSITIONS])
+_WEIGHT = np.array([WEIGHT_RANGES[pos] for pos in POSITIONS])
+
+
+def position_codes(positions, n=None):
+    """Map position names (or a single name) to row indexes of the lookup tables"""
+    if isinstance(positions, str):
+        positions = [positions] * (n if n is not None else 1)
+    try:
+        codes = np.array([POSITIONS.index(p) for p in positions], dtype=np.intp)
+    except ValueError:
+        raise ValueError(f"Unknown position in {sorted(set(positions))}; expected one of {POSITIONS}")
+    if n is not None and len(codes) != n:
+        raise ValueError(f"Expected {n} positions, got {len(codes)}")
+    return codes
+
+
+def apply_correlations(stats):
+    """
+    Array version of the correlation rules in generate_player().
+    stats is an (n, len(STAT_FIELDS)) integer matrix; rules run in the same
+    order as the scalar code so later rules see earlier adjustments.
+    """
+    col = {f: stats[:, i] for f, i in STAT_INDEX.items()}  # column views
+
+    def raise_to(target, value, mask):
+        np.copyto(col[target], np.maximum(col[target], value), where=mask)
+
+    # Physicals affecting finishing
+    mask = col["vertical"] > 85
+    raise_to("driving_dunk", col["vertical"] - 10, mask)
+    raise_to("standing_dunk", col["vertical"] - 15, mask)
+
+    # Finishing correlations
+    mask = (col["driving_layup"] > 85) | (col["driving_dunk"] > 85)
+    raise_to("close_shot", np.maximum(col["driving_layup"], col["driving_dunk"]) - 5, mask)
+    raise_to("close_shot", col["post_moves"] - 5, col["post_moves"] > 85)
+
+    # Shooting correlations
+    raise_to("free_throw", col["mid_range_shot"] - 5, col["mid_range_shot"] > 85)
+    raise_to("free_throw", col["three_point_shot"] - 10, col["three_point_shot"] > 85)
+
+    # Playmaking correlations
+    raise_to("ball_handle", col["pass_accuracy"] - 10, col["pass_accuracy"] > 85)
+    mask = col["speed_with_ball"] > 85
+    raise_to("speed", col["speed_with_ball"] - 5, mask)
+    raise_to("pass_accuracy", col["speed_with_ball"] - 10, mask)
+
+    # Defense correlations
+    raise_to("steal", col["perimeter_defense"] - 10, col["perimeter_defense"] > 85)
+    raise_to("block", col["interior_defense"] - 10, col["interior_defense"] > 85)
+
+    # Rebounding correlations
+    mask = col["strength"] > 80
+    raise_to("offensive_rebounding", col["strength"] - 10, mask)
+    raise_to("defensive_rebounding", col["strength"] - 5, mask)
+    mask = (col["offensive_rebounding"] > 80) | (col["defensive_rebounding"] > 80)
+    raise_to("strength", col["offensive_rebounding"] - 10, mask)
+
+    # Speed correlations
+    raise_to("speed_with_ball", col["speed"] - 5, col["speed"] > 85)
+
+    return stats
+
+
+def compute_overall(stats):
+    """Average of every rating column, truncated like int() in generate_player()"""
+    return stats.sum(axis=1) // stats.shape[1]
+
+
+def compute_specialization(stats):
+    """
+    Top 3 skill stats per row as an (n, 3) array of field names.
+    Ties go to the earlier field, matching the stable sort in generate_player().
+    """
+    skills = stats[:, _SKILL_COLUMNS].astype(np.int64)
+    width = len(SKILL_FIELDS)
+    # unique key per cell: higher rating first, then earlier column
+    key = skills * width + (width - 1 - np.arange(width))
+    top = np.argpartition(-key, 2, axis=1)[:, :3]
+    order = np.argsort(-np.take_along_axis(key, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    return np.array(SKILL_FIELDS)[top]
+
+
+# ------------------ Offseason Progression ------------------
+DEVELOPMENT_SHARE = (0.25, 0.6)  # share of the overall -> potential gap closed per offseason
+_GROWABLE = np.array([f != "potential" for f in STAT_FIELDS])
+
+
+def progress_stats(stats, codes, rng=None):
+    """
+    One offseason of development for an (n, len(STAT_FIELDS)) rating matrix.
+    Each player closes a random share of the gap between overall and
+    potential. The gain is spread over the ratings in proportion to their
+    headroom under the position's STAT_RANGES high, so a C grows into
+    rebounding and blocks rather than threes, and ratings already at or above
+    that high stay put. Potential itself is unchanged and nothing declines.
+    Returns a new matrix, with the correlations re-applied to players who grew.
+    """
+    rng = np.random.default_rng(rng)
+    stats = np.array(stats, dtype=np.int64)
+    n, width = stats.shape
+    cap = np.maximum(_STAT_HIGH[codes], stats)
+    headroom = np.where(_GROWABLE, cap - stats, 0)
+
+    gap = np.maximum(stats[:, STAT_INDEX["potential"]] - compute_overall(stats), 0)
+    # rating points needed to lift the truncated average by share * gap
+    points = gap * rng.uniform(*DEVELOPMENT_SHARE, size=n) * width
+    total = headroom.sum(axis=1)
+    rate = np.divide(points, total, out=np.zeros(n), where=total > 0)
+
+    growth = headroom * rate[:, None] * rng.uniform(0.5, 1.5, size=(n, width))
+    growth = np.floor(growth + rng.random((n, width))).astype(np.int64)  # stochastic rounding
+    growth = np.clip(growth, 0, headroom)
+    stats += growth
+    grew = growth.any(axis=1)
+    stats[grew] = apply_correlations(stats[grew])
+    return stats
+
+
+def generate_player_columns(n, positions=None, rng=None):
+    """
+    Generate n players as columns of NumPy arrays (one entry per player).
+    positions may be None (random), a single position, or a sequence of n positions.
+    """
+    rng = np.random.default_rng(rng)
+    if positions is None:
+        codes = rng.integers(0, len(POSITIONS), size=n)
+    else:
+        codes = position_codes(positions, n)
+
+    stats = rng.integers(_STAT_LOW[codes], _STAT_HIGH[codes], endpoint=True)
+    apply_correlations(stats)
+
+    heights = rng.integers(_HEIGHT[codes, 0], _HEIGHT[codes, 1], endpoint=True)
+    weights = rng.integers(_WEIGHT[codes, 0], _WEIGHT[codes, 1], endpoint=True)
+    names = np.char.add(
+        np.char.add(rng.choice(FIRST_NAMES, size=n), " "), rng.choice(LAST_NAMES, size=n)
+    )
+
+    columns = {
+        "name": names,
+        "position": np.array(POSITIONS)[codes],
+        "overall": compute_overall(stats),
+        "height": heights,
+        "weight": weights,
+        "specialization": compute_specialization(stats),
+        "state": rng.choice(US_STATES, size=n),
+    }
+    for stat, i in STAT_INDEX.items():
+        columns[stat] = stats[:, i]
+    return columns
+
+
+def generate_players(n, positions=None, rng=None):
+    """Batch version of generate_player(): returns a list of n player dicts"""
+    columns = generate_player_columns(n, positions=positions, rng=rng)
+    keys = list(columns.keys())
+    rows = zip(*(columns[k].tolist() for k in keys))
+    return [dict(zip(keys, row)) for row in rows]
@@ -1,40 +1,71 @@
 from django.db.models import Prefetch
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from .models import Player, RecruitingClass
-from .serializers import PlayerSerializer, RecruitingClassSerializer
-from .utils import generate_player
+from .pagination import PlayerCursorPagination
+from .serializers import PlayerSerializer, RecruitingClassSerializer, response_shape
+from .services import DEFAULT_CHUNK_SIZE, create_recruiting_class
+from backend.export import export_options, stream_queryset
+from jobs.runner import enqueue
+from jobs.views import accepted, wants_async
+from league.purge import delete_all_players, delete_recruiting_class
+from league.ratings import player_team_ids, recompute_team_ratings
 from datetime import datetime
 
 # -----------------------------
 # Existing functional API views
 # -----------------------------
 
+MAX_RECRUITING_CLASS_SIZE = 100_000
+INLINE_RECRUITING_CLASS_SIZE = 1000  # larger classes get a summary instead of every player
+
+
 @api_view(["POST"])
 def generate_recruiting_class(request):
-    """Generate a recruiting class with N random players"""
-    count = int(request.data.get("count", 10))  # default 10 players
-    year = int(request.data.get("year", datetime.now().year))
-
-    # Create recruiting class
-    recruiting_class = RecruitingClass.objects.create(year=year)
-
-    players = []
-    for _ in range(count):
-        data = generate_player()
-        player = Player.objects.create(
-            recruiting_class=recruiting_class,
-            **data
-        )
-        players.append(player)
+    """Generate a recruiting class with N random players ({ "async": true } queues a job instead)"""
+    try:
+        count = int(request.data.get("count", 10))  # default 10 players
+        year = int(request.data.get("year", datetime.now().year))
+        chunk_size = int(request.data.get("chunk_size", DEFAULT_CHUNK_SIZE))
+    except (TypeError, ValueError):
+        return Response({"error": "count, year and chunk_size must be integers"}, status=400)
+
+    if not 1 <= count <= MAX_RECRUITING_CLASS_SIZE:
+        return Response({"error": f"count must be between 1 and {MAX_RECRUITING_CLASS_SIZE}"}, status=400)
+    if chunk_size < 1:
+        return Response({"error": "chunk_size must be positive"}, status=400)
+
+    if wants_async(request):
+        return accepted(enqueue("players.recruiting_class", {"year": year, "count": count, "chunk_size": chunk_size}))
+
+    recruiting_class, stats = create_recruiting_class(year, count, chunk_size=chunk_size)
+
+    if count > INLINE_RECRUITING_CLASS_SIZE:
+        # Too big to serialize inline; clients page through the cursor-paginated player listing
+        return Response({
+            "id": recruiting_class.id,
+            "year": recruiting_class.year,
+            "created_at": recruiting_class.created_at,
+            "players_url": f"{reverse('list-players')}?recruiting_class={recruiting_class.id}",
+            **stats,
+        })
 
     serializer = RecruitingClassSerializer(recruiting_class)
-    return Response(serializer.data)
+    return Response({**serializer.data, **stats})
 
-@api_view(["GET"])
+@api_view(["GET", "DELETE"])
 def get_recruiting_class(request, class_id):
-    """Get a recruiting class and its players sorted by overall (big board)"""
+    """Get a recruiting class and its players sorted by overall (big board), or delete it"""
+    if request.method == "DELETE":
+        if not RecruitingClass.objects.filter(id=class_id).exists():
+            return Response({"error": "Recruiting class not found"}, status=404)
+        return Response({"deleted": delete_recruiting_class(class_id)})
+
     try:
         # Prefetch players sorted by overall descending
         recruiting_class = RecruitingClass.objects.prefetch_related(
@@ -50,27 +81,97 @@ def get_recruiting_class(request, class_id):
     return Response(serializer.data)
 
 
+def filter_players(queryset, params):
+    """
+    Apply ?position= and ?recruiting_class= listing filters.
+    Raises ValueError for a non-integer recruiting class.
+    """
+    if "position" in params:
+        queryset = queryset.filter(position=params["position"])
+    if "recruiting_class" in params:
+        queryset = queryset.filter(recruiting_class_id=int(params["recruiting_class"]))
+    return queryset
+
+
 @api_view(['GET'])
 def list_players(request):
-    """List all players in DB"""
-    players = Player.objects.all().order_by('-potential')
-    serializer = PlayerSerializer(players, many=True)
-    return Response(serializer.data)
+    """List players, highest potential first, one cursor page at a time"""
+    try:
+        players = filter_players(Player.objects.all(), request.query_params)
+    except ValueError:
+        return Response({"error": "recruiting_class must be an integer"}, status=400)
+    paginator = PlayerCursorPagination()
+    page = paginator.paginate_queryset(players, request)
+    serializer = PlayerSerializer(page, many=True, context=response_shape(request))
+    return paginator.get_paginated_response(serializer.data)
+
+PLAYER_EXPORT_FIELDS = [field.attname for field in Player._meta.concrete_fields]
+
+
+@require_GET
+def export_players(request):
+    """
+    Stream every player as NDJSON (default) or CSV, highest potential first.
+    Query params: format (ndjson|csv), chunk_size, position, recruiting_class
+    """
+    options, error = export_options(request)
+    if error:
+        return error
+    try:
+        players = filter_players(Player.objects.order_by("-potential", "id"), request.GET)
+    except ValueError:
+        return JsonResponse({"error": "recruiting_class must be an integer"}, status=400)
+    return stream_queryset(players, PLAYER_EXPORT_FIELDS, *options, filename="players")
 
 # -----------------------------
 # ViewSet for RESTful endpoints
 # -----------------------------
 
-class PlayerViewSet(viewsets.ModelViewSet):
+class ResponseShapeMixin:
+    """Passes ?depth= and ?fields= to the serializer context"""
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), **self.response_shape}
+
+    @property
+    def response_shape(self):
+        if not hasattr(self, "_response_shape"):
+            self._response_shape = response_shape(self.request)
+        return self._response_shape
+
+    def wants(self, resource, field):
+        """Whether `field` of `resource` will be serialized under the requested fieldsets"""
+        fields = self.response_shape["fields"]
+        requested = fields.get(resource, fields.get(None) if resource == self.resource_name else None)
+        return not requested or field in requested
+
+
+class PlayerViewSet(ResponseShapeMixin, viewsets.ModelViewSet):
+    resource_name = "player"
     queryset = Player.objects.all()
     serializer_class = PlayerSerializer
+    pagination_class = PlayerCursorPagination
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list":
+            return queryset
+        try:
+            return filter_players(queryset, self.request.query_params)
+        except ValueError:
+            raise ValidationError({"detail": "recruiting_class must be an integer"})
+
+    def perform_destroy(self, instance):
+        # deleting the player drops its Team.players rows without m2m_changed
+        team_ids = player_team_ids([instance.pk])
+        instance.delete()
+        recompute_team_ratings(team_ids)
 
     @action(detail=False, methods=["delete"])
     def delete_all(self, request):
         """Delete all players"""
-        count = Player.objects.count()
-        Player.objects.all().delete()
+        counts = delete_all_players()
         return Response(
-            {"message": f"Deleted {count} players."},
+            {"message": f"Deleted {counts['players']} players.", "deleted": counts},
             status=status.HTTP_200_OK
         )